@@ -0,0 +1,87 @@
+"""
+Tab Apply Executor - Applies to jobs through a small pool of tabs in one browser session
+Upcoming job pages load in background tabs while the current application form is filled in
+"""
+
+import logging
+from collections import OrderedDict
+from typing import List
+
+
+class TabApplyExecutor:
+    """Drives a platform bot's applications through a pool of preloaded tabs"""
+
+    def __init__(self, bot, pool_size: int = 2):
+        self.bot = bot
+        self.pool_size = max(1, pool_size)
+        self.logger = logging.getLogger(__name__)
+        self._preloaded = OrderedDict()  # job URL -> window handle
+        self._main_handle = None
+
+    @property
+    def driver(self):
+        return self.bot.driver
+
+    def _discard_stale(self, keep: List[str]):
+        """Close preloaded tabs for jobs that are no longer upcoming, then refocus the main tab"""
+        stale = [url for url in self._preloaded if url not in keep]
+        for url in stale:
+            try:
+                self.driver.switch_to.window(self._preloaded.pop(url))
+                self.driver.close()
+            except Exception:
+                pass
+        if stale and self._main_handle is not None:
+            self.driver.switch_to.window(self._main_handle)
+
+    def _preload(self, urls: List[str]):
+        """Open background tabs for upcoming jobs until the pool is full"""
+        from driver_factory import open_tab
+        for url in urls:
+            if len(self._preloaded) >= self.pool_size - 1:
+                break
+            if url in self._preloaded:
+                continue
+            handle = open_tab(self.driver, url)
+            if handle:
+                self._preloaded[url] = handle
+
+    def apply(self, job_url: str, upcoming: List[str] = None) -> bool:
+        """
+        Apply to job_url, using its preloaded tab if there is one
+        upcoming lists the next jobs for this platform; they start loading in background
+        tabs before the current application begins. Only the apply loop's thread drives
+        the pool, so it is not locked.
+        """
+        if self._main_handle is None:
+            self._main_handle = self.driver.current_window_handle
+
+        handle = self._preloaded.pop(job_url, None)
+        upcoming = [url for url in (upcoming or []) if url != job_url]
+        try:
+            # Jobs can drop out of the schedule (re-ranked, skipped, applied elsewhere)
+            self._discard_stale(upcoming)
+            self._preload(upcoming)
+        except Exception as e:
+            self.logger.warning(f"Could not preload upcoming jobs: {str(e)}")
+
+        if handle is None:
+            self.driver.switch_to.window(self._main_handle)
+            return self.bot.apply_to_job(job_url)
+
+        try:
+            self.driver.switch_to.window(handle)
+            return self.bot.apply_to_job(job_url, navigate=False)
+        finally:
+            try:
+                self.driver.close()
+            except Exception:
+                pass
+            self.driver.switch_to.window(self._main_handle)
+
+    def close(self):
+        """Close any tabs that were preloaded but not used"""
+        try:
+            self._discard_stale([])
+        except Exception:
+            pass
@@ -0,0 +1,164 @@
+"""
+Apply Scheduler - Orders applications by expected value within per-platform daily quotas
+Combines match score, posting freshness and each platform's past success rate, re-ranking as results come in
+"""
+
+import os
+import re
+import json
+import heapq
+import logging
+import itertools
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional
+from profile_matcher import JobMatch
+
+
+DEFAULT_WEIGHTS = {"score": 0.6, "freshness": 0.25, "success_rate": 0.15}
+
+AGE_UNITS = {"min": 1 / 1440, "hour": 1 / 24, "hr": 1 / 24, "day": 1, "week": 7, "month": 30}
+
+
+def posting_age_days(posted: str, now: datetime = None) -> Optional[float]:
+    """Age in days of a posting label such as '3 days ago', '30+ Days Ago', 'Just now' or '2024-05-01'"""
+    if not posted:
+        return None
+    now = now or datetime.now()
+    text = posted.strip().lower()
+
+    try:
+        return max(0.0, (now - datetime.fromisoformat(text[:10])).total_seconds() / 86400)
+    except ValueError:
+        pass
+
+    if any(word in text for word in ("just", "today", "now")):
+        return 0.0
+    if "yesterday" in text:
+        return 1.0
+    match = re.search(r'(\d+)\+?\s*(min|hour|hr|day|week|month)', text)
+    if match:
+        return int(match.group(1)) * AGE_UNITS[match.group(2)]
+    return None
+
+
+class ApplyHistory:
+    """Per-platform application outcomes, kept between runs"""
+
+    def __init__(self, path: str = "apply_history.json"):
+        self.path = path
+        self.logger = logging.getLogger(__name__)
+        self.data = {"platforms": {}, "daily": {}}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.data.update(json.load(f))
+            except (OSError, ValueError) as e:
+                self.logger.warning(f"Could not read apply history {path}: {str(e)}")
+
+    @staticmethod
+    def _today() -> str:
+        return datetime.now().strftime("%Y-%m-%d")
+
+    def success_rate(self, platform: str) -> float:
+        """Share of applications that went through, smoothed so new platforms start at 0.5"""
+        stats = self.data["platforms"].get(platform, {})
+        return (stats.get("successes", 0) + 1) / (stats.get("attempts", 0) + 2)
+
+    def applied_today(self, platform: str) -> int:
+        """Successful applications on platform since midnight"""
+        return self.data["daily"].get(self._today(), {}).get(platform, 0)
+
+    def record(self, platform: str, success: bool):
+        """Count one application outcome"""
+        stats = self.data["platforms"].setdefault(platform, {"attempts": 0, "successes": 0})
+        stats["attempts"] += 1
+        if success:
+            stats["successes"] += 1
+            today = self.data["daily"].setdefault(self._today(), {})
+            today[platform] = today.get(platform, 0) + 1
+
+    def save(self):
+        """Write the history, keeping the last 30 days of daily counts"""
+        cutoff = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        self.data["daily"] = {day: counts for day, counts in self.data["daily"].items() if day >= cutoff}
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump(self.data, f, indent=2)
+        except OSError as e:
+            self.logger.warning(f"Could not save apply history {self.path}: {str(e)}")
+
+
+class ApplyScheduler:
+    """
+    Priority queue of matched jobs
+    Priorities depend on the platform's success rate, so recording an outcome re-scores that
+    platform's queued entries and restores the heap order. Jobs on a platform whose daily quota is used up are skipped.
+    """
+
+    def __init__(self, jobs: List[JobMatch], history: ApplyHistory, daily_limits: Dict[str, int] = None,
+                 weights: Dict[str, float] = None, freshness_half_life_days: float = 7,
+                 max_applications: int = None):
+        self.history = history
+        self.daily_limits = daily_limits or {}
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.half_life = max(freshness_half_life_days, 0.1)
+        self.remaining = max_applications
+        self.skipped = []
+        self._heap = []
+        self._counter = itertools.count()
+        for job in jobs:
+            self._push(job)
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def priority(self, job: JobMatch) -> float:
+        """Weighted mix of match score, freshness and platform success rate (0-1 each)"""
+        age = posting_age_days(job.posted)
+        freshness = 0.5 if age is None else 0.5 ** (age / self.half_life)
+        return (self.weights["score"] * job.match_score / 100
+                + self.weights["freshness"] * freshness
+                + self.weights["success_rate"] * self.history.success_rate(job.platform))
+
+    def _push(self, job: JobMatch):
+        heapq.heappush(self._heap, (-self.priority(job), next(self._counter), job))
+
+    def quota_left(self, platform: str) -> Optional[int]:
+        """Applications still allowed on platform today, or None if it has no limit"""
+        limit = self.daily_limits.get(platform)
+        if limit is None:
+            return None
+        return max(0, limit - self.history.applied_today(platform))
+
+    def next(self) -> Optional[JobMatch]:
+        """Pop the highest-priority job that is still within its platform's quota"""
+        while self._heap and self.remaining != 0:
+            _, _, job = heapq.heappop(self._heap)
+            if self.quota_left(job.platform) == 0:
+                self.skipped.append(job)
+                continue
+            if self.remaining is not None:
+                self.remaining -= 1
+            return job
+        return None
+
+    def __iter__(self) -> Iterator[JobMatch]:
+        while True:
+            job = self.next()
+            if job is None:
+                return
+            yield job
+
+    def record(self, job: JobMatch, success: bool):
+        """Record an application outcome and re-rank that platform's queued jobs"""
+        self.history.record(job.platform, success)
+        # Entries keep their insertion counter so equal priorities stay first-in, first-out
+        self._heap = [
+            (-self.priority(queued), counter, queued) if queued.platform == job.platform else (priority, counter, queued)
+            for priority, counter, queued in self._heap
+        ]
+        heapq.heapify(self._heap)
+
+    def upcoming(self, platform: str, limit: int) -> List[JobMatch]:
+        """The next queued jobs for platform, in current priority order"""
+        return [entry[2] for entry in sorted(self._heap) if entry[2].platform == platform][:limit]
@@ -0,0 +1,56 @@
+"""
+Cancellation - Cooperative stop and pause/resume for a running bot
+Bots check the token between pages, job cards and applications and wait on it instead of time.sleep
+"""
+
+import threading
+
+
+class CancelledError(BaseException):
+    """
+    Raised inside a bot when its run has been stopped
+    Derives from BaseException (like KeyboardInterrupt) so the bots' `except Exception`
+    handlers let it through to the caller.
+    """
+
+
+class CancellationToken:
+    """Shared by everything working on one run; cancel() and pause() take effect at the next check"""
+
+    def __init__(self):
+        self._cancelled = threading.Event()
+        self._running = threading.Event()
+        self._running.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    @property
+    def paused(self) -> bool:
+        return not self._running.is_set() and not self.cancelled
+
+    def cancel(self):
+        self._cancelled.set()
+        self._running.set()  # Wake anything waiting while paused
+
+    def pause(self):
+        if not self.cancelled:
+            self._running.clear()
+
+    def resume(self):
+        self._running.set()
+
+    def check(self):
+        """Block while paused; raise CancelledError once cancelled"""
+        self._running.wait()
+        if self._cancelled.is_set():
+            raise CancelledError("Run cancelled")
+
+    def sleep(self, seconds: float):
+        """time.sleep that returns early with CancelledError on cancel (and also waits out a pause)"""
+        self.check()
+        if seconds > 0 and self._cancelled.wait(seconds):
+            raise CancelledError("Run cancelled")
+        self.check()
+
@@ -0,0 +1,272 @@
+"""
+Config Service - Loads, validates and caches config files and pushes reloads to subscribers
+A file is parsed and checked against CONFIG_SCHEMA only when its modification time changes
+"""
+
+import os
+import json
+import difflib
+import logging
+import threading
+from typing import Callable, Dict, List
+
+
+NUMBER = (int, float)
+TEXT_OR_NUMBER = (str, int, float)
+LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+
+
+class Field:
+    """
+    Expected shape of one config value
+    types are the allowed Python types (bool is only accepted where it is listed); items checks
+    list elements, keys the known keys of an object and values every value of a mapping.
+    """
+
+    def __init__(self, types, minimum: float = None, maximum: float = None, choices: tuple = None,
+                 items: "Field" = None, keys: Dict[str, "Field"] = None, values: "Field" = None):
+        self.types = types if isinstance(types, tuple) else (types,)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.choices = choices
+        self.items = items
+        self.keys = keys
+        self.values = values
+
+
+def _text_list() -> Field:
+    return Field(list, items=Field(str))
+
+
+CONFIG_SCHEMA = Field(dict, keys={
+    "credentials": Field(dict, values=Field(dict, keys={"email": Field(str), "password": Field(str)})),
+    "profile": Field(dict, keys={
+        "name": Field(str),
+        "email": Field(str),
+        "phone": Field(TEXT_OR_NUMBER),
+        "location": Field(str),
+        "current_role": Field(str),
+        "experience_years": Field(NUMBER, minimum=0),
+        "skills": _text_list(),
+        "education": Field(dict),
+        "resume_path": Field(str),
+        "form_answers": Field(dict),
+        "cover_letter": Field(str),
+        "linkedin": Field(str),
+        "github": Field(str),
+        "portfolio": Field(str),
+        "notice_period": Field(TEXT_OR_NUMBER),
+        "current_ctc": Field(TEXT_OR_NUMBER),
+        "expected_ctc": Field(TEXT_OR_NUMBER),
+        "job_search": Field(dict, keys={"keywords": _text_list()}),
+    }),
+    "job_search": Field(dict, keys={
+        "keywords": _text_list(),
+        "locations": _text_list(),
+        "experience_range": Field(dict, values=Field(NUMBER, minimum=0)),
+        "salary_range": Field(dict, values=Field(NUMBER, minimum=0)),
+        "job_type": _text_list(),
+        "min_match_score": Field(NUMBER, minimum=0, maximum=100),
+        "max_jobs_per_platform": Field(int, minimum=1),
+        "enrich_details": Field(bool),
+        "enrich_workers": Field(int, minimum=1),
+        "enrich_per_host": Field(int, minimum=1),
+        "auto_apply": Field(bool),
+        "apply_delay_seconds": Field(NUMBER, minimum=0),
+        "form_answers_file": Field(str),
+        "apply_scheduler": Field(bool),
+        "apply_history_file": Field(str),
+        "daily_apply_limits": Field(dict, values=Field(int, minimum=0)),
+        "apply_priority_weights": Field(dict, values=Field(NUMBER, minimum=0)),
+        "freshness_half_life_days": Field(NUMBER, minimum=0),
+    }),
+    "settings": Field(dict, keys={
+        "headless": Field(bool),
+        "browser": Field(str, choices=("chrome",)),
+        "user_agent": Field(str),
+        "chrome_arguments": _text_list(),
+        "blocked_url_patterns": _text_list(),
+        "implicit_wait": Field(NUMBER, minimum=0),
+        "page_load_timeout": Field(NUMBER, minimum=1),
+        "lean_mode": Field(bool),
+        "single_browser": Field(bool),
+        "driver_watchdog": Field(bool),
+        "recycle_after_pages": Field(int, minimum=0),
+        "recycle_max_rss_mb": Field(NUMBER, minimum=0),
+        "recycle_max_latency_seconds": Field(NUMBER, minimum=0),
+        "hang_timeout_seconds": Field(NUMBER, minimum=1),
+        "retry_attempts": Field(int, minimum=1),
+        "retry_base_delay_seconds": Field(NUMBER, minimum=0),
+        "retry_max_delay_seconds": Field(NUMBER, minimum=0),
+        "circuit_failure_threshold": Field(int, minimum=0),
+        "circuit_recovery_seconds": Field(NUMBER, minimum=0),
+        "fetch_mode": Field(str, choices=("browser", "hybrid")),
+        "http_workers": Field(int, minimum=1),
+        "http_pool_size": Field(int, minimum=1),
+        "prefetch_pages": Field(bool),
+        "apply_tabs": Field(int, minimum=1),
+        "screenshot_on_error": Field(bool),
+        "log_level": Field(str, choices=LOG_LEVELS),
+        "platform_modules": Field(dict, values=Field((str, dict))),
+        "web_log_capacity": Field(int, minimum=1),
+        "web_max_concurrent_runs": Field(int, minimum=1),
+        "web_run_history": Field(int, minimum=0),
+    }),
+})
+
+
+class ConfigError(ValueError):
+    """A config file that cannot be read, is not valid JSON or does not match the schema; problems lists every issue"""
+
+    def __init__(self, path: str, problems: List[str]):
+        self.path = path
+        self.problems = problems
+        super().__init__(f"Invalid configuration in {path}: " + "; ".join(problems))
+
+
+def _type_names(types: tuple) -> str:
+    names = {dict: "an object", list: "a list", str: "a string", bool: "true or false",
+             int: "a whole number", float: "a number"}
+    if set(types) >= {int, float}:
+        types = tuple(t for t in types if t is not int)
+    return " or ".join(names.get(t, t.__name__) for t in types)
+
+
+def validate(value, field: Field = CONFIG_SCHEMA, path: str = "") -> List[str]:
+    """
+    Problems with value against field, as readable messages (empty when it is valid)
+    An unknown key is a problem when it is a close misspelling of a known one; other unknown keys
+    are left alone so platform plugins can carry their own settings.
+    """
+    where = path or "config"
+    if (isinstance(value, bool) and bool not in field.types) or not isinstance(value, field.types):
+        return [f"{where} must be {_type_names(field.types)}, not {json.dumps(value)[:40]}"]
+
+    problems = []
+    if field.choices is not None and value not in field.choices:
+        problems.append(f"{where} must be one of {', '.join(map(str, field.choices))}, not {json.dumps(value)}")
+    if field.minimum is not None and isinstance(value, NUMBER) and value < field.minimum:
+        problems.append(f"{where} must be at least {field.minimum}, not {value}")
+    if field.maximum is not None and isinstance(value, NUMBER) and value > field.maximum:
+        problems.append(f"{where} must be at most {field.maximum}, not {value}")
+
+    if field.items is not None and isinstance(value, list):
+        for i, item in enumerate(value):
+            problems.extend(validate(item, field.items, f"{where}[{i}]"))
+    if isinstance(value, dict):
+        prefix = f"{path}." if path else ""
+        for key, item in value.items():
+            if field.keys is not None and key in field.keys:
+                problems.extend(validate(item, field.keys[key], prefix + key))
+            elif field.values is not None:
+                problems.extend(validate(item, field.values, prefix + key))
+            elif field.keys is not None:
+                close = difflib.get_close_matches(key, field.keys, n=1, cutoff=0.8)
+                if close:
+                    problems.append(f"unknown key {prefix}{key} (did you mean {prefix}{close[0]}?)")
+    return problems
+
+
+class ConfigService:
+    """
+    One config file, parsed and validated once per change
+    get() returns the cached config, which callers must treat as read-only. Each get() or
+    refresh() checks the file's modification time; when the file has changed it is reloaded and
+    every subscriber is called with the new config. A file that has become invalid is reported
+    and the last valid config is kept for the subscribers.
+    """
+
+    def __init__(self, path: str, schema: Field = CONFIG_SCHEMA):
+        self.path = path
+        self.schema = schema
+        self.logger = logging.getLogger(__name__)
+        self._config = None
+        self._error = None
+        self._stamp = None
+        self._subscribers = []
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict:
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except OSError as e:
+            raise ConfigError(self.path, [f"cannot read the file: {str(e)}"]) from e
+        except ValueError as e:  # Not valid JSON, or not UTF-8
+            raise ConfigError(self.path, [f"invalid JSON: {str(e)}"])
+        problems = validate(config, self.schema)
+        if problems:
+            raise ConfigError(self.path, problems)
+        return config
+
+    def refresh(self) -> bool:
+        """Reload the file if it has changed since it was last read; returns True if it was reloaded"""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"Configuration file not found: {self.path}. "
+                                    f"Please create config.json from config.json.example")
+
+        with self._lock:
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if stamp == self._stamp:
+                return False
+            first_load = self._stamp is None
+            try:
+                config = self._read()
+            except ConfigError as e:
+                # Bad contents stay bad until the file changes; a read error (e.g. permissions) is retried
+                if not isinstance(e.__cause__, OSError):
+                    self._stamp = stamp
+                self._error = e
+                if not first_load:
+                    self.logger.error(f"Not reloading {self.path}: {str(e)}")
+                return False
+            self._stamp = stamp
+            self._config, self._error = config, None
+            subscribers = list(self._subscribers)
+
+        if not first_load:
+            self.logger.info(f"Reloaded {self.path}")
+            for subscriber in subscribers:
+                try:
+                    subscriber(config)
+                except Exception as e:
+                    self.logger.error(f"Config subscriber failed: {str(e)}")
+        return True
+
+    def get(self) -> Dict:
+        """The current config; raises ConfigError if the file is invalid"""
+        self.refresh()
+        with self._lock:
+            if self._error is not None:
+                raise self._error
+            return self._config
+
+    def subscribe(self, callback: Callable[[Dict], None]):
+        """Call callback(config) whenever the file is reloaded"""
+        with self._lock:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[Dict], None]):
+        with self._lock:
+            if callback in self._subscribers:
+                self._subscribers.remove(callback)
+
+
+_services_lock = threading.Lock()
+_services: Dict[str, ConfigService] = {}
+
+
+def get_config_service(path: str = "config.json") -> ConfigService:
+    """The process-wide service for a config file, so every reader shares one cache"""
+    key = os.path.abspath(path)
+    with _services_lock:
+        if key not in _services:
+            _services[key] = ConfigService(path)
+        return _services[key]
+
+
+def load_config(path: str = "config.json") -> Dict:
+    """Validated, cached config of path (read-only)"""
+    return get_config_service(path).get()
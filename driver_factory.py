@@ -0,0 +1,403 @@
+"""
+Driver Factory - Shared Chrome WebDriver construction for all platform bots
+Resolves the chromedriver binary once, caches it per Chrome version and builds common options
+"""
+
+import os
+import json
+import logging
+import threading
+from typing import Dict, Optional
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.os_manager import OperationSystemManager, ChromeType
+
+
+DRIVER_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".driver_cache.json")
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+# Resources blocked in lean mode (Network.setBlockedURLs wildcard patterns)
+LEAN_BLOCKED_RESOURCES = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3", "*.ogg", "*.avi",
+]
+LEAN_BLOCKED_HOSTS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+    "google-analytics.com", "googletagmanager.com", "adservice.google.com",
+    "facebook.net", "connect.facebook.net", "ads.linkedin.com", "px.ads.linkedin.com",
+    "bat.bing.com", "clarity.ms", "hotjar.com", "scorecardresearch.com",
+    "criteo.com", "taboola.com", "outbrain.com", "nr-data.net", "segment.io",
+]
+
+logger = logging.getLogger(__name__)
+
+_resolve_lock = threading.Lock()
+_resolved_path: Optional[str] = None
+
+
+def get_chrome_version() -> Optional[str]:
+    """Return the installed Chrome version, or None if it cannot be detected"""
+    try:
+        return OperationSystemManager().get_browser_version_from_os(ChromeType.GOOGLE)
+    except Exception as e:
+        logger.debug(f"Could not detect Chrome version: {str(e)}")
+        return None
+
+
+def _load_driver_cache(cache_file: str) -> Dict:
+    """Load the version -> chromedriver path cache"""
+    try:
+        with open(cache_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_driver_cache(cache_file: str, cache: Dict):
+    """Persist the version -> chromedriver path cache"""
+    try:
+        with open(cache_file, 'w', encoding='utf-8') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Could not write driver cache {cache_file}: {str(e)}")
+
+
+def resolve_driver_path(cache_file: str = DRIVER_CACHE_FILE) -> str:
+    """
+    Resolve the chromedriver binary path
+    Resolution happens at most once per process; the result is cached on disk keyed
+    by the Chrome version so later runs (and offline runs) skip the network lookup.
+    """
+    global _resolved_path
+
+    with _resolve_lock:
+        if _resolved_path and os.path.exists(_resolved_path):
+            return _resolved_path
+
+        chrome_version = get_chrome_version()
+        cache = _load_driver_cache(cache_file)
+
+        # Use the cached driver for this Chrome version if it is still on disk
+        cached_path = cache.get(chrome_version) if chrome_version else None
+        if cached_path and os.path.exists(cached_path):
+            logger.info(f"Using cached chromedriver for Chrome {chrome_version}")
+            _resolved_path = cached_path
+            return _resolved_path
+
+        try:
+            driver_path = ChromeDriverManager().install()
+        except Exception as e:
+            # Offline or resolver endpoint unreachable - fall back to any cached driver
+            fallback = [path for path in cache.values() if path and os.path.exists(path)]
+            if not fallback:
+                raise RuntimeError(f"Could not resolve chromedriver and no cached driver is available: {str(e)}")
+            logger.warning(f"chromedriver resolution failed ({str(e)}), using cached driver {fallback[-1]}")
+            _resolved_path = fallback[-1]
+            return _resolved_path
+
+        if chrome_version:
+            cache[chrome_version] = driver_path
+            _save_driver_cache(cache_file, cache)
+
+        _resolved_path = driver_path
+        return _resolved_path
+
+
+def build_chrome_options(settings: Dict) -> webdriver.ChromeOptions:
+    """Build the ChromeOptions shared by every platform bot"""
+    options = webdriver.ChromeOptions()
+    lean_mode = settings.get("lean_mode", False)
+    if settings.get("headless", False):
+        options.add_argument("--headless=new" if lean_mode else "--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    options.add_experimental_option('useAutomationExtension', False)
+    options.add_argument(f"user-agent={settings.get('user_agent', DEFAULT_USER_AGENT)}")
+
+    if lean_mode:
+        options.add_argument("--disable-extensions")
+        options.add_argument("--disable-gpu")
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+            "profile.default_content_setting_values.media_stream": 2,
+        })
+        # Network events feed the per-page transfer counters
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+    for argument in settings.get("chrome_arguments", []):
+        options.add_argument(argument)
+
+    return options
+
+
+def enable_request_blocking(driver: webdriver.Chrome, settings: Dict):
+    """Block heavy resources and ad/analytics hosts through the DevTools protocol"""
+    patterns = list(LEAN_BLOCKED_RESOURCES)
+    patterns += [f"*://*.{host}/*" for host in LEAN_BLOCKED_HOSTS]
+    patterns += [f"*://{host}/*" for host in LEAN_BLOCKED_HOSTS]
+    patterns += settings.get("blocked_url_patterns", [])
+    driver.blocked_url_patterns = patterns
+    block_requests_in_current_tab(driver)
+
+
+def block_requests_in_current_tab(driver):
+    """
+    Apply the driver's request blocking to the focused tab
+    Network.setBlockedURLs only covers the tab it is sent to, so every tab opened after
+    enable_request_blocking() needs this call too.
+    """
+    patterns = getattr(driver, "blocked_url_patterns", None)
+    if not patterns:
+        return
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    except Exception as e:
+        logger.warning(f"Could not enable request blocking: {str(e)}")
+
+
+def open_tab(driver, url: str) -> Optional[str]:
+    """
+    Start loading url in a new background tab and return its window handle
+    When the driver blocks requests, the tab opens blank, gets the blocking and only then
+    navigates, so it never loads unblocked. The driver stays focused on the current tab.
+    """
+    if getattr(driver, "blocked_url_patterns", None):
+        origin = driver.current_window_handle
+        driver.switch_to.new_window("tab")  # Opens about:blank (inside the context for a ContextDriver)
+        try:
+            handle = driver.current_window_handle
+            block_requests_in_current_tab(driver)
+            # Assigning location does not wait for the page, so it keeps loading in the background
+            driver.execute_script("window.location.href = arguments[0];", url)
+        finally:
+            driver.switch_to.window(origin)
+        return handle
+
+    before = set(driver.window_handles)
+    driver.execute_script("window.open(arguments[0], '_blank');", url)
+    new_handles = set(driver.window_handles) - before
+    return new_handles.pop() if new_handles else None
+
+
+def page_transfer_stats(driver) -> Optional[Dict]:
+    """
+    Return network usage since the previous call (bytes, requests, blocked)
+    Only available for drivers created in lean mode; returns None otherwise.
+    """
+    if not getattr(driver, "lean_mode", False):
+        return None
+
+    stats = {"bytes": 0, "requests": 0, "blocked": 0}
+    try:
+        entries = driver.get_log("performance")
+    except Exception as e:
+        logger.debug(f"Could not read performance log: {str(e)}")
+        return None
+
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        method = message.get("method")
+        if method == "Network.loadingFinished":
+            stats["bytes"] += int(message.get("params", {}).get("encodedDataLength", 0))
+            stats["requests"] += 1
+        elif method == "Network.loadingFailed" and message.get("params", {}).get("blockedReason"):
+            stats["blocked"] += 1
+    return stats
+
+
+def _create_chrome(config: Dict) -> webdriver.Chrome:
+    """Start a configured Chrome WebDriver"""
+    settings = config.get("settings", {})
+    options = build_chrome_options(settings)
+
+    service = Service(resolve_driver_path())
+    driver = webdriver.Chrome(service=service, options=options)
+    driver.implicitly_wait(settings.get("implicit_wait", 10))
+    driver.set_page_load_timeout(settings.get("page_load_timeout", 30))
+
+    driver.lean_mode = settings.get("lean_mode", False)
+    if driver.lean_mode:
+        enable_request_blocking(driver, settings)
+    return driver
+
+
+class _ContextSwitchTo:
+    """switch_to wrapper that keeps a ContextDriver's active tab in sync"""
+
+    def __init__(self, context: "ContextDriver"):
+        self._context = context
+
+    def window(self, handle: str):
+        self._context._active_handle = handle
+        self._context._browser.focus(self._context)
+
+    def new_window(self, type_hint: Optional[str] = None):
+        """
+        Open a blank tab inside this context and switch to it (a plain new_window would leave the context)
+        open_tab() uses this to add request blocking before the tab loads anything.
+        """
+        handle = self._context._browser.driver.execute_cdp_cmd(
+            "Target.createTarget", {"url": "about:blank", "browserContextId": self._context._context_id}
+        )["targetId"]
+        self.window(handle)
+
+    def __getattr__(self, name):
+        self._context._browser.focus(self._context)
+        return getattr(self._context._browser.driver.switch_to, name)
+
+
+class ContextDriver:
+    """
+    WebDriver proxy bound to one isolated browser context of a SharedBrowser
+    Every call focuses the context's active tab first, so cookies and storage stay per platform.
+    Contexts share one WebDriver connection and must be driven from one thread at a time.
+    """
+
+    def __init__(self, browser: "SharedBrowser", name: str, context_id: str, handle: str):
+        self._browser = browser
+        self._name = name
+        self._context_id = context_id
+        self._active_handle = handle
+
+    def __getattr__(self, name):
+        self._browser.focus(self)
+        return getattr(self._browser.driver, name)
+
+    def get(self, url: str):
+        """Navigate the context's active tab"""
+        self._browser.focus(self)
+        return self._browser.driver.get(url)
+
+    @property
+    def switch_to(self) -> _ContextSwitchTo:
+        return _ContextSwitchTo(self)
+
+    @property
+    def current_window_handle(self) -> str:
+        return self._active_handle
+
+    @property
+    def window_handles(self):
+        """Tabs belonging to this context only"""
+        targets = self._browser.driver.execute_cdp_cmd("Target.getTargets", {})["targetInfos"]
+        return [
+            target["targetId"] for target in targets
+            if target.get("type") == "page" and target.get("browserContextId") == self._context_id
+        ]
+
+    def close(self):
+        """Close the active tab of this context"""
+        self._browser.focus(self)
+        self._browser.driver.close()
+        self._browser.focused_handle = None
+
+    def quit(self):
+        """Dispose this context; the browser exits once no contexts remain"""
+        self._browser.release(self._name)
+
+
+class SharedBrowser:
+    """A single Chrome process hosting one isolated browser context per platform"""
+
+    def __init__(self, config: Dict):
+        self.config = config
+        self.driver = _create_chrome(config)
+        self.anchor_handle = self.driver.current_window_handle
+        self.focused_handle = self.anchor_handle
+        self.contexts = {}
+        self._lock = threading.RLock()
+
+    def open_context(self, name: str) -> ContextDriver:
+        """Create an isolated context (separate cookies and storage) with one tab"""
+        with self._lock:
+            context_id = self.driver.execute_cdp_cmd(
+                "Target.createBrowserContext", {"disposeOnDetach": False}
+            )["browserContextId"]
+            handle = self.driver.execute_cdp_cmd(
+                "Target.createTarget", {"url": "about:blank", "browserContextId": context_id}
+            )["targetId"]
+            context = ContextDriver(self, name, context_id, handle)
+            self.contexts[name] = context
+
+            # DevTools settings such as request blocking apply per tab
+            self.focus(context)
+            if getattr(self.driver, "lean_mode", False):
+                enable_request_blocking(self.driver, self.config.get("settings", {}))
+            logger.info(f"Opened isolated browser context for {name}")
+            return context
+
+    def focus(self, context: ContextDriver):
+        """Point the WebDriver at the context's active tab"""
+        with self._lock:
+            if self.focused_handle != context._active_handle:
+                self.driver.switch_to.window(context._active_handle)
+                self.focused_handle = context._active_handle
+
+    def release(self, name: str):
+        """Dispose a context and quit the browser when it was the last one"""
+        global _shared_browser
+
+        with self._lock:
+            context = self.contexts.pop(name, None)
+            if context is not None:
+                try:
+                    self.driver.switch_to.window(self.anchor_handle)
+                    self.focused_handle = self.anchor_handle
+                    self.driver.execute_cdp_cmd(
+                        "Target.disposeBrowserContext", {"browserContextId": context._context_id}
+                    )
+                except Exception as e:
+                    logger.warning(f"Could not dispose browser context for {name}: {str(e)}")
+
+            if not self.contexts:
+                self.driver.quit()
+                with _shared_lock:
+                    if _shared_browser is self:
+                        _shared_browser = None
+
+
+_shared_lock = threading.Lock()
+_shared_browser: Optional[SharedBrowser] = None
+
+
+def get_shared_browser(config: Dict) -> SharedBrowser:
+    """Return the process-wide shared browser, starting it on first use"""
+    global _shared_browser
+
+    with _shared_lock:
+        if _shared_browser is None:
+            _shared_browser = SharedBrowser(config)
+        return _shared_browser
+
+
+def create_driver(config: Dict, context_name: Optional[str] = None):
+    """
+    Create a configured Chrome WebDriver for a platform bot
+    With settings.single_browser, each context_name gets an isolated context inside one
+    shared Chrome process instead of a browser of its own.
+    """
+    if context_name and config.get("settings", {}).get("single_browser", False):
+        try:
+            browser = get_shared_browser(config)
+            try:
+                return browser.open_context(context_name)
+            except Exception:
+                # Drops the half-opened context and quits the browser if nothing else uses it
+                browser.release(context_name)
+                raise
+        except Exception as e:
+            logger.warning(f"Could not open shared browser context for {context_name}, "
+                           f"starting a separate browser: {str(e)}")
+    return _create_chrome(config)
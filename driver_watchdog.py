@@ -0,0 +1,179 @@
+"""
+Driver Watchdog - Bounds long-run browser memory and recovers from hung drivers
+Tracks per-driver RSS, page count and response latency and recycles the driver when limits are hit
+"""
+
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+import psutil
+from driver_factory import ContextDriver
+
+
+class DriverWatchdog:
+    """Watches one platform bot's WebDriver and restarts it with its session cookies"""
+
+    def __init__(self, bot, settings: Dict):
+        self.bot = bot
+        self.max_rss_mb = settings.get("recycle_max_rss_mb", 1500)
+        self.max_pages = settings.get("recycle_after_pages", 200)
+        self.max_latency = settings.get("recycle_max_latency_seconds", 20)
+        self.hang_timeout = settings.get("hang_timeout_seconds", 60)
+        self.logger = logging.getLogger(__name__)
+        self.pages = 0
+        self.recycles = 0
+        self.latencies = deque(maxlen=10)
+
+    def attach(self):
+        """Instrument the bot's current driver to count and time page loads"""
+        driver = self.bot.driver
+        original_get = driver.get
+
+        def timed_get(url):
+            start = time.time()
+            try:
+                return original_get(url)
+            finally:
+                self.pages += 1
+                self.latencies.append(time.time() - start)
+
+        driver.get = timed_get
+        self.pages = 0
+        self.latencies.clear()
+
+    def _browser_processes(self) -> List:
+        """chromedriver and all Chrome processes it started"""
+        try:
+            process = psutil.Process(self.bot.driver.service.process.pid)
+            return [process] + process.children(recursive=True)
+        except Exception:
+            return []
+
+    def _is_shared(self) -> bool:
+        """True when the driver is one context of the shared browser, which hosts other platforms too"""
+        return isinstance(self.bot.driver, ContextDriver)
+
+    def rss_mb(self) -> Optional[float]:
+        """
+        Resident memory of the driver's browser process tree, in MB
+        None for a shared-browser context: its processes hold every platform's tabs, so recycling
+        one context would not bring the figure down.
+        """
+        if self._is_shared():
+            return None
+        total = 0
+        for process in self._browser_processes():
+            try:
+                total += process.memory_info().rss
+            except Exception:
+                continue
+        return total / (1024 * 1024)
+
+    def is_responsive(self) -> bool:
+        """Ping the browser; False if it does not answer within hang_timeout"""
+        result = {}
+
+        def ping():
+            try:
+                result["ok"] = self.bot.driver.execute_script("return 1;") == 1
+            except Exception:
+                result["ok"] = False
+
+        thread = threading.Thread(target=ping, daemon=True)
+        thread.start()
+        thread.join(self.hang_timeout)
+        return result.get("ok", False)
+
+    def check(self) -> bool:
+        """Recycle the driver if any limit is exceeded; returns True if it was recycled"""
+        if self.bot.driver is None:
+            return False
+
+        reason = None
+        hung = False
+        if self.max_pages and self.pages >= self.max_pages:
+            reason = f"{self.pages} pages loaded"
+        elif self.max_latency and self.latencies and \
+                sum(self.latencies) / len(self.latencies) > self.max_latency:
+            reason = f"average page load {sum(self.latencies) / len(self.latencies):.1f}s"
+        elif not self.is_responsive():
+            reason = f"no response within {self.hang_timeout}s"
+            hung = True
+        else:
+            rss = self.rss_mb()
+            if self.max_rss_mb and rss and rss > self.max_rss_mb:
+                reason = f"browser using {rss:.0f} MB"
+
+        if reason is None:
+            return False
+        self.recycle(reason, hung)
+        return True
+
+    def _save_cookies(self, deadline: float) -> List[Dict]:
+        """Read the session cookies from the current driver, if it answers before deadline"""
+        cookies = []
+
+        def read():
+            try:
+                cookies.extend(self.bot.driver.get_cookies())
+            except Exception:
+                pass
+
+        thread = threading.Thread(target=read, daemon=True)
+        thread.start()
+        thread.join(max(0, deadline - time.time()))
+        return cookies
+
+    def _kill(self, processes: List):
+        for process in processes:
+            try:
+                process.kill()
+            except Exception:
+                continue
+
+    def _shutdown(self, deadline: float, hung: bool = False):
+        """Quit the driver, killing its processes if it is hung or still quitting at deadline"""
+        # A shared browser also hosts other platforms' contexts, so it is never killed here
+        processes = [] if self._is_shared() else self._browser_processes()
+        if hung:
+            # Quitting a hung driver would only wait for it again
+            self._kill(processes)
+        thread = threading.Thread(target=self.bot.close, daemon=True)
+        thread.start()
+        thread.join(max(0, deadline - time.time()))
+        if thread.is_alive():
+            self._kill(processes)
+
+    def recycle(self, reason: str, hung: bool = False):
+        """
+        Restart the bot's driver and restore its logged-in session
+        Saving cookies and quitting share one hang_timeout budget; a hung driver's cookies are not
+        read, so check() waits at most twice hang_timeout in total before the new driver starts.
+        """
+        self.logger.warning(f"Recycling {self.bot.base_url} browser: {reason}")
+        deadline = time.time() + self.hang_timeout
+        cookies = [] if hung else self._save_cookies(deadline)
+        self._shutdown(deadline, hung)
+
+        self.bot.initialize_driver()
+        self.bot.http_session = None
+        self.attach()
+        self.recycles += 1
+
+        # Restore the session cookies; login() returns early when they are still valid
+        try:
+            self.bot.driver.get(self.bot.base_url)
+            for cookie in cookies:
+                cookie.pop("sameSite", None)
+                try:
+                    self.bot.driver.add_cookie(cookie)
+                except Exception:
+                    continue
+            self.bot.driver.refresh()
+        except Exception as e:
+            self.logger.warning(f"Could not restore session cookies: {str(e)}")
+
+        if not self.bot.login():
+            self.logger.error(f"Could not restore the session after recycling {self.bot.base_url}")
@@ -0,0 +1,455 @@
+"""
+Form Engine - Walks multi-step application forms and fills them from cached answers
+Recognizes text, select, radio, checkbox and upload fields and stops as soon as manual input is needed
+"""
+
+import os
+import re
+import json
+import time
+import logging
+from contextlib import contextmanager
+from typing import Dict, List, Optional, Tuple
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import Select
+from cancellation import CancellationToken
+
+
+# Outcomes of FormEngine.run
+SUBMITTED = "submitted"
+NEEDS_INPUT = "needs_input"
+NO_FORM = "no_form"
+STUCK = "stuck"
+
+SUBMIT_WORDS = ["submit application", "send application", "submit"]
+REVIEW_WORDS = ["review"]
+NEXT_WORDS = ["save and continue", "continue", "next"]
+DONE_PHRASES = [
+    "application submitted", "application sent", "application was sent", "successfully applied",
+    "applied successfully", "you applied", "thank you for applying", "application has been submitted"
+]
+ERROR_SELECTOR = ".artdeco-inline-feedback--error, [class*='error-message'], [class*='errorMessage'], [role='alert']"
+PLACEHOLDER_OPTIONS = ["", "select", "select an option", "please select", "choose", "--"]
+
+
+def button_xpath(words: List[str], tags: List[str] = None) -> str:
+    """XPath for buttons whose text or aria-label contains one of words, ignoring case"""
+    lower = "translate(normalize-space({}), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    conditions = " or ".join(
+        f"contains({lower.format(source)}, '{word}')"
+        for word in words for source in (".", "@aria-label")
+    )
+    return " | ".join(f".//{tag}[{conditions}]" for tag in (tags or ["button"]))
+
+
+def match_option(answer: str, options: List[str]) -> Optional[str]:
+    """The option that best matches a stored answer: exact match first, then containment"""
+    wanted = str(answer).strip().lower()
+    if not wanted:
+        return None
+    for option in options:
+        if option.strip().lower() == wanted:
+            return option
+    for option in options:
+        text = option.strip().lower()
+        if text and text not in PLACEHOLDER_OPTIONS and (wanted in text or text in wanted):
+            return option
+    return None
+
+
+class AnswerStore:
+    """
+    Persistent question -> answer cache, seeded from the profile
+    Questions the bot could not answer are saved with an empty answer (and their options)
+    so they can be filled in by hand once and reused on every later form. Answers filled in
+    while the bot is running are picked up before the next form and are kept when it saves.
+    """
+
+    def __init__(self, path: str = "form_answers.json", profile: Dict = None):
+        self.path = path
+        self.profile = profile or {}
+        self.logger = logging.getLogger(__name__)
+        self.answers = {}
+        self.options = {}
+        self._stamp = None
+        self.refresh()
+        for question, answer in self.profile.get("form_answers", {}).items():
+            self.answers.setdefault(self.normalize(question), str(answer))
+        self._rules = self._profile_rules()
+
+    @classmethod
+    def for_config(cls, config: Dict) -> "AnswerStore":
+        path = config.get("job_search", {}).get("form_answers_file", "form_answers.json")
+        return cls(path, config.get("profile", {}))
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        text = re.sub(r'\brequired\b', '', (question or "").lower())
+        return re.sub(r'[^a-z0-9+#/.]+', ' ', text).strip(" .")
+
+    def refresh(self):
+        """Take in the answers saved in the file since it was last read or written"""
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp == self._stamp:
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Could not read form answers {self.path}: {str(e)}")
+            return
+        self._stamp = stamp
+
+        for question, answer in data.get("answers", {}).items():
+            if answer not in (None, ""):
+                if self.answers.get(self.normalize(question)) != str(answer):
+                    self.remember(question, str(answer))
+            else:
+                self.note_unanswered(question, data.get("options", {}).get(question))
+
+    def _profile_rules(self) -> List[Tuple[List[str], str]]:
+        """(question keywords, answer) pairs built from the profile; the first match wins"""
+        profile = self.profile
+        name = profile.get("name", "")
+        parts = name.split()
+        education = profile.get("education", {})
+        return [
+            (["first name", "given name"], parts[0] if parts else ""),
+            (["last name", "surname", "family name"], parts[-1] if len(parts) > 1 else ""),
+            (["email"], profile.get("email", "")),
+            (["phone", "mobile", "contact number"], profile.get("phone", "")),
+            (["full name", "your name"], name),
+            (["notice period"], profile.get("notice_period", "")),
+            (["current ctc", "current salary"], profile.get("current_ctc", "")),
+            (["expected ctc", "expected salary", "salary expectation"], profile.get("expected_ctc", "")),
+            (["linkedin"], profile.get("linkedin", "")),
+            (["github"], profile.get("github", "")),
+            (["portfolio", "website"], profile.get("portfolio", "")),
+            (["cover letter"], profile.get("cover_letter", "")),
+            (["graduation year", "year of graduation", "passing year"], education.get("graduation_year", "")),
+            (["cgpa", "gpa"], education.get("cgpa", "")),
+            (["university", "college"], education.get("university", "")),
+            (["degree", "qualification", "education"], education.get("degree", "")),
+            (["current role", "current title", "designation"], profile.get("current_role", "")),
+            (["city", "current location", "location"], profile.get("location", "")),
+            (["name"], name),
+        ]
+
+    def _experience_answer(self, key: str) -> Optional[str]:
+        """Years of experience, overall or with a skill from the profile"""
+        if "experience" not in key or not ("year" in key or "how many" in key):
+            return None
+        years = str(self.profile.get("experience_years", ""))
+        skills = [skill.lower() for skill in self.profile.get("skills", [])]
+        if any(skill in key for skill in skills):
+            return years
+        if key.endswith("experience") or any(word in key for word in ("total", "overall", "work", "professional")):
+            return years
+        return None
+
+    def lookup(self, question: str, options: List[str] = None) -> Optional[str]:
+        """Answer for a question, or None if it is unknown (or matches none of the options)"""
+        key = self.normalize(question)
+        answer = self.answers.get(key) or self._experience_answer(key)
+        if not answer:
+            for keywords, value in self._rules:
+                if any(keyword in key for keyword in keywords):
+                    answer = value
+                    break
+        if answer in (None, ""):
+            return None
+        if options:
+            return match_option(str(answer), options)
+        return str(answer)
+
+    def remember(self, question: str, answer: str):
+        """Store an answer supplied for a question; it replaces any earlier one"""
+        key = self.normalize(question)
+        self.answers[key] = answer
+        self.options.pop(key, None)
+
+    def note_unanswered(self, question: str, options: List[str] = None):
+        """Save an unknown question with an empty answer for the user to fill in"""
+        key = self.normalize(question)
+        if key and not self.answers.get(key):
+            self.answers[key] = ""
+            if options:
+                self.options[key] = [option for option in options if option.strip()]
+
+    def save(self):
+        # Keep answers filled in by hand (or saved by another bot) since the file was read
+        self.refresh()
+        try:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                json.dump({"answers": self.answers, "options": self.options}, f, indent=2, ensure_ascii=False)
+            stat = os.stat(self.path)
+            self._stamp = (stat.st_mtime_ns, stat.st_size)
+        except OSError as e:
+            self.logger.warning(f"Could not save form answers {self.path}: {str(e)}")
+
+
+class FormEngine:
+    """
+    State machine over the steps of an application form
+    Each step: fill the visible fields, then press submit, review or next (in that order
+    of preference) and wait for the step to change. It stops at the first required
+    question without an answer, on a validation error, or when a step repeats.
+    """
+
+    def __init__(self, driver, answers: AnswerStore, config: Dict, max_steps: int = 10, step_timeout: float = 5,
+                 cancel_token: CancellationToken = None):
+        self.driver = driver
+        self.cancel_token = cancel_token or CancellationToken()
+        self.answers = answers
+        self.max_steps = max_steps
+        self.step_timeout = step_timeout
+        self.implicit_wait = config.get("settings", {}).get("implicit_wait", 10)
+        resume_path = config.get("profile", {}).get("resume_path", "")
+        self.resume_path = os.path.abspath(resume_path) if resume_path and os.path.exists(resume_path) else ""
+        self.logger = logging.getLogger(__name__)
+        self.missing = []
+
+    @contextmanager
+    def _no_implicit_wait(self):
+        """Element probes must not each wait implicit_wait seconds for fields that do not exist"""
+        self.driver.implicitly_wait(0)
+        try:
+            yield
+        finally:
+            self.driver.implicitly_wait(self.implicit_wait)
+
+    def _scope(self, container: Optional[str]):
+        """The top-most visible form container, or the whole page without a selector"""
+        if not container:
+            return self.driver
+        visible = [element for element in self.driver.find_elements(By.CSS_SELECTOR, container)
+                   if element.is_displayed()]
+        return visible[-1] if visible else None
+
+    def _wait_for_scope(self, container: Optional[str]):
+        end = time.time() + self.step_timeout
+        while True:
+            scope = self._scope(container)
+            if scope is not None or time.time() >= end:
+                return scope
+            self.cancel_token.sleep(0.25)
+
+    def _is_done(self) -> bool:
+        try:
+            page_text = self.driver.find_element(By.TAG_NAME, "body").text.lower()
+        except Exception:
+            return False
+        return any(phrase in page_text for phrase in DONE_PHRASES)
+
+    def _errors(self, scope) -> List[str]:
+        return [element.text.strip() for element in scope.find_elements(By.CSS_SELECTOR, ERROR_SELECTOR)
+                if element.is_displayed() and element.text.strip()]
+
+    @staticmethod
+    def field_type(element) -> Optional[str]:
+        """text, select, radio, checkbox or upload; None for inputs that are not answers"""
+        tag = element.tag_name.lower()
+        if tag == "select":
+            return "select"
+        if tag == "textarea":
+            return "text"
+        kind = (element.get_attribute("type") or "text").lower()
+        if kind == "file":
+            return "upload"
+        if kind in ("radio", "checkbox"):
+            return kind
+        if kind in ("hidden", "submit", "button", "image", "reset"):
+            return None
+        return "text"
+
+    def _label(self, element) -> str:
+        """Question text for a field, from its label, aria-label, placeholder or name"""
+        element_id = element.get_attribute("id")
+        if element_id and "'" not in element_id:
+            for label in self.driver.find_elements(By.XPATH, f"//label[@for='{element_id}']"):
+                if label.text.strip():
+                    return label.text.strip()
+        for source in ("aria-label", "placeholder"):
+            value = element.get_attribute(source)
+            if value:
+                return value.strip()
+        for label in element.find_elements(By.XPATH, "./ancestor::label[1]"):
+            if label.text.strip():
+                return label.text.strip()
+        return element.get_attribute("name") or ""
+
+    def _group_question(self, element) -> str:
+        """Question for a radio group: the fieldset legend, else the group's name"""
+        for legend in element.find_elements(By.XPATH, "./ancestor::fieldset[1]/legend"):
+            if legend.text.strip():
+                return legend.text.strip()
+        return element.get_attribute("name") or ""
+
+    @staticmethod
+    def _required(element, label: str) -> bool:
+        return bool(element.get_attribute("required")) or \
+            element.get_attribute("aria-required") == "true" or label.rstrip().endswith("*")
+
+    def _click(self, element):
+        try:
+            element.click()
+        except Exception:
+            self.driver.execute_script("arguments[0].click();", element)
+
+    def _fields(self, scope) -> List[Tuple[str, object]]:
+        fields = []
+        for element in scope.find_elements(By.CSS_SELECTOR, "input, select, textarea"):
+            kind = self.field_type(element)
+            # File inputs are usually hidden behind a styled button
+            if kind is None or (kind != "upload" and not element.is_displayed()) or not element.is_enabled():
+                continue
+            fields.append((kind, element))
+        return fields
+
+    def _fill_step(self, scope) -> List[str]:
+        """Fill the current step's fields; returns the required questions left unanswered"""
+        missing = []
+        radio_groups = {}
+
+        for kind, element in self._fields(scope):
+            if kind == "radio":
+                radio_groups.setdefault(element.get_attribute("name") or "", []).append(element)
+                continue
+            label = self._label(element)
+            required = self._required(element, label)
+
+            if kind == "text":
+                if (element.get_attribute("value") or "").strip():
+                    continue
+                answer = self.answers.lookup(label)
+                if answer is None:
+                    if required:
+                        missing.append(label)
+                        self.answers.note_unanswered(label)
+                    continue
+                element.clear()
+                element.send_keys(answer)
+
+            elif kind == "select":
+                select = Select(element)
+                current = select.first_selected_option.text.strip().lower() if select.all_selected_options else ""
+                if current not in PLACEHOLDER_OPTIONS:
+                    continue
+                options = [option.text for option in select.options]
+                answer = self.answers.lookup(label, options)
+                if answer is None:
+                    if required:
+                        missing.append(label)
+                        self.answers.note_unanswered(label, options)
+                    continue
+                select.select_by_visible_text(answer)
+
+            elif kind == "checkbox":
+                # Only required boxes (terms, consent) are ticked; optional ones keep their default
+                if required and not element.is_selected():
+                    self._click(element)
+
+            elif kind == "upload":
+                if element.get_attribute("value"):
+                    continue
+                wants_resume = any(word in label.lower() for word in ("resume", "cv"))
+                if self.resume_path and (wants_resume or required):
+                    element.send_keys(self.resume_path)
+                elif required:
+                    missing.append(label or "file upload")
+
+        for name, radios in radio_groups.items():
+            if any(radio.is_selected() for radio in radios):
+                continue
+            question = self._group_question(radios[0])
+            options = [self._label(radio) for radio in radios]
+            answer = self.answers.lookup(question, options)
+            if answer is None:
+                if any(self._required(radio, question) for radio in radios):
+                    missing.append(question)
+                    self.answers.note_unanswered(question, options)
+                continue
+            self._click(radios[options.index(answer)])
+
+        return missing
+
+    def _advance_button(self, scope) -> Tuple[Optional[object], Optional[str]]:
+        """The button that moves the form on, preferring submit over review over next"""
+        for kind, words in (("submit", SUBMIT_WORDS), ("review", REVIEW_WORDS), ("next", NEXT_WORDS)):
+            for button in scope.find_elements(By.XPATH, button_xpath(words)):
+                if button.is_displayed() and button.is_enabled():
+                    return button, kind
+        return None, None
+
+    def _fingerprint(self, scope) -> Tuple:
+        try:
+            return tuple(self._label(element) for _, element in self._fields(scope))
+        except Exception:
+            return ()
+
+    def _wait_for_change(self, scope, button, fingerprint: Tuple):
+        """Wait until the step re-renders, the button goes away or an error shows up"""
+        end = time.time() + self.step_timeout
+        while time.time() < end:
+            self.cancel_token.sleep(0.3)
+            try:
+                if not button.is_displayed() or self._errors(scope):
+                    return
+                if self._fingerprint(scope) != fingerprint:
+                    return
+            except Exception:
+                return  # The step (or the whole form) was replaced
+
+    def run(self, container: str = None) -> str:
+        """Fill and submit the form inside container (a CSS selector); returns the outcome"""
+        self.missing = []
+        submitted = False
+        previous = None
+        self.answers.refresh()
+        try:
+            with self._no_implicit_wait():
+                for step in range(self.max_steps):
+                    self.cancel_token.check()
+                    scope = self._wait_for_scope(container) if step == 0 else self._scope(container)
+                    if scope is None:
+                        return SUBMITTED if submitted or self._is_done() else NO_FORM
+                    if self._is_done():
+                        return SUBMITTED
+
+                    self.missing = self._fill_step(scope)
+                    if self.missing:
+                        self.logger.info(f"Form needs manual input: {', '.join(self.missing)}")
+                        return NEEDS_INPUT
+
+                    button, kind = self._advance_button(scope)
+                    if button is None:
+                        if submitted:
+                            return SUBMITTED
+                        return NO_FORM if step == 0 and not self._fields(scope) else STUCK
+
+                    fingerprint = self._fingerprint(scope)
+                    if (kind, fingerprint) == previous:
+                        self.logger.info("Form did not move past the same step twice")
+                        return STUCK
+                    previous = (kind, fingerprint)
+
+                    self.logger.info(f"Form step {step + 1}: {kind}")
+                    self._click(button)
+                    submitted = submitted or kind == "submit"
+                    self._wait_for_change(scope, button, fingerprint)
+
+                    try:
+                        errors = self._errors(scope)
+                    except Exception:
+                        errors = []
+                    if errors:
+                        self.missing = errors
+                        self.logger.info(f"Form rejected the answers: {'; '.join(errors)}")
+                        return NEEDS_INPUT
+                return STUCK
+        finally:
+            self.answers.save()
@@ -0,0 +1,111 @@
+"""
+HTTP Fetcher - Browserless page fetching for read-only listing and detail pages
+Reuses the authenticated cookies of a Selenium session in a pooled requests.Session
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup, FeatureNotFound
+
+
+# lxml when it is installed; parse_html falls back to the built-in parser otherwise
+HTML_PARSER = "lxml"
+
+
+DEFAULT_HEADERS = {
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+logger = logging.getLogger(__name__)
+
+
+def session_from_driver(driver, pool_size: int = 10) -> requests.Session:
+    """Create a pooled HTTP session carrying the WebDriver's cookies and user agent"""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=2)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers.update(DEFAULT_HEADERS)
+
+    try:
+        session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+    except Exception as e:
+        logger.debug(f"Could not read user agent from driver: {str(e)}")
+
+    for cookie in driver.get_cookies():
+        session.cookies.set(
+            cookie["name"],
+            cookie["value"],
+            domain=cookie.get("domain"),
+            path=cookie.get("path", "/")
+        )
+    return session
+
+
+def fetch_html(session: requests.Session, url: str, timeout: int = 30) -> Optional[str]:
+    """Fetch a page and return its HTML, or None on failure"""
+    try:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return response.text
+    except requests.RequestException as e:
+        logger.warning(f"Could not fetch {url}: {str(e)}")
+        return None
+
+
+def parse_html(html: str) -> BeautifulSoup:
+    """Parse HTML with the fastest available parser"""
+    global HTML_PARSER
+    try:
+        return BeautifulSoup(html, HTML_PARSER)
+    except FeatureNotFound:
+        HTML_PARSER = "html.parser"
+        return BeautifulSoup(html, HTML_PARSER)
+
+
+def fetch_pages(session: requests.Session, urls: List[str], max_workers: int = 4,
+                timeout: int = 30) -> List[Optional[str]]:
+    """Fetch several pages concurrently, returning HTML in the same order as urls"""
+    if not urls:
+        return []
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(urls))),
+                            thread_name_prefix=threading.current_thread().name) as executor:
+        return list(executor.map(lambda url: fetch_html(session, url, timeout), urls))
+
+
+def fetch_listing(session: requests.Session, urls: List[str],
+                  parse_page: Callable[[BeautifulSoup], List[Dict]],
+                  max_jobs: int, max_workers: int = 4, timeout: int = 30) -> List[Dict]:
+    """
+    Fetch result pages concurrently and parse their job cards
+    Pages are fetched max_workers at a time and consumed in order; no further pages are
+    fetched after the first empty page or once max_jobs is reached.
+    """
+    jobs = []
+    batch_size = max(1, max_workers)
+    for start in range(0, len(urls), batch_size):
+        batch = fetch_pages(session, urls[start:start + batch_size], max_workers, timeout)
+        for page, html in enumerate(batch, start):
+            if html is None:
+                return jobs
+            page_jobs = parse_page(parse_html(html))
+            logger.info(f"Fetched page {page + 1}: {len(page_jobs)} jobs")
+            if not page_jobs:
+                return jobs
+            jobs.extend(page_jobs[:max_jobs - len(jobs)])
+            if len(jobs) >= max_jobs:
+                return jobs
+    return jobs
+
+
+def select_text(element, selector: str, default: str = "") -> str:
+    """Return the stripped text of the first element matching selector"""
+    found = element.select_one(selector)
+    if found is None:
+        return default
+    return found.get_text(" ", strip=True) or default
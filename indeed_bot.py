@@ -3,55 +3,33 @@ Indeed.com Automation Bot
 Handles login, job search, and application on Indeed
 """
 
-import time
-import logging
 from typing import List, Dict, Optional
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from urllib.parse import urlencode, urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from profile_matcher import ProfileMatcher, JobMatch
+from platforms import BasePlatformBot
+from driver_factory import block_requests_in_current_tab
+from form_engine import SUBMITTED, NO_FORM, button_xpath
+from http_fetcher import select_text
 
 
-class IndeedBot:
+class IndeedBot(BasePlatformBot):
     """Automation bot for Indeed.com"""
     
-    def __init__(self, credentials: Dict, profile_matcher: ProfileMatcher, config: Dict):
-        self.email = credentials.get("email")
-        self.password = credentials.get("password")
-        self.profile_matcher = profile_matcher
-        self.config = config
-        self.driver = None
-        self.logger = logging.getLogger(__name__)
-        self.base_url = "https://www.indeed.com"
-        
-    def initialize_driver(self):
-        """Initialize Selenium WebDriver"""
-        options = webdriver.ChromeOptions()
-        if self.config.get("settings", {}).get("headless", False):
-            options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.implicitly_wait(self.config.get("settings", {}).get("implicit_wait", 10))
-        self.driver.set_page_load_timeout(self.config.get("settings", {}).get("page_load_timeout", 30))
-        
+    name = "indeed"
+    base_url = "https://www.indeed.com"
+    domains = ("indeed.com",)
+    display_name = "Indeed"
+    card_selector = ".job_seen_beacon, .jobCard, [data-jk], .slider_item"
+    
     def login(self) -> bool:
         """Login to Indeed account"""
         try:
             self.logger.info("Navigating to Indeed login page...")
             self.driver.get(f"{self.base_url}/account/login")
-            time.sleep(3)
+            self.sleep(3)
             
             # Check if already logged in
             try:
@@ -62,29 +40,29 @@ class IndeedBot:
                 pass
             
             # Enter email
-            email_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "login-email-input"))
+            email_input = self.wait_for(
+                EC.presence_of_element_located((By.ID, "login-email-input")), timeout=10
             )
             email_input.clear()
             email_input.send_keys(self.email)
-            time.sleep(1)
+            self.sleep(1)
             
             # Enter password
             password_input = self.driver.find_element(By.ID, "login-password-input")
             password_input.clear()
             password_input.send_keys(self.password)
-            time.sleep(1)
+            self.sleep(1)
             
             # Click login button
             submit_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit'], #login-submit-button")
             submit_btn.click()
-            time.sleep(5)
+            self.sleep(5)
             
             # Verify login
             try:
-                WebDriverWait(self.driver, 15).until(
+                self.wait_for(
                     EC.presence_of_element_located((By.CSS_SELECTOR, 
-                        "[data-testid='user-menu'], .userMenu, .gnav-UserMenu"))
+                        "[data-testid='user-menu'], .userMenu, .gnav-UserMenu")), timeout=15
                 )
                 self.logger.info("Successfully logged in to Indeed")
                 return True
@@ -94,12 +72,19 @@ class IndeedBot:
                 
         except Exception as e:
             self.logger.error(f"Error during Indeed login: {str(e)}")
+            self.last_error = e
             if self.config.get("settings", {}).get("screenshot_on_error", True):
                 self.driver.save_screenshot("indeed_login_error.png")
             return False
     
     def search_jobs(self, keywords: List[str], location: str = "") -> List[Dict]:
         """Search for jobs on Indeed"""
+        settings = self.config.get("settings", {})
+        if settings.get("fetch_mode", "browser") == "hybrid":
+            return self._search_jobs_http(keywords, location)
+        if settings.get("prefetch_pages", False):
+            return self._search_jobs_prefetch(keywords, location)
+        
         jobs = []
         try:
             self.logger.info(f"Searching jobs on Indeed with keywords: {keywords}")
@@ -107,16 +92,16 @@ class IndeedBot:
             # Navigate to jobs page
             jobs_url = f"{self.base_url}/jobs"
             self.driver.get(jobs_url)
-            time.sleep(3)
+            self.sleep(3)
             
             # Enter search keywords
             try:
-                search_box = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.ID, "text-input-what"))
+                search_box = self.wait_for(
+                    EC.presence_of_element_located((By.ID, "text-input-what")), timeout=10
                 )
                 search_box.clear()
                 search_box.send_keys(keywords[0] if keywords else "Java Developer")
-                time.sleep(2)
+                self.sleep(2)
             except TimeoutException:
                 self.logger.warning("Could not find search box")
                 return jobs
@@ -127,8 +112,8 @@ class IndeedBot:
                     location_box = self.driver.find_element(By.ID, "text-input-where")
                     location_box.clear()
                     location_box.send_keys(location)
-                    time.sleep(2)
-                except:
+                    self.sleep(2)
+                except Exception:
                     pass
             
             # Click search button
@@ -136,36 +121,22 @@ class IndeedBot:
                 search_btn = self.driver.find_element(By.CSS_SELECTOR, 
                     "button[type='submit'], #jobsearch")
                 search_btn.click()
-            except:
+            except Exception:
                 search_box.send_keys(Keys.RETURN)
             
-            time.sleep(5)
+            self.sleep(5)
             
             # Extract job listings
             max_pages = 5
             max_jobs = self.config.get("job_search", {}).get("max_jobs_per_platform", 50)
             
             for page in range(max_pages):
+                self.cancel_token.check()
                 if len(jobs) >= max_jobs:
                     break
                     
                 self.logger.info(f"Scraping page {page + 1}...")
-                
-                # Find job cards
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, 
-                    ".job_seen_beacon, .jobCard, [data-jk], .slider_item")
-                
-                for card in job_cards:
-                    if len(jobs) >= max_jobs:
-                        break
-                    
-                    try:
-                        job_data = self._extract_job_data(card)
-                        if job_data:
-                            jobs.append(job_data)
-                    except Exception as e:
-                        self.logger.warning(f"Error extracting job data: {str(e)}")
-                        continue
+                jobs.extend(self._extract_current_page(max_jobs - len(jobs)))
                 
                 # Go to next page
                 if page < max_pages - 1 and len(jobs) < max_jobs:
@@ -174,10 +145,10 @@ class IndeedBot:
                             "a[aria-label='Next Page'], .pagination .next, [data-testid='pagination-page-next']")
                         if next_btn:
                             next_btn.click()
-                            time.sleep(3)
+                            self.sleep(3)
                         else:
                             break
-                    except:
+                    except Exception:
                         break
             
             self.logger.info(f"Found {len(jobs)} jobs on Indeed")
@@ -185,6 +156,7 @@ class IndeedBot:
             
         except Exception as e:
             self.logger.error(f"Error searching jobs on Indeed: {str(e)}")
+            self.last_error = e
             return jobs
     
     def _extract_job_data(self, job_card) -> Optional[Dict]:
@@ -202,14 +174,14 @@ class IndeedBot:
             try:
                 company = job_card.find_element(By.CSS_SELECTOR, 
                     ".companyName, .company, [data-testid='company-name']").text.strip()
-            except:
+            except Exception:
                 company = "Not specified"
             
             # Location
             try:
                 location = job_card.find_element(By.CSS_SELECTOR, 
                     ".companyLocation, .location, [data-testid='job-location']").text.strip()
-            except:
+            except Exception:
                 location = "Not specified"
             
             # Description
@@ -217,7 +189,15 @@ class IndeedBot:
             try:
                 description = job_card.find_element(By.CSS_SELECTOR, 
                     ".job-snippet, .summary, .job-snippet-container").text.strip()
-            except:
+            except Exception:
+                pass
+            
+            # Posting age
+            posted = ""
+            try:
+                posted = job_card.find_element(By.CSS_SELECTOR, 
+                    ".date, [data-testid='myJobsStateDate']").text.strip()
+            except Exception:
                 pass
             
             return {
@@ -225,6 +205,7 @@ class IndeedBot:
                 "company": company,
                 "location": location,
                 "description": description,
+                "posted": posted,
                 "url": job_url,
                 "platform": "Indeed"
             }
@@ -232,32 +213,79 @@ class IndeedBot:
             self.logger.warning(f"Could not extract job data: {str(e)}")
             return None
     
-    def apply_to_job(self, job_url: str) -> bool:
-        """Apply to a job on Indeed"""
+    def build_search_url(self, keyword: str, location: str = "", page: int = 0) -> str:
+        """Build the Indeed results URL for a keyword, location and zero-based page"""
+        query = {"q": keyword}
+        if location:
+            query["l"] = location
+        if page > 0:
+            query["start"] = page * 10
+        return f"{self.base_url}/jobs?{urlencode(query)}"
+    
+    def _extract_job_data_from_html(self, job_card) -> Optional[Dict]:
+        """Extract job data from a parsed (BeautifulSoup) job card"""
+        title_elem = job_card.select_one(".jobTitle a, h2.jobTitle a, a[data-jk]")
+        if title_elem is None:
+            return None
+        
+        return {
+            "title": title_elem.get_text(" ", strip=True),
+            "company": select_text(job_card,
+                ".companyName, .company, [data-testid='company-name']", "Not specified"),
+            "location": select_text(job_card,
+                ".companyLocation, .location, [data-testid='text-location'], [data-testid='job-location']", "Not specified"),
+            "description": select_text(job_card, ".job-snippet, .summary, .job-snippet-container"),
+            "posted": select_text(job_card, ".date, [data-testid='myJobsStateDate']"),
+            "url": urljoin(self.base_url, title_elem.get("href", "")),
+            "platform": "Indeed"
+        }
+    
+    def _parse_job_detail_html(self, soup) -> Dict:
+        """Extract description, requirements and experience from a job detail page"""
+        return {
+            "description": select_text(soup, "#jobDescriptionText, .jobsearch-JobComponent-description"),
+            "requirements": select_text(soup, "#qualificationsSection, [data-testid='qualifications-list']"),
+            "experience": ""
+        }
+    
+    def _find_apply_frame(self):
+        """The Indeed Apply iframe on the job page, or None"""
+        # Filtered here rather than by selector: a selector matching nothing would sit out the implicit wait
+        for frame in self.driver.find_elements(By.TAG_NAME, "iframe"):
+            source = (frame.get_attribute("src") or "").lower()
+            title = (frame.get_attribute("title") or "").lower()
+            if ("indeedapply" in source or "smartapply" in source or "apply" in title) and frame.is_displayed():
+                return frame
+        return None
+    
+    def apply_to_job(self, job_url: str, navigate: bool = True) -> bool:
+        """Apply to a job on Indeed; navigate=False uses the page already open in the current tab"""
         try:
             self.logger.info(f"Applying to job: {job_url}")
-            self.driver.get(job_url)
-            time.sleep(5)
+            if navigate:
+                self.driver.get(job_url)
+                self.sleep(5)
             
             # Look for apply button
             apply_selectors = [
-                "button[data-testid='apply-button'], #apply-button-link, .jobsearch-IndeedApplyButton",
-                "a[data-testid='apply-button'], .ia-IndeedApplyButton",
-                "button:contains('Apply'), a:contains('Apply')"
+                (By.CSS_SELECTOR, "button[data-testid='apply-button'], #apply-button-link, .jobsearch-IndeedApplyButton"),
+                (By.CSS_SELECTOR, "a[data-testid='apply-button'], .ia-IndeedApplyButton"),
+                (By.XPATH, button_xpath(["apply"], ["button", "a"]))
             ]
             
             apply_btn = None
-            for selector in apply_selectors:
+            for by, selector in apply_selectors:
                 try:
-                    apply_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                    apply_btn = self.wait_for(
+                        EC.element_to_be_clickable((by, selector)), timeout=5
                     )
                     break
-                except:
+                except Exception:
                     continue
             
             if not apply_btn:
                 self.logger.warning("Apply button not found")
+                self.last_error = "Apply button not found"
                 return False
             
             # Check if already applied
@@ -265,31 +293,41 @@ class IndeedBot:
                 self.logger.info("Already applied to this job")
                 return True
             
+            handles_before = set(self.driver.window_handles)
+            original_handle = self.driver.current_window_handle
             apply_btn.click()
-            time.sleep(3)
+            self.sleep(2)
             
-            # Handle application form
+            # Indeed Apply may open in a new tab
+            new_handles = set(self.driver.window_handles) - handles_before
+            apply_handle = new_handles.pop() if new_handles else None
+            if apply_handle:
+                self.driver.switch_to.window(apply_handle)
+                block_requests_in_current_tab(self.driver)
+            # Otherwise it opens in a modal iframe on the job page; search and header forms stay out of scope
+            apply_frame = None if apply_handle else self._find_apply_frame()
+            if apply_frame is not None:
+                self.driver.switch_to.frame(apply_frame)
             try:
-                # Fill required fields if needed
-                # Indeed might redirect to external site or use their own form
-                submit_btn = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 
-                        "button[type='submit'], button:contains('Continue'), button:contains('Submit')"))
-                )
-                submit_btn.click()
-                time.sleep(3)
+                result = self._run_application_form("#ia-container, .ia-BasePage")
+            finally:
+                if apply_frame is not None:
+                    self.driver.switch_to.default_content()
+                if apply_handle:
+                    self.driver.close()
+                    self.driver.switch_to.window(original_handle)
+            
+            if result == SUBMITTED:
                 self.logger.info("Successfully applied to job")
                 return True
-            except:
+            if result == NO_FORM:
                 # Might be external application
                 self.logger.info("Application may require external site - check manually")
-                return False
+            else:
+                self.logger.warning(f"Could not complete application ({result}) - may require manual steps")
+            return False
             
         except Exception as e:
             self.logger.error(f"Error applying to job: {str(e)}")
+            self.last_error = e
             return False
-    
-    def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
@@ -3,48 +3,98 @@ Main Job Application Bot
 Orchestrates job search and application across multiple platforms
 """
 
+import copy
 import json
 import logging
-import time
 from typing import List, Dict
 from datetime import datetime
 from profile_matcher import ProfileMatcher, JobMatch
-from naukri_bot import NaukriBot
-from linkedin_bot import LinkedInBot
-from indeed_bot import IndeedBot
+from job_store import save_jobs
+from job_enricher import JobEnricher
+from apply_executor import TabApplyExecutor
+from apply_scheduler import ApplyHistory, ApplyScheduler
+from resilience import PlatformResilience, CircuitOpenError, no_error
+from platforms import PlatformRegistry
+from cancellation import CancellationToken, CancelledError
+from config_service import get_config_service
+import metrics
+
+
+# Scores are reported to listeners in batches of this many jobs while matching
+SCORED_BATCH_SIZE = 200
 
 
 class JobApplicationBot:
     """Main bot that coordinates job search and applications"""
     
-    def __init__(self, config_path: str = "config.json"):
-        """Initialize the bot with configuration"""
+    def __init__(self, config_path: str = "config.json", init_platforms: bool = True,
+                 cancel_token: CancellationToken = None, platforms: List[str] = None):
+        """
+        Initialize the bot with configuration
+        init_platforms=False skips the platform bots (and Selenium) for offline matching and reports.
+        cancel_token lets another thread stop or pause the run; platforms limits it to some of the
+        platforms that have credentials.
+        """
+        self.config_service = get_config_service(config_path)
         self.config = self._load_config(config_path)
+        self._pending_config = None
+        self.config_service.subscribe(self._on_config_reload)
         self.setup_logging()
         self.logger = logging.getLogger(__name__)
         
         # Initialize profile matcher
         self.profile_matcher = ProfileMatcher(self.config.get("profile", {}))
         
+        # Stops or pauses the run from another thread (e.g. the web server's stop button)
+        self.cancel_token = cancel_token or CancellationToken()
+        
         # Initialize platform bots
         self.bots = {}
-        self._initialize_bots()
+        self.watchdogs = {}
+        self.resilience = PlatformResilience(self.config.get("settings", {}))
+        self.platforms = PlatformRegistry(self.config.get("settings", {}).get("platform_modules", {}))
+        if init_platforms:
+            self._initialize_bots(platforms)
         
         # Track results
+        self.listeners = []
         self.all_jobs = []
         self.matched_jobs = []
         self.applied_jobs = []
         self.failed_applications = []
         
     def _load_config(self, config_path: str) -> Dict:
-        """Load configuration from JSON file"""
+        """
+        Load the validated configuration; raises ConfigError (a ValueError) listing every problem
+        The parsed file is cached by the config service; this bot gets its own copy to change.
+        """
+        return copy.deepcopy(get_config_service(config_path).get())
+    
+    def _on_config_reload(self, config: Dict):
+        """Config service subscriber; the new config is applied at the bot's next checkpoint"""
+        self._pending_config = config
+    
+    def _apply_config_changes(self):
+        """
+        Pick up an edited config file between steps of a run
+        The profile, job search options and retry settings take effect at once; credentials,
+        platforms and browser options are only read when the bots start.
+        """
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        except FileNotFoundError:
-            raise FileNotFoundError(f"Configuration file not found: {config_path}. Please create config.json from config.json.example")
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Invalid JSON in config file: {str(e)}")
+            self.config_service.refresh()
+        except Exception as e:
+            self.logger.warning(f"Could not check {self.config_service.path} for changes: {str(e)}")
+        config, self._pending_config = self._pending_config, None
+        if config is None:
+            return
+        
+        self.config = copy.deepcopy(config)
+        self.profile_matcher = ProfileMatcher(self.config.get("profile", {}))
+        self.resilience.configure(self.config.get("settings", {}))
+        for bot in self.bots.values():
+            bot.config = self.config
+            bot.profile_matcher = self.profile_matcher
+        self.logger.info("Applied the updated configuration")
     
     def setup_logging(self):
         """Setup logging configuration"""
@@ -58,30 +108,23 @@ class JobApplicationBot:
             ]
         )
     
-    def _initialize_bots(self):
-        """Initialize bots for each platform"""
-        credentials = self.config.get("credentials", {})
-        
-        if "naukri" in credentials and credentials["naukri"].get("email"):
-            self.bots["naukri"] = NaukriBot(
-                credentials["naukri"],
-                self.profile_matcher,
-                self.config
-            )
-        
-        if "linkedin" in credentials and credentials["linkedin"].get("email"):
-            self.bots["linkedin"] = LinkedInBot(
-                credentials["linkedin"],
-                self.profile_matcher,
-                self.config
-            )
-        
-        if "indeed" in credentials and credentials["indeed"].get("email"):
-            self.bots["indeed"] = IndeedBot(
-                credentials["indeed"],
-                self.profile_matcher,
-                self.config
-            )
+    def _initialize_bots(self, platforms: List[str] = None):
+        """Create a bot for each platform with credentials; only those platforms' modules are imported"""
+        for platform, credentials in self.config.get("credentials", {}).items():
+            if not isinstance(credentials, dict) or not credentials.get("email"):
+                continue
+            if platforms and platform not in platforms:
+                continue
+            if platform not in self.platforms:
+                self.logger.warning(f"No bot registered for platform: {platform}")
+                continue
+            try:
+                bot_class = self.platforms.load(platform)
+            except Exception as e:
+                self.logger.error(f"Could not load the {platform} bot: {str(e)}")
+                continue
+            self.bots[platform] = bot_class(credentials, self.profile_matcher, self.config)
+            self.bots[platform].cancel_token = self.cancel_token
     
     def login_all_platforms(self) -> Dict[str, bool]:
         """Login to all configured platforms"""
@@ -89,13 +132,20 @@ class JobApplicationBot:
         self.logger.info("Logging in to all platforms...")
         
         for platform, bot in self.bots.items():
+            self.cancel_token.check()
             try:
                 self.logger.info(f"Initializing {platform} bot...")
                 bot.initialize_driver()
-                time.sleep(2)
+                self.cancel_token.sleep(2)
+                
+                if self.config.get("settings", {}).get("driver_watchdog", False):
+                    from driver_watchdog import DriverWatchdog
+                    self.watchdogs[platform] = DriverWatchdog(bot, self.config.get("settings", {}))
+                    self.watchdogs[platform].attach()
                 
                 self.logger.info(f"Logging in to {platform}...")
-                success = bot.login()
+                with metrics.LOGIN_SECONDS.time(platform=platform):
+                    success = bot.login()
                 results[platform] = success
                 
                 if success:
@@ -118,19 +168,29 @@ class JobApplicationBot:
         locations = self.config.get("job_search", {}).get("locations", [])
         
         for platform, bot in self.bots.items():
+            self._apply_config_changes()
             try:
                 self.logger.info(f"Searching jobs on {platform}...")
                 
                 # Search with each location
                 for location in locations[:3]:  # Limit to first 3 locations
-                    jobs = bot.search_jobs(keywords, location)
-                    all_jobs.extend(jobs)
-                    time.sleep(2)  # Delay between searches
+                    self.cancel_token.check()
+                    self._check_driver(platform)
+                    jobs = self.resilience.call(platform, bot, bot.search_jobs, keywords, location, succeeded=no_error)
+                    all_jobs.extend(jobs or [])
+                    self._record_scraped(platform, jobs)
+                    self.cancel_token.sleep(2)  # Delay between searches
                 
                 # Also search without location
-                jobs = bot.search_jobs(keywords, "")
-                all_jobs.extend(jobs)
+                self.cancel_token.check()
+                self._check_driver(platform)
+                jobs = self.resilience.call(platform, bot, bot.search_jobs, keywords, "", succeeded=no_error)
+                all_jobs.extend(jobs or [])
+                self._record_scraped(platform, jobs)
                 
+            except CircuitOpenError as e:
+                self.logger.warning(f"Skipping the rest of the {platform} search: {str(e)}")
+                continue
             except Exception as e:
                 self.logger.error(f"Error searching {platform}: {str(e)}")
                 continue
@@ -147,23 +207,77 @@ class JobApplicationBot:
         self.logger.info(f"Found {len(self.all_jobs)} unique jobs across all platforms")
         return self.all_jobs
     
-    def match_jobs(self) -> List[JobMatch]:
-        """Match jobs against profile and filter by score"""
+    def enrich_jobs(self, matchers: List[ProfileMatcher] = None) -> int:
+        """
+        Fetch job detail pages to fill in missing descriptions before matching
+        matchers lists every profile the jobs will be scored against (default: this bot's profile).
+        """
+        job_search = self.config.get("job_search", {})
+        if not job_search.get("enrich_details", False):
+            return 0
+        
+        fetchers = {
+            platform: bot.fetch_job_details
+            for platform, bot in self.bots.items()
+            if bot.driver is not None
+        }
+        enricher = JobEnricher(
+            fetchers,
+            max_workers=job_search.get("enrich_workers", 8),
+            per_host_limit=job_search.get("enrich_per_host", 2),
+            cancel_token=self.cancel_token
+        )
+        
+        # Skip jobs that cannot reach the minimum score whatever their details say
+        min_score = job_search.get("min_match_score", 70)
+        matchers = matchers or [self.profile_matcher]
+        candidates = [
+            job for job in self.all_jobs
+            if any(
+                matcher.calculate_upper_bound_score(job.get("title", ""), job.get("experience", "")) >= min_score
+                for matcher in matchers
+            )
+        ]
+        skipped = len(self.all_jobs) - len(candidates)
+        if skipped:
+            self.logger.info(f"Skipping details for {skipped} jobs that cannot reach score {min_score}")
+        
+        return enricher.enrich(candidates)
+    
+    def match_jobs(self, scores: List = None) -> List[JobMatch]:
+        """
+        Match jobs against profile and filter by score
+        scores optionally holds a precomputed (score, details) per job, e.g. one column of score_matrix.
+        """
+        self._apply_config_changes()
         self.logger.info("Matching jobs against profile...")
         matched_jobs = []
         
         min_score = self.config.get("job_search", {}).get("min_match_score", 70)
+        scored = []
         
-        for job in self.all_jobs:
+        for i, job in enumerate(self.all_jobs):
             try:
-                score, details = self.profile_matcher.calculate_match_score(
-                    job.get("title", ""),
-                    job.get("description", ""),
-                    job.get("requirements", ""),
-                    job.get("experience", "")
-                )
+                platform = self._get_platform_from_url(job.get("url", ""))
+                if scores is not None:
+                    if scores[i] is None:
+                        continue
+                    score, details = scores[i]
+                else:
+                    with metrics.SCORING_SECONDS.time():
+                        score, details = self.profile_matcher.calculate_match_score(
+                            job.get("title", ""),
+                            job.get("description", ""),
+                            job.get("requirements", ""),
+                            job.get("experience", "")
+                        )
+                metrics.JOBS_SCORED.inc(platform=platform)
+                eligible = self.profile_matcher.is_job_eligible(score, min_score)
+                scored.append({"url": job.get("url", ""), "score": round(score, 1), "matched": eligible})
+                if len(scored) >= SCORED_BATCH_SIZE:
+                    self._record_scored(scored)
                 
-                if self.profile_matcher.is_job_eligible(score, min_score):
+                if eligible:
                     job_match = JobMatch(
                         title=job.get("title", ""),
                         company=job.get("company", ""),
@@ -174,7 +288,9 @@ class JobApplicationBot:
                         matched_skills=details.get("matched_skills", []),
                         missing_skills=details.get("missing_skills", []),
                         experience_match=details.get("experience_match", True),
-                        reason=details.get("reason", "")
+                        reason=details.get("reason", ""),
+                        platform=platform,
+                        posted=job.get("posted", "")
                     )
                     matched_jobs.append(job_match)
                     
@@ -182,10 +298,15 @@ class JobApplicationBot:
                 self.logger.warning(f"Error matching job {job.get('title', '')}: {str(e)}")
                 continue
         
+        self._record_scored(scored)
+        
         # Sort by match score (highest first)
         matched_jobs.sort(key=lambda x: x.match_score, reverse=True)
         
         self.matched_jobs = matched_jobs
+        for job_match in self.matched_jobs:
+            metrics.JOBS_MATCHED.inc(platform=job_match.platform)
+            self._emit("job_matched", self._job_summary(job_match))
         self.logger.info(f"Found {len(self.matched_jobs)} jobs matching profile (score >= {min_score})")
         return self.matched_jobs
     
@@ -200,7 +321,6 @@ class JobApplicationBot:
             self.logger.info("Auto-apply is disabled. Showing matched jobs only.")
             return {"applied": 0, "failed": 0}
         
-        apply_delay = self.config.get("job_search", {}).get("apply_delay_seconds", 5)
         max_apps = max_applications or len(self.matched_jobs)
         
         self.logger.info(f"Starting to apply to {min(max_apps, len(self.matched_jobs))} jobs...")
@@ -208,54 +328,121 @@ class JobApplicationBot:
         applied_count = 0
         failed_count = 0
         
-        for i, job_match in enumerate(self.matched_jobs[:max_apps]):
-            try:
-                self.logger.info(f"\n[{i+1}/{max_apps}] Applying to: {job_match.title} at {job_match.company}")
-                self.logger.info(f"Match Score: {job_match.match_score:.1f}% - {job_match.reason}")
+        # Optionally preload upcoming job pages in extra tabs of each platform's browser
+        apply_tabs = self.config.get("settings", {}).get("apply_tabs", 1)
+        executors = {}
+        if apply_tabs > 1:
+            executors = {
+                platform: TabApplyExecutor(bot, apply_tabs)
+                for platform, bot in self.bots.items()
+                if bot.driver is not None
+            }
+        
+        # Either a priority schedule re-ranked as results arrive, or plain score order
+        scheduler = None
+        apply_queue = self.matched_jobs[:max_apps]
+        if self.config.get("job_search", {}).get("apply_scheduler", False):
+            scheduler = self._build_scheduler(max_apps)
+            apply_queue = scheduler
+        
+        try:
+            for i, job_match in enumerate(apply_queue):
+                self.cancel_token.check()
+                self._apply_config_changes()
+                try:
+                    self.logger.info(f"\n[{i+1}/{max_apps}] Applying to: {job_match.title} at {job_match.company}")
+                    self.logger.info(f"Match Score: {job_match.match_score:.1f}% - {job_match.reason}")
                 
-                # Determine which bot to use based on platform
-                platform = self._get_platform_from_url(job_match.url)
-                bot = self.bots.get(platform)
+                    # Determine which bot to use based on platform
+                    platform = self._get_platform_from_url(job_match.url)
+                    bot = self.bots.get(platform)
                 
-                if not bot:
-                    self.logger.warning(f"No bot available for platform: {platform}")
-                    failed_count += 1
-                    self.failed_applications.append({
-                        "job": job_match.title,
-                        "reason": f"No bot for platform: {platform}"
-                    })
-                    continue
+                    if not bot:
+                        self.logger.warning(f"No bot available for platform: {platform}")
+                        failed_count += 1
+                        self._record_failure({
+                            "job": job_match.title,
+                            "url": job_match.url,
+                            "reason": f"No bot for platform: {platform}"
+                        })
+                        continue
                 
-                # Apply to job
-                success = bot.apply_to_job(job_match.url)
+                    # Restart the browser first if it has grown too large or stopped responding
+                    if self._check_driver(platform) and platform in executors:
+                        executors[platform] = TabApplyExecutor(bot, apply_tabs)
                 
-                if success:
-                    applied_count += 1
-                    self.applied_jobs.append({
-                        "title": job_match.title,
-                        "company": job_match.company,
+                    # Apply to job
+                    executor = executors.get(platform)
+                    if executor:
+                        if scheduler:
+                            upcoming = [job.url for job in scheduler.upcoming(platform, apply_tabs)]
+                        else:
+                            upcoming = [
+                                job.url for job in apply_queue[i + 1:]
+                                if self._get_platform_from_url(job.url) == platform
+                            ]
+                        with metrics.APPLY_SECONDS.time(platform=platform):
+                            success = self.resilience.call(platform, bot, executor.apply, job_match.url, upcoming)
+                    else:
+                        with metrics.APPLY_SECONDS.time(platform=platform):
+                            success = self.resilience.call(platform, bot, bot.apply_to_job, job_match.url)
+                
+                    if scheduler:
+                        scheduler.record(job_match, success)
+                
+                    if success:
+                        applied_count += 1
+                        self._record_applied({
+                            "title": job_match.title,
+                            "company": job_match.company,
+                            "url": job_match.url,
+                            "score": job_match.match_score,
+                            "platform": platform
+                        })
+                        self.logger.info(f"✓ Successfully applied to {job_match.title}")
+                    else:
+                        failed_count += 1
+                        self._record_failure({
+                            "job": job_match.title,
+                            "url": job_match.url,
+                            "reason": "Application failed"
+                        })
+                        self.logger.warning(f"✗ Failed to apply to {job_match.title}")
+                
+                    # Delay between applications
+                    if i < max_apps - 1:
+                        self.cancel_token.sleep(self.config.get("job_search", {}).get("apply_delay_seconds", 5))
+                    
+                except CircuitOpenError as e:
+                    self.logger.warning(f"Skipping {job_match.title}: {str(e)}")
+                    failed_count += 1
+                    self._record_failure({
+                        "job": job_match.title,
                         "url": job_match.url,
-                        "score": job_match.match_score,
-                        "platform": platform
+                        "reason": str(e)
                     })
-                    self.logger.info(f"✓ Successfully applied to {job_match.title}")
-                else:
+                    continue
+                except Exception as e:
+                    self.logger.error(f"Error applying to {job_match.title}: {str(e)}")
+                    if scheduler:
+                        scheduler.record(job_match, False)
                     failed_count += 1
-                    self.failed_applications.append({
+                    self._record_failure({
                         "job": job_match.title,
                         "url": job_match.url,
-                        "reason": "Application failed"
+                        "reason": str(e)
                     })
-                    self.logger.warning(f"✗ Failed to apply to {job_match.title}")
-                
-                # Delay between applications
-                if i < max_apps - 1:
-                    time.sleep(apply_delay)
-                    
-            except Exception as e:
-                self.logger.error(f"Error applying to {job_match.title}: {str(e)}")
-                failed_count += 1
-                continue
+                    continue
+        
+        finally:
+            # Also runs when the run is stopped, so tabs are closed and history is kept
+            for executor in executors.values():
+                executor.close()
+            if scheduler:
+                scheduler.history.save()
+        
+        if scheduler and scheduler.skipped:
+            self.logger.info(f"Skipped {len(scheduler.skipped)} jobs: daily application limit reached")
         
         self.logger.info(f"\n=== Application Summary ===")
         self.logger.info(f"Applied: {applied_count}")
@@ -263,16 +450,88 @@ class JobApplicationBot:
         
         return {"applied": applied_count, "failed": failed_count}
     
+    def add_listener(self, listener):
+        """Register listener(event, data), called for scraped, scored, matched, applied and failed jobs"""
+        self.listeners.append(listener)
+    
+    def _emit(self, event: str, data: Dict):
+        for listener in self.listeners:
+            try:
+                listener(event, data)
+            except Exception as e:
+                self.logger.debug(f"Listener failed on {event}: {str(e)}")
+    
+    @staticmethod
+    def _job_summary(job_match: JobMatch) -> Dict:
+        return {
+            "title": job_match.title,
+            "company": job_match.company,
+            "location": job_match.location,
+            "score": round(job_match.match_score, 1),
+            "url": job_match.url,
+            "platform": job_match.platform
+        }
+    
+    def _record_scraped(self, platform: str, jobs: List[Dict]):
+        jobs = jobs or []
+        metrics.JOBS_SCRAPED.inc(len(jobs), platform=platform)
+        self._emit("jobs_scraped", {
+            "platform": platform,
+            "count": len(jobs),
+            "jobs": [
+                {
+                    "title": job.get("title", ""),
+                    "company": job.get("company", ""),
+                    "location": job.get("location", ""),
+                    "url": job.get("url", ""),
+                    "platform": platform
+                }
+                for job in jobs
+            ]
+        })
+    
+    def _record_scored(self, scored: List[Dict]):
+        """Emit a batch of {"url", "score", "matched"} and empty it"""
+        if scored:
+            self._emit("jobs_scored", {"count": len(scored), "jobs": list(scored)})
+            scored.clear()
+    
+    def _record_applied(self, entry: Dict):
+        self.applied_jobs.append(entry)
+        metrics.JOBS_APPLIED.inc(platform=entry["platform"])
+        self._emit("job_applied", entry)
+    
+    def _record_failure(self, entry: Dict):
+        self.failed_applications.append(entry)
+        metrics.JOBS_FAILED.inc(platform=self._get_platform_from_url(entry.get("url", "")))
+        self._emit("application_failed", entry)
+    
+    def _build_scheduler(self, max_applications: int) -> ApplyScheduler:
+        """Priority scheduler over matched_jobs using this profile's quotas and weights"""
+        job_search = self.config.get("job_search", {})
+        return ApplyScheduler(
+            self.matched_jobs,
+            ApplyHistory(job_search.get("apply_history_file", "apply_history.json")),
+            daily_limits=job_search.get("daily_apply_limits", {}),
+            weights=job_search.get("apply_priority_weights", {}),
+            freshness_half_life_days=job_search.get("freshness_half_life_days", 7),
+            max_applications=max_applications
+        )
+    
+    def _check_driver(self, platform: str) -> bool:
+        """Let the platform's watchdog recycle its driver; returns True if it was recycled"""
+        watchdog = self.watchdogs.get(platform)
+        if not watchdog:
+            return False
+        try:
+            return watchdog.check()
+        except Exception as e:
+            self.logger.error(f"Error recycling {platform} browser: {str(e)}")
+            return False
+    
     def _get_platform_from_url(self, url: str) -> str:
         """Determine platform from job URL"""
-        url_lower = url.lower()
-        if "naukri.com" in url_lower:
-            return "naukri"
-        elif "linkedin.com" in url_lower:
-            return "linkedin"
-        elif "indeed.com" in url_lower:
-            return "indeed"
-        return "unknown"
+        return self.platforms.platform_for_url(url) or "unknown"
     
     def generate_report(self) -> str:
         """Generate a summary report"""
@@ -335,6 +594,11 @@ TOP MATCHED JOBS:
         
         self.logger.info(f"Results saved to {filename}")
     
+    def save_jobs(self, filename: str = "job_corpus.jsonl"):
+        """Save every scraped job so the corpus can be re-scored or shared between profiles"""
+        count = save_jobs(self.all_jobs, filename)
+        self.logger.info(f"Saved {count} jobs to {filename}")
+    
     def run(self):
         """Run the complete job search and application process"""
         try:
@@ -355,7 +619,9 @@ TOP MATCHED JOBS:
                 self.logger.warning("No jobs found. Exiting.")
                 return
             
-            # Step 3: Match jobs
+            # Step 3: Fill in missing job details, then match jobs
+            self.enrich_jobs()
+            self.save_jobs()
             self.match_jobs()
             
             if not self.matched_jobs:
@@ -387,15 +653,21 @@ TOP MATCHED JOBS:
             self.logger.info("JOB APPLICATION BOT COMPLETED")
             self.logger.info("="*60)
             
+        except CancelledError:
+            self.logger.info("Run stopped")
         except Exception as e:
             self.logger.error(f"Error in bot execution: {str(e)}", exc_info=True)
         finally:
-            # Close all browsers
-            for bot in self.bots.values():
-                try:
-                    bot.close()
-                except:
-                    pass
+            self.close_all()
+    
+    def close_all(self):
+        """Close all browsers"""
+        self.config_service.unsubscribe(self._on_config_reload)
+        for bot in self.bots.values():
+            try:
+                bot.close()
+            except:
+                pass
 
 
 if __name__ == "__main__":
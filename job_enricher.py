@@ -0,0 +1,97 @@
+"""
+Job Enricher - Fills in missing job details from job detail pages
+Fetches detail pages concurrently through a bounded worker pool with per-host limits
+"""
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+from cancellation import CancellationToken
+
+
+DetailFetcher = Callable[[str], Optional[Dict]]
+
+
+class JobEnricher:
+    """Enriches scraped jobs with description, requirements and experience"""
+
+    def __init__(self, fetchers: Dict[str, DetailFetcher], max_workers: int = 8,
+                 per_host_limit: int = 2, min_description_length: int = 200,
+                 cancel_token: CancellationToken = None):
+        """
+        fetchers maps a lower-case platform name (job["platform"]) to a callable
+        that takes a job URL and returns a dict of detail fields, or None on failure
+        """
+        self.fetchers = fetchers
+        self.cancel_token = cancel_token or CancellationToken()
+        self.max_workers = max_workers
+        self.per_host_limit = per_host_limit
+        self.min_description_length = min_description_length
+        self.logger = logging.getLogger(__name__)
+        self._host_slots = {}
+        self._host_lock = threading.Lock()
+
+    def needs_enrichment(self, job: Dict) -> bool:
+        """
+        Check whether a job's card description is missing or truncated
+        Cards never carry requirements, so their absence says nothing about the card and is not checked.
+        """
+        if not job.get("url") or job.get("platform", "").lower() not in self.fetchers:
+            return False
+        return len(job.get("description", "")) < self.min_description_length
+
+    def _host_slot(self, url: str) -> threading.BoundedSemaphore:
+        """Return the semaphore limiting concurrent requests to url's host"""
+        host = urlparse(url).netloc
+        with self._host_lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(self.per_host_limit)
+            return self._host_slots[host]
+
+    def _fetch(self, job: Dict) -> Optional[Dict]:
+        """Fetch the detail fields for one job, respecting the per-host limit"""
+        fetcher = self.fetchers[job["platform"].lower()]
+        if self.cancel_token.cancelled:
+            return None  # Drain the queued fetches quickly once the run is stopped
+        with self._host_slot(job["url"]):
+            try:
+                return fetcher(job["url"])
+            except Exception as e:
+                self.logger.warning(f"Error fetching details for {job.get('title', '')}: {str(e)}")
+                return None
+
+    @staticmethod
+    def _merge(job: Dict, details: Dict) -> bool:
+        """Fill empty fields (and truncated descriptions) from the fetched details"""
+        changed = False
+        description = details.get("description", "")
+        if len(description) > len(job.get("description", "")):
+            job["description"] = description
+            changed = True
+        for field in ("requirements", "experience"):
+            if details.get(field) and not job.get(field):
+                job[field] = details[field]
+                changed = True
+        return changed
+
+    def enrich(self, jobs: List[Dict]) -> int:
+        """Enrich jobs in place; returns the number of jobs that gained details"""
+        pending = [job for job in jobs if self.needs_enrichment(job)]
+        if not pending:
+            return 0
+
+        self.logger.info(f"Fetching details for {len(pending)} jobs...")
+        enriched = 0
+        # Workers are named after the calling thread so their log lines stay with its run
+        with ThreadPoolExecutor(max_workers=self.max_workers,
+                                thread_name_prefix=threading.current_thread().name) as executor:
+            for job, details in zip(pending, executor.map(self._fetch, pending)):
+                if details and self._merge(job, details):
+                    job["enriched"] = True
+                    enriched += 1
+        self.cancel_token.check()
+
+        self.logger.info(f"Enriched {enriched}/{len(pending)} jobs with detail page data")
+        return enriched
@@ -0,0 +1,83 @@
+"""
+Job Store - Saves and loads the scraped job corpus
+Jobs are saved as JSON Lines; saved results (JSON) and the worker queue (SQLite) can be read back too
+"""
+
+import os
+import json
+import sqlite3
+from typing import Dict, List, Optional
+
+
+SQLITE_EXTENSIONS = (".db", ".sqlite", ".sqlite3")
+
+
+def save_jobs(jobs: List[Dict], path: str = "job_corpus.jsonl") -> int:
+    """Write jobs to a JSON Lines file; returns the number written"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for job in jobs:
+            f.write(json.dumps(job, ensure_ascii=False) + "\n")
+    return len(jobs)
+
+
+def _load_jsonl(path: str) -> List[Dict]:
+    jobs = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line_number, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                jobs.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                raise ValueError(f"Invalid job on line {line_number} of {path}: {str(e)}")
+    return jobs
+
+
+def _load_json(path: str) -> List[Dict]:
+    """A list of jobs, or a saved results file (whose matched jobs carry no description)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            data = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON in {path}: {str(e)}")
+    if isinstance(data, list):
+        return data
+    for key in ("jobs", "all_jobs", "matched_jobs"):
+        if isinstance(data.get(key), list):
+            return data[key]
+    raise ValueError(f"No job list found in {path}")
+
+
+def _load_sqlite(path: str, run_id: Optional[str] = None) -> List[Dict]:
+    """Jobs from a worker queue database, latest copy of each URL"""
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        query = "SELECT data FROM jobs"
+        params = []
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            params.append(run_id)
+        rows = conn.execute(query + " ORDER BY scraped_at", params).fetchall()
+    except sqlite3.Error as e:
+        raise ValueError(f"Could not read jobs from {path}: {str(e)}")
+    finally:
+        conn.close()
+
+    jobs = {}
+    for (data,) in rows:
+        job = json.loads(data)
+        jobs[job.get("url", "")] = job
+    return list(jobs.values())
+
+
+def load_jobs(path: str = "job_corpus.jsonl", run_id: Optional[str] = None) -> List[Dict]:
+    """Read saved jobs from a .jsonl, .json or SQLite (.db) file; run_id selects one queue run"""
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"Jobs file not found: {path}")
+    extension = os.path.splitext(path)[1].lower()
+    if extension in SQLITE_EXTENSIONS:
+        return _load_sqlite(path, run_id)
+    if extension == ".json":
+        return _load_json(path)
+    return _load_jsonl(path)
@@ -3,55 +3,34 @@ LinkedIn Automation Bot
 Handles login, job search, and application on LinkedIn
 """
 
-import time
-import logging
 from typing import List, Dict, Optional
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from urllib.parse import urlencode, urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from profile_matcher import ProfileMatcher, JobMatch
+from platforms import BasePlatformBot
+from form_engine import SUBMITTED, button_xpath
+from http_fetcher import select_text
 
 
-class LinkedInBot:
+class LinkedInBot(BasePlatformBot):
     """Automation bot for LinkedIn"""
     
-    def __init__(self, credentials: Dict, profile_matcher: ProfileMatcher, config: Dict):
-        self.email = credentials.get("email")
-        self.password = credentials.get("password")
-        self.profile_matcher = profile_matcher
-        self.config = config
-        self.driver = None
-        self.logger = logging.getLogger(__name__)
-        self.base_url = "https://www.linkedin.com"
-        
-    def initialize_driver(self):
-        """Initialize Selenium WebDriver"""
-        options = webdriver.ChromeOptions()
-        if self.config.get("settings", {}).get("headless", False):
-            options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.implicitly_wait(self.config.get("settings", {}).get("implicit_wait", 10))
-        self.driver.set_page_load_timeout(self.config.get("settings", {}).get("page_load_timeout", 30))
-        
+    name = "linkedin"
+    base_url = "https://www.linkedin.com"
+    domains = ("linkedin.com",)
+    display_name = "LinkedIn"
+    card_selector = ".job-card-container, .jobs-search-results__list-item, [data-job-id]"
+    html_card_selector = ".base-search-card, .job-card-container, [data-job-id]"
+    scroll_results = True
+    
     def login(self) -> bool:
         """Login to LinkedIn account"""
         try:
             self.logger.info("Navigating to LinkedIn login page...")
             self.driver.get(f"{self.base_url}/login")
-            time.sleep(3)
+            self.sleep(3)
             
             # Check if already logged in
             try:
@@ -62,23 +41,23 @@ class LinkedInBot:
                 pass
             
             # Enter email
-            email_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "username"))
+            email_input = self.wait_for(
+                EC.presence_of_element_located((By.ID, "username")), timeout=10
             )
             email_input.clear()
             email_input.send_keys(self.email)
-            time.sleep(1)
+            self.sleep(1)
             
             # Enter password
             password_input = self.driver.find_element(By.ID, "password")
             password_input.clear()
             password_input.send_keys(self.password)
-            time.sleep(1)
+            self.sleep(1)
             
             # Click login button
             submit_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             submit_btn.click()
-            time.sleep(5)
+            self.sleep(5)
             
             # Handle security check if needed
             try:
@@ -87,14 +66,14 @@ class LinkedInBot:
                 if security_check:
                     self.logger.warning("Security verification required. Please complete manually.")
                     input("Please complete security verification and press Enter...")
-            except:
+            except Exception:
                 pass
             
             # Verify login
             try:
-                WebDriverWait(self.driver, 15).until(
+                self.wait_for(
                     EC.presence_of_element_located((By.CSS_SELECTOR, 
-                        "[data-test-id='nav__profile-menu'], .global-nav__me, .feed-identity-module"))
+                        "[data-test-id='nav__profile-menu'], .global-nav__me, .feed-identity-module")), timeout=15
                 )
                 self.logger.info("Successfully logged in to LinkedIn")
                 return True
@@ -104,12 +83,19 @@ class LinkedInBot:
                 
         except Exception as e:
             self.logger.error(f"Error during LinkedIn login: {str(e)}")
+            self.last_error = e
             if self.config.get("settings", {}).get("screenshot_on_error", True):
                 self.driver.save_screenshot("linkedin_login_error.png")
             return False
     
     def search_jobs(self, keywords: List[str], location: str = "") -> List[Dict]:
         """Search for jobs on LinkedIn"""
+        settings = self.config.get("settings", {})
+        if settings.get("fetch_mode", "browser") == "hybrid":
+            return self._search_jobs_http(keywords, location)
+        if settings.get("prefetch_pages", False):
+            return self._search_jobs_prefetch(keywords, location)
+        
         jobs = []
         try:
             self.logger.info(f"Searching jobs on LinkedIn with keywords: {keywords}")
@@ -117,17 +103,17 @@ class LinkedInBot:
             # Navigate to jobs page
             jobs_url = f"{self.base_url}/jobs"
             self.driver.get(jobs_url)
-            time.sleep(5)
+            self.sleep(5)
             
             # Enter search keywords
             try:
-                search_box = WebDriverWait(self.driver, 10).until(
+                search_box = self.wait_for(
                     EC.presence_of_element_located((By.CSS_SELECTOR, 
-                        "input[aria-label*='Search jobs'], input[placeholder*='Search jobs'], .jobs-search-box__input"))
+                        "input[aria-label*='Search jobs'], input[placeholder*='Search jobs'], .jobs-search-box__input")), timeout=10
                 )
                 search_box.clear()
                 search_box.send_keys(keywords[0] if keywords else "Java Developer")
-                time.sleep(2)
+                self.sleep(2)
             except TimeoutException:
                 self.logger.warning("Could not find search box")
                 return jobs
@@ -139,8 +125,8 @@ class LinkedInBot:
                         "input[aria-label*='Location'], input[placeholder*='Location'], .jobs-search-box__input--location")
                     location_box.clear()
                     location_box.send_keys(location)
-                    time.sleep(2)
-                except:
+                    self.sleep(2)
+                except Exception:
                     pass
             
             # Click search button
@@ -148,40 +134,26 @@ class LinkedInBot:
                 search_btn = self.driver.find_element(By.CSS_SELECTOR, 
                     "button[aria-label='Search'], .jobs-search-box__submit-button")
                 search_btn.click()
-            except:
+            except Exception:
                 search_box.send_keys(Keys.RETURN)
             
-            time.sleep(5)
+            self.sleep(5)
             
             # Extract job listings
             max_pages = 5
             max_jobs = self.config.get("job_search", {}).get("max_jobs_per_platform", 50)
             
             for page in range(max_pages):
+                self.cancel_token.check()
                 if len(jobs) >= max_jobs:
                     break
                     
                 self.logger.info(f"Scraping page {page + 1}...")
-                
-                # Find job cards
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, 
-                    ".job-card-container, .jobs-search-results__list-item, [data-job-id]")
-                
-                for card in job_cards:
-                    if len(jobs) >= max_jobs:
-                        break
-                    
-                    try:
-                        job_data = self._extract_job_data(card)
-                        if job_data:
-                            jobs.append(job_data)
-                    except Exception as e:
-                        self.logger.warning(f"Error extracting job data: {str(e)}")
-                        continue
+                jobs.extend(self._extract_current_page(max_jobs - len(jobs)))
                 
                 # Scroll to load more
                 self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(2)
+                self.sleep(2)
                 
                 # Go to next page
                 if page < max_pages - 1 and len(jobs) < max_jobs:
@@ -190,10 +162,10 @@ class LinkedInBot:
                             "button[aria-label='Next'], .artdeco-pagination__button--next")
                         if next_btn.is_enabled() and "disabled" not in next_btn.get_attribute("class"):
                             next_btn.click()
-                            time.sleep(3)
+                            self.sleep(3)
                         else:
                             break
-                    except:
+                    except Exception:
                         break
             
             self.logger.info(f"Found {len(jobs)} jobs on LinkedIn")
@@ -201,6 +173,7 @@ class LinkedInBot:
             
         except Exception as e:
             self.logger.error(f"Error searching jobs on LinkedIn: {str(e)}")
+            self.last_error = e
             return jobs
     
     def _extract_job_data(self, job_card) -> Optional[Dict]:
@@ -216,14 +189,14 @@ class LinkedInBot:
             try:
                 company = job_card.find_element(By.CSS_SELECTOR, 
                     ".job-card-container__company-name, .job-card-container__primary-description").text.strip()
-            except:
+            except Exception:
                 company = "Not specified"
             
             # Location
             try:
                 location = job_card.find_element(By.CSS_SELECTOR, 
                     ".job-card-container__metadata-item, .job-card-container__metadata-wrapper").text.strip()
-            except:
+            except Exception:
                 location = "Not specified"
             
             # Description (might need to click to get full description)
@@ -231,7 +204,15 @@ class LinkedInBot:
             try:
                 description = job_card.find_element(By.CSS_SELECTOR, 
                     ".job-card-container__description, .job-card-list__description").text.strip()
-            except:
+            except Exception:
+                pass
+            
+            # Posting date (the datetime attribute is an ISO date)
+            posted = ""
+            try:
+                posted_elem = job_card.find_element(By.CSS_SELECTOR, "time")
+                posted = posted_elem.get_attribute("datetime") or posted_elem.text.strip()
+            except Exception:
                 pass
             
             return {
@@ -239,6 +220,7 @@ class LinkedInBot:
                 "company": company,
                 "location": location,
                 "description": description,
+                "posted": posted,
                 "url": job_url,
                 "platform": "LinkedIn"
             }
@@ -246,32 +228,85 @@ class LinkedInBot:
             self.logger.warning(f"Could not extract job data: {str(e)}")
             return None
     
-    def apply_to_job(self, job_url: str) -> bool:
-        """Apply to a job on LinkedIn (Easy Apply)"""
+    def build_search_url(self, keyword: str, location: str = "", page: int = 0) -> str:
+        """Build the LinkedIn results URL for a keyword, location and zero-based page"""
+        query = {"keywords": keyword}
+        if location:
+            query["location"] = location
+        if page > 0:
+            query["start"] = page * 25
+        return f"{self.base_url}/jobs/search/?{urlencode(query)}"
+    
+    def build_listing_url(self, keyword: str, location: str = "", page: int = 0) -> str:
+        """Build the server-rendered LinkedIn listing URL used for HTTP fetching"""
+        query = {"keywords": keyword, "start": page * 25}
+        if location:
+            query["location"] = location
+        return f"{self.base_url}/jobs-guest/jobs/api/seeMoreJobPostings/search?{urlencode(query)}"
+    
+    def _extract_job_data_from_html(self, job_card) -> Optional[Dict]:
+        """Extract job data from a parsed (BeautifulSoup) job card"""
+        title = select_text(job_card, ".base-search-card__title, .job-card-list__title")
+        link = job_card.select_one("a.base-card__full-link, a.job-card-container__link, a[href*='/jobs/view/']")
+        if not title or link is None:
+            return None
+        job_url = urljoin(self.base_url, link.get("href", "")).split("?")[0]
+        posted_elem = job_card.select_one("time")
+        posted = ""
+        if posted_elem is not None:
+            posted = posted_elem.get("datetime") or posted_elem.get_text(" ", strip=True)
+        
+        return {
+            "title": title,
+            "company": select_text(job_card,
+                ".base-search-card__subtitle, .job-card-container__company-name", "Not specified"),
+            "location": select_text(job_card,
+                ".job-search-card__location, .job-card-container__metadata-item", "Not specified"),
+            "description": select_text(job_card, ".job-card-container__description, .job-card-list__description"),
+            "posted": posted,
+            "url": job_url,
+            "platform": "LinkedIn"
+        }
+    
+    def _parse_job_detail_html(self, soup) -> Dict:
+        """Extract description, requirements and experience from a job detail page"""
+        criteria = [item.get_text(" ", strip=True) for item in
+                    soup.select(".description__job-criteria-item, .job-criteria__item")]
+        return {
+            "description": select_text(soup,
+                ".show-more-less-html__markup, .jobs-description__content, .description__text"),
+            "requirements": " ".join(criteria),
+            "experience": ""
+        }
+    
+    def apply_to_job(self, job_url: str, navigate: bool = True) -> bool:
+        """Apply to a job on LinkedIn (Easy Apply); navigate=False uses the page already open in the current tab"""
         try:
             self.logger.info(f"Applying to job: {job_url}")
-            self.driver.get(job_url)
-            time.sleep(5)
+            if navigate:
+                self.driver.get(job_url)
+                self.sleep(5)
             
             # Look for Easy Apply button
             apply_selectors = [
-                "button[aria-label='Easy Apply'], .jobs-apply-button, button.jobs-s-apply",
-                "button:contains('Easy Apply')",
-                "button:contains('Apply')"
+                (By.CSS_SELECTOR, "button[aria-label='Easy Apply'], .jobs-apply-button, button.jobs-s-apply"),
+                (By.XPATH, button_xpath(["easy apply"])),
+                (By.XPATH, button_xpath(["apply"]))
             ]
             
             apply_btn = None
-            for selector in apply_selectors:
+            for by, selector in apply_selectors:
                 try:
-                    apply_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                    apply_btn = self.wait_for(
+                        EC.element_to_be_clickable((by, selector)), timeout=5
                     )
                     break
-                except:
+                except Exception:
                     continue
             
             if not apply_btn:
                 self.logger.warning("Easy Apply button not found")
+                self.last_error = "Easy Apply button not found"
                 return False
             
             # Check if already applied
@@ -280,53 +315,27 @@ class LinkedInBot:
                 return True
             
             apply_btn.click()
-            time.sleep(3)
-            
-            # Handle Easy Apply form
-            try:
-                # Fill phone if needed
-                phone_input = self.driver.find_element(By.CSS_SELECTOR, 
-                    "input[aria-label*='phone'], input[id*='phone']")
-                if phone_input and not phone_input.get_attribute("value"):
-                    phone = self.config.get("profile", {}).get("phone", "")
-                    if phone:
-                        phone_input.send_keys(phone)
-                        time.sleep(1)
-            except:
-                pass
             
-            # Submit application
-            try:
-                submit_btn = WebDriverWait(self.driver, 5).until(
-                    EC.element_to_be_clickable((By.CSS_SELECTOR, 
-                        "button[aria-label='Submit application'], button:contains('Submit')"))
-                )
-                submit_btn.click()
-                time.sleep(3)
+            # Walk the Easy Apply steps (the engine waits for the dialog to open)
+            result = self._run_application_form(".jobs-easy-apply-modal, .jobs-easy-apply-content, [role='dialog']")
+            if result == SUBMITTED:
                 self.logger.info("Successfully applied to job")
                 return True
-            except:
-                # Might need multiple steps
-                try:
-                    next_btn = self.driver.find_element(By.CSS_SELECTOR, 
-                        "button[aria-label='Continue to next step'], button:contains('Next')")
-                    next_btn.click()
-                    time.sleep(2)
-                    # Try submit again
-                    submit_btn = self.driver.find_element(By.CSS_SELECTOR, 
-                        "button[aria-label='Submit application']")
-                    submit_btn.click()
-                    time.sleep(3)
-                    return True
-                except:
-                    self.logger.warning("Could not complete application - may require manual steps")
-                    return False
+            
+            self.logger.warning(f"Could not complete application ({result}) - may require manual steps")
+            self._discard_application()
+            return False
             
         except Exception as e:
             self.logger.error(f"Error applying to job: {str(e)}")
+            self.last_error = e
             return False
     
-    def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
+    def _discard_application(self):
+        """Close an unfinished Easy Apply dialog so it does not block the next job"""
+        try:
+            self.driver.find_element(By.CSS_SELECTOR, "button[aria-label='Dismiss']").click()
+            self.sleep(1)
+            self.driver.find_element(By.XPATH, button_xpath(["discard"])).click()
+        except Exception:
+            pass
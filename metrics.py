@@ -0,0 +1,229 @@
+"""
+Metrics - In-process counters, gauges and histograms exposed in Prometheus text format
+The bots record into the module-level REGISTRY and the web server serves it at /metrics
+"""
+
+import time
+import math
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+# Seconds; browser stages take from tens of milliseconds to minutes
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120)
+# Profile scoring is pure Python and takes well under a second per job
+SCORING_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _format_labels(names: Tuple[str, ...], values: Tuple, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class _Metric:
+    """A named metric with a fixed set of label names; one series per label value combination"""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict) -> Tuple:
+        if set(labels) != set(self.labels):
+            raise ValueError(f"{self.name} takes labels {', '.join(self.labels) or '(none)'}, "
+                             f"got {', '.join(labels) or '(none)'}")
+        return tuple(str(labels[name]) for name in self.labels)
+
+    def _samples(self) -> Iterator[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {_escape(self.documentation)}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """A total that only goes up"""
+
+    type = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if amount < 0:
+            raise ValueError("Counters can only be increased")
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        with self._lock:
+            return self._series.get(self._key(labels), 0)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted(self._series.items())
+        for key, value in series:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down
+    Either set directly, or read at scrape time from a function returning (labels, value) pairs.
+    """
+
+    type = "gauge"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._function = None
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set_function(self, function: Callable[[], List[Tuple[Dict, float]]]):
+        self._function = function
+
+    def _samples(self) -> Iterator[str]:
+        if self._function is not None:
+            series = sorted((self._key(labels), value) for labels, value in self._function())
+        else:
+            with self._lock:
+                series = sorted(self._series.items())
+        for key, value in series:
+            yield f"{self.name}{_format_labels(self.labels, key)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Counts observations (durations, in seconds) into cumulative buckets"""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                 buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.setdefault(key, {"counts": [0] * len(self.buckets), "sum": 0.0, "count": 0})
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["counts"][i] += 1
+                    break
+            series["sum"] += value
+            series["count"] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe how long the with-block took, whether or not it raised"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self) -> Iterator[str]:
+        with self._lock:
+            series = sorted((key, dict(value, counts=list(value["counts"]))) for key, value in self._series.items())
+        for key, value in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets, value["counts"]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labels, key, le)} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(self.labels, key)} {_format_value(value['sum'])}"
+            yield f"{self.name}_count{_format_labels(self.labels, key)} {value['count']}"
+
+
+class Registry:
+    """Named metrics, created once and shared by everything in the process"""
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, metric_class: type, name: str, documentation: str, labels: Tuple[str, ...],
+                       **kwargs) -> _Metric:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = metric_class(name, documentation, labels, **kwargs)
+            elif not isinstance(metric, metric_class) or metric.labels != tuple(labels):
+                raise ValueError(f"Metric {name} is already registered with another type or labels")
+            return metric
+
+    def counter(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labels)
+
+    def gauge(self, name: str, documentation: str, labels: Tuple[str, ...] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labels)
+
+    def histogram(self, name: str, documentation: str, labels: Tuple[str, ...] = (),
+                  buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labels, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        with self._lock:
+            return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+REGISTRY = Registry()
+
+# Throughput, per platform
+JOBS_SCRAPED = REGISTRY.counter("jobbot_jobs_scraped_total", "Job cards scraped from search results", ("platform",))
+JOBS_SCORED = REGISTRY.counter("jobbot_jobs_scored_total", "Jobs scored against the profile", ("platform",))
+JOBS_MATCHED = REGISTRY.counter("jobbot_jobs_matched_total", "Jobs at or above the minimum match score", ("platform",))
+JOBS_APPLIED = REGISTRY.counter("jobbot_jobs_applied_total", "Successful applications", ("platform",))
+JOBS_FAILED = REGISTRY.counter("jobbot_jobs_failed_total", "Failed or skipped applications", ("platform",))
+
+# Stage latencies
+PAGE_LOAD_SECONDS = REGISTRY.histogram("jobbot_page_load_seconds", "Browser page load time", ("platform",))
+ELEMENT_WAIT_SECONDS = REGISTRY.histogram("jobbot_element_wait_seconds", "Time spent waiting for page elements",
+                                          ("platform",))
+LOGIN_SECONDS = REGISTRY.histogram("jobbot_login_seconds", "Platform login time", ("platform",))
+APPLY_SECONDS = REGISTRY.histogram("jobbot_apply_seconds", "Time to apply to one job", ("platform",))
+SCORING_SECONDS = REGISTRY.histogram("jobbot_scoring_seconds", "Time to score one job against the profile",
+                                     buckets=SCORING_BUCKETS)
+
+# Browsers; both are read from the open drivers when scraped
+ACTIVE_DRIVERS = REGISTRY.gauge("jobbot_active_drivers", "Open WebDriver sessions", ("platform",))
+DRIVER_MEMORY_BYTES = REGISTRY.gauge("jobbot_driver_memory_bytes",
+                                     "Resident memory of the browser processes behind the open drivers",
+                                     ("platform",))
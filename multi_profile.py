@@ -0,0 +1,86 @@
+"""
+Multi Profile - Scrapes jobs once and matches them against several candidate profiles
+Every job is scored against every profile in one pass; each profile gets its own apply queue and report
+"""
+
+import os
+import logging
+from typing import List, Optional
+from job_application_bot import JobApplicationBot
+from job_store import load_jobs, save_jobs
+from profile_matcher import score_matrix
+
+
+logger = logging.getLogger(__name__)
+
+
+def profile_name(config_path: str) -> str:
+    """Name used for a profile's output files, taken from its config file name"""
+    return os.path.splitext(os.path.basename(config_path))[0]
+
+
+def scrape_corpus(bot: JobApplicationBot, matchers: List = None) -> List:
+    """Log in and search with one profile's credentials and search settings"""
+    login_results = bot.login_all_platforms()
+    if not any(login_results.values()):
+        logger.error("Failed to login to any platform. Nothing to scrape.")
+        return []
+    bot.search_all_platforms()
+    bot.enrich_jobs(matchers)
+    return bot.all_jobs
+
+
+def run_multi_profile(config_paths: List[str], corpus_path: Optional[str] = None,
+                      corpus_out: str = "job_corpus.jsonl"):
+    """
+    Match one shared job corpus against every profile and apply for each of them
+    The first config's credentials and search settings are used for scraping, unless
+    corpus_path points at a previously saved corpus. Each profile applies with its own
+    credentials and writes job_search_results_<name>.json and job_bot_report_<name>.txt.
+    """
+    bots = [JobApplicationBot(path) for path in config_paths]
+    names = [profile_name(path) for path in config_paths]
+    matchers = [bot.profile_matcher for bot in bots]
+    scraper = bots[0]
+    scraper_logged_in = False
+
+    try:
+        if corpus_path:
+            corpus = load_jobs(corpus_path)
+            logger.info(f"Loaded {len(corpus)} jobs from {corpus_path}")
+        else:
+            corpus = scrape_corpus(scraper, matchers)
+            save_jobs(corpus, corpus_out)
+            logger.info(f"Saved {len(corpus)} jobs to {corpus_out}")
+            # The first profile applies through the sessions it scraped with
+            scraper_logged_in = True
+
+        if not corpus:
+            logger.warning("No jobs found. Exiting.")
+            return
+
+        matrix = score_matrix(corpus, matchers)
+        logger.info(f"Scored {len(corpus)} jobs against {len(bots)} profiles")
+
+        for column, (name, bot) in enumerate(zip(names, bots)):
+            logger.info(f"Profile {name}")
+            bot.all_jobs = corpus
+            bot.match_jobs([row[column] for row in matrix])
+
+            try:
+                if bot.matched_jobs and bot.config.get("job_search", {}).get("auto_apply", True):
+                    if (bot is scraper and scraper_logged_in) or any(bot.login_all_platforms().values()):
+                        bot.apply_to_jobs()
+                    else:
+                        logger.error(f"Profile {name} could not log in to any platform. Skipping applications.")
+            finally:
+                bot.close_all()
+
+            report = bot.generate_report()
+            print(report)
+            bot.save_results(f"job_search_results_{name}.json")
+            with open(f"job_bot_report_{name}.txt", 'w', encoding='utf-8') as f:
+                f.write(report)
+    finally:
+        for bot in bots:
+            bot.close_all()
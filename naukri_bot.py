@@ -3,55 +3,32 @@ Naukri.com Automation Bot
 Handles login, job search, and application on Naukri
 """
 
-import time
-import logging
 from typing import List, Dict, Optional
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+from urllib.parse import quote, urlencode, urljoin
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-from webdriver_manager.chrome import ChromeDriverManager
-from profile_matcher import ProfileMatcher, JobMatch
+from platforms import BasePlatformBot
+from form_engine import SUBMITTED, NO_FORM, button_xpath
+from http_fetcher import select_text
 
 
-class NaukriBot:
+class NaukriBot(BasePlatformBot):
     """Automation bot for Naukri.com"""
     
-    def __init__(self, credentials: Dict, profile_matcher: ProfileMatcher, config: Dict):
-        self.email = credentials.get("email")
-        self.password = credentials.get("password")
-        self.profile_matcher = profile_matcher
-        self.config = config
-        self.driver = None
-        self.logger = logging.getLogger(__name__)
-        self.base_url = "https://www.naukri.com"
-        
-    def initialize_driver(self):
-        """Initialize Selenium WebDriver"""
-        options = webdriver.ChromeOptions()
-        if self.config.get("settings", {}).get("headless", False):
-            options.add_argument("--headless")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        options.add_experimental_option('useAutomationExtension', False)
-        options.add_argument("user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
-        
-        service = Service(ChromeDriverManager().install())
-        self.driver = webdriver.Chrome(service=service, options=options)
-        self.driver.implicitly_wait(self.config.get("settings", {}).get("implicit_wait", 10))
-        self.driver.set_page_load_timeout(self.config.get("settings", {}).get("page_load_timeout", 30))
-        
+    name = "naukri"
+    base_url = "https://www.naukri.com"
+    domains = ("naukri.com",)
+    display_name = "Naukri"
+    card_selector = ".jobTuple, .list, [data-job-id], .srp-jobtuple-wrapper"
+    
     def login(self) -> bool:
         """Login to Naukri account"""
         try:
             self.logger.info("Navigating to Naukri login page...")
             self.driver.get(f"{self.base_url}/mnjuser/home")
-            time.sleep(3)
+            self.sleep(3)
             
             # Check if already logged in
             try:
@@ -63,43 +40,43 @@ class NaukriBot:
             
             # Click login button
             try:
-                login_btn = WebDriverWait(self.driver, 10).until(
-                    EC.element_to_be_clickable((By.LINK_TEXT, "Login"))
+                login_btn = self.wait_for(
+                    EC.element_to_be_clickable((By.LINK_TEXT, "Login")), timeout=10
                 )
                 login_btn.click()
-                time.sleep(2)
+                self.sleep(2)
             except TimeoutException:
                 # Try alternative login button
                 try:
                     login_btn = self.driver.find_element(By.CSS_SELECTOR, "a[title='Login']")
                     login_btn.click()
-                    time.sleep(2)
-                except:
+                    self.sleep(2)
+                except Exception:
                     pass
             
             # Enter email
-            email_input = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.ID, "usernameField"))
+            email_input = self.wait_for(
+                EC.presence_of_element_located((By.ID, "usernameField")), timeout=10
             )
             email_input.clear()
             email_input.send_keys(self.email)
-            time.sleep(1)
+            self.sleep(1)
             
             # Enter password
             password_input = self.driver.find_element(By.ID, "passwordField")
             password_input.clear()
             password_input.send_keys(self.password)
-            time.sleep(1)
+            self.sleep(1)
             
             # Click login button
             submit_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit']")
             submit_btn.click()
-            time.sleep(5)
+            self.sleep(5)
             
             # Verify login
             try:
-                WebDriverWait(self.driver, 15).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='userName'], .userName, .nI-gNb-drawer__user-name"))
+                self.wait_for(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "[data-testid='userName'], .userName, .nI-gNb-drawer__user-name")), timeout=15
                 )
                 self.logger.info("Successfully logged in to Naukri")
                 return True
@@ -109,31 +86,38 @@ class NaukriBot:
                 
         except Exception as e:
             self.logger.error(f"Error during Naukri login: {str(e)}")
+            self.last_error = e
             if self.config.get("settings", {}).get("screenshot_on_error", True):
                 self.driver.save_screenshot("naukri_login_error.png")
             return False
     
     def search_jobs(self, keywords: List[str], location: str = "") -> List[Dict]:
         """Search for jobs on Naukri"""
+        settings = self.config.get("settings", {})
+        if settings.get("fetch_mode", "browser") == "hybrid":
+            return self._search_jobs_http(keywords, location)
+        if settings.get("prefetch_pages", False):
+            return self._search_jobs_prefetch(keywords, location)
+        
         jobs = []
         try:
             self.logger.info(f"Searching jobs on Naukri with keywords: {keywords}")
             self.driver.get(f"{self.base_url}/mnjuser/home")
-            time.sleep(3)
+            self.sleep(3)
             
             # Navigate to job search
             search_url = f"{self.base_url}/jobsearch"
             self.driver.get(search_url)
-            time.sleep(3)
+            self.sleep(3)
             
             # Enter search keywords
             try:
-                search_box = WebDriverWait(self.driver, 10).until(
-                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder*='Skills'], input[placeholder*='Job'], #qsb-keyword-sugg"))
+                search_box = self.wait_for(
+                    EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder*='Skills'], input[placeholder*='Job'], #qsb-keyword-sugg")), timeout=10
                 )
                 search_box.clear()
                 search_box.send_keys(keywords[0] if keywords else "Java Developer")
-                time.sleep(2)
+                self.sleep(2)
             except TimeoutException:
                 self.logger.warning("Could not find search box, trying alternative...")
                 search_box = self.driver.find_element(By.CSS_SELECTOR, "input[type='text']")
@@ -145,45 +129,31 @@ class NaukriBot:
                     location_box = self.driver.find_element(By.CSS_SELECTOR, "input[placeholder*='Location'], #qsb-location-sugg")
                     location_box.clear()
                     location_box.send_keys(location)
-                    time.sleep(2)
-                except:
+                    self.sleep(2)
+                except Exception:
                     pass
             
             # Click search button
             try:
                 search_btn = self.driver.find_element(By.CSS_SELECTOR, "button[type='submit'], .search-btn, #qsbFormBtn")
                 search_btn.click()
-            except:
+            except Exception:
                 # Try Enter key
                 search_box.send_keys(Keys.RETURN)
             
-            time.sleep(5)
+            self.sleep(5)
             
             # Extract job listings
             max_pages = 5  # Limit pages to avoid too many requests
             max_jobs = self.config.get("job_search", {}).get("max_jobs_per_platform", 50)
             
             for page in range(max_pages):
+                self.cancel_token.check()
                 if len(jobs) >= max_jobs:
                     break
                     
                 self.logger.info(f"Scraping page {page + 1}...")
-                
-                # Find job cards
-                job_cards = self.driver.find_elements(By.CSS_SELECTOR, 
-                    ".jobTuple, .list, [data-job-id], .srp-jobtuple-wrapper")
-                
-                for card in job_cards:
-                    if len(jobs) >= max_jobs:
-                        break
-                    
-                    try:
-                        job_data = self._extract_job_data(card)
-                        if job_data:
-                            jobs.append(job_data)
-                    except Exception as e:
-                        self.logger.warning(f"Error extracting job data: {str(e)}")
-                        continue
+                jobs.extend(self._extract_current_page(max_jobs - len(jobs)))
                 
                 # Go to next page
                 if page < max_pages - 1 and len(jobs) < max_jobs:
@@ -192,10 +162,10 @@ class NaukriBot:
                             "a[title='Next'], .pagination .next, [aria-label='Next']")
                         if next_btn.is_enabled():
                             next_btn.click()
-                            time.sleep(3)
+                            self.sleep(3)
                         else:
                             break
-                    except:
+                    except Exception:
                         break
             
             self.logger.info(f"Found {len(jobs)} jobs on Naukri")
@@ -203,6 +173,7 @@ class NaukriBot:
             
         except Exception as e:
             self.logger.error(f"Error searching jobs on Naukri: {str(e)}")
+            self.last_error = e
             return jobs
     
     def _extract_job_data(self, job_card) -> Optional[Dict]:
@@ -218,28 +189,36 @@ class NaukriBot:
             try:
                 company = job_card.find_element(By.CSS_SELECTOR, 
                     ".companyName, .comp-name, .company").text.strip()
-            except:
+            except Exception:
                 company = "Not specified"
             
             # Location
             try:
                 location = job_card.find_element(By.CSS_SELECTOR, 
                     ".location, .loc, .job-location").text.strip()
-            except:
+            except Exception:
                 location = "Not specified"
             
             # Description/Experience
             try:
                 description = job_card.find_element(By.CSS_SELECTOR, 
                     ".job-desc, .job-description, .srp-jobdesc").text.strip()
-            except:
+            except Exception:
                 description = ""
             
+            # Posting age
+            try:
+                posted = job_card.find_element(By.CSS_SELECTOR, 
+                    ".job-post-day, .postedDate").text.strip()
+            except Exception:
+                posted = ""
+            
             return {
                 "title": title,
                 "company": company,
                 "location": location,
                 "description": description,
+                "posted": posted,
                 "url": job_url,
                 "platform": "Naukri"
             }
@@ -247,32 +226,75 @@ class NaukriBot:
             self.logger.warning(f"Could not extract job data: {str(e)}")
             return None
     
-    def apply_to_job(self, job_url: str) -> bool:
-        """Apply to a job on Naukri"""
+    def build_search_url(self, keyword: str, location: str = "", page: int = 0) -> str:
+        """Build the Naukri results URL for a keyword, location and zero-based page"""
+        path = "-".join(keyword.lower().split()) + "-jobs"
+        if location:
+            path += "-in-" + "-".join(location.lower().split())
+        if page > 0:
+            path += f"-{page + 1}"
+        query = {"k": keyword}
+        if location:
+            query["l"] = location
+        return f"{self.base_url}/{quote(path)}?{urlencode(query)}"
+    
+    def _extract_job_data_from_html(self, job_card) -> Optional[Dict]:
+        """Extract job data from a parsed (BeautifulSoup) job card"""
+        title_elem = job_card.select_one(".title, .jobTitle, a[title], .srp-jobtitle")
+        if title_elem is None:
+            return None
+        link = title_elem if title_elem.name == "a" else title_elem.find("a")
+        job_url = urljoin(self.base_url, link.get("href", "")) if link else ""
+        
+        return {
+            "title": title_elem.get_text(" ", strip=True),
+            "company": select_text(job_card, ".companyName, .comp-name, .company", "Not specified"),
+            "location": select_text(job_card, ".location, .loc, .job-location, .locWdth", "Not specified"),
+            "description": select_text(job_card, ".job-desc, .job-description, .srp-jobdesc"),
+            "experience": select_text(job_card, ".expwdth, .exp, .experience"),
+            "posted": select_text(job_card, ".job-post-day, .postedDate"),
+            "url": job_url,
+            "platform": "Naukri"
+        }
+    
+    def _parse_job_detail_html(self, soup) -> Dict:
+        """Extract description, requirements and experience from a job detail page"""
+        key_skills = [chip.get_text(" ", strip=True) for chip in
+                      soup.select("[class*='key-skill'] a, [class*='key-skill'] span, .key-skill a")]
+        return {
+            "description": select_text(soup, "[class*='dang-inner-html'], .job-desc, .jd-desc, section.job-desc"),
+            "requirements": ", ".join(skill for skill in key_skills if skill),
+            "experience": select_text(soup, "[class*='exp'] span, .exp, .experience")
+        }
+    
+    def apply_to_job(self, job_url: str, navigate: bool = True) -> bool:
+        """Apply to a job on Naukri; navigate=False uses the page already open in the current tab"""
         try:
             self.logger.info(f"Applying to job: {job_url}")
-            self.driver.get(job_url)
-            time.sleep(3)
+            if navigate:
+                self.driver.get(job_url)
+                self.sleep(3)
             
             # Look for apply button
             apply_selectors = [
-                "button[title='Apply'], .apply-btn, #applyButton, .applyButton",
-                "a[title='Apply'], .apply-link",
-                "button:contains('Apply'), button:contains('Easy Apply')"
+                (By.CSS_SELECTOR, "button[title='Apply'], .apply-btn, #applyButton, .applyButton"),
+                (By.CSS_SELECTOR, "a[title='Apply'], .apply-link"),
+                (By.XPATH, button_xpath(["apply"]))
             ]
             
             apply_btn = None
-            for selector in apply_selectors:
+            for by, selector in apply_selectors:
                 try:
-                    apply_btn = WebDriverWait(self.driver, 5).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
+                    apply_btn = self.wait_for(
+                        EC.element_to_be_clickable((by, selector)), timeout=5
                     )
                     break
-                except:
+                except Exception:
                     continue
             
             if not apply_btn:
                 self.logger.warning("Apply button not found")
+                self.last_error = "Apply button not found"
                 return False
             
             # Check if already applied
@@ -281,26 +303,17 @@ class NaukriBot:
                 return True
             
             apply_btn.click()
-            time.sleep(3)
             
-            # Handle any popups or additional steps
-            try:
-                # Check for confirmation or additional info needed
-                confirm_btn = self.driver.find_element(By.CSS_SELECTOR, 
-                    "button:contains('Confirm'), button:contains('Submit'), .confirm-apply")
-                confirm_btn.click()
-                time.sleep(2)
-            except:
-                pass
+            # Naukri applies on click, but some jobs open a questionnaire drawer first
+            result = self._run_application_form("[class*='chatbot_Drawer'], [class*='apply-form'], [role='dialog']")
+            if result in (SUBMITTED, NO_FORM):
+                self.logger.info("Successfully applied to job")
+                return True
             
-            self.logger.info("Successfully applied to job")
-            return True
+            self.logger.warning(f"Could not complete application ({result}) - may require manual steps")
+            return False
             
         except Exception as e:
             self.logger.error(f"Error applying to job: {str(e)}")
+            self.last_error = e
             return False
-    
-    def close(self):
-        """Close the browser"""
-        if self.driver:
-            self.driver.quit()
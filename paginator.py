@@ -0,0 +1,72 @@
+"""
+Prefetching Paginator - Pipelines result page navigation with card extraction
+Loads the next results page in a background tab while the current page is being scraped
+"""
+
+import logging
+from typing import Iterator, List
+from selenium.webdriver.support.ui import WebDriverWait
+from driver_factory import open_tab
+
+
+class PrefetchingPaginator:
+    """Iterates result pages by URL, keeping the next page loading in a second tab"""
+
+    def __init__(self, driver, urls: List[str], page_load_timeout: int = 30):
+        self.driver = driver
+        self.urls = urls
+        self.page_load_timeout = page_load_timeout
+        self.logger = logging.getLogger(__name__)
+
+    def _open_tab(self, url: str) -> str:
+        """Start loading url in a new background tab and return its window handle"""
+        return open_tab(self.driver, url)
+
+    def _wait_until_loaded(self):
+        """Wait for the focused tab to finish loading"""
+        try:
+            WebDriverWait(self.driver, self.page_load_timeout).until(
+                lambda driver: driver.execute_script("return document.readyState") == "complete"
+            )
+        except Exception as e:
+            self.logger.warning(f"Results page did not finish loading: {str(e)}")
+
+    def __iter__(self) -> Iterator[int]:
+        """
+        Yield page indexes with the driver focused on that page
+        Stopping early (break) closes any prefetched tab and returns to the original tab.
+        """
+        if not self.urls:
+            return
+
+        origin = self.driver.current_window_handle
+        current = origin
+        prefetched = None
+        self.driver.get(self.urls[0])
+
+        try:
+            for page in range(len(self.urls)):
+                if page + 1 < len(self.urls):
+                    prefetched = self._open_tab(self.urls[page + 1])
+                    self.driver.switch_to.window(current)
+
+                yield page
+
+                if prefetched is None:
+                    break
+
+                # Move on to the page that has been loading in the background
+                if current != origin:
+                    self.driver.close()
+                current, prefetched = prefetched, None
+                self.driver.switch_to.window(current)
+                self._wait_until_loaded()
+        finally:
+            for handle in (prefetched, current):
+                if handle and handle != origin:
+                    try:
+                        self.driver.switch_to.window(handle)
+                        self.driver.close()
+                    except Exception:
+                        pass
+            self.driver.switch_to.window(origin)
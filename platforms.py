@@ -0,0 +1,389 @@
+"""
+Platforms - Base interface for job platform bots and a lazy registry of platform implementations
+A platform's module (and Selenium with it) is imported only when a bot for it is created
+"""
+
+import logging
+import threading
+import importlib
+from abc import ABC, abstractmethod
+from importlib import metadata
+from typing import Dict, List, Optional, Tuple
+import psutil
+from profile_matcher import ProfileMatcher
+from cancellation import CancellationToken
+import metrics
+
+
+ENTRY_POINT_GROUP = "job_application_bot.platforms"
+
+# name -> (import path, URL domains); domains route job URLs without importing the module
+BUILTIN_PLATFORMS = {
+    "naukri": ("naukri_bot:NaukriBot", ("naukri.com",)),
+    "linkedin": ("linkedin_bot:LinkedInBot", ("linkedin.com",)),
+    "indeed": ("indeed_bot:IndeedBot", ("indeed.com",)),
+}
+
+
+class BasePlatformBot(ABC):
+    """
+    Interface every platform bot implements
+    Subclasses set name, base_url and domains, and implement login, search_jobs, apply_to_job and
+    the results page hooks search_page needs (build_search_url, _extract_job_data). The HTML hooks
+    are only needed for the HTTP search and detail modes.
+    """
+
+    name = ""
+    base_url = ""
+    domains = ()
+    # Results page hooks used by the shared search helpers
+    display_name = ""         # Platform name in logs
+    card_selector = ""        # Job cards on a results page shown in the browser
+    html_card_selector = ""   # Job cards on a results page fetched over HTTP (default: card_selector)
+    scroll_results = False    # Scroll to the bottom first, for lazily rendered cards
+    max_pages = 5             # Result pages read per search
+
+    def __init__(self, credentials: Dict, profile_matcher: ProfileMatcher, config: Dict):
+        self.email = credentials.get("email")
+        self.password = credentials.get("password")
+        self.profile_matcher = profile_matcher
+        self.config = config
+        self.driver = None
+        self.http_session = None
+        self._http_session_lock = threading.Lock()
+        self.last_error = None
+        self.form_answers = None
+        self.cancel_token = CancellationToken()
+        self.logger = logging.getLogger(self.__class__.__module__)
+
+    def sleep(self, seconds: float):
+        """Wait between page actions; raises CancelledError as soon as the run is stopped"""
+        self.cancel_token.sleep(seconds)
+
+    def initialize_driver(self):
+        """Initialize Selenium WebDriver"""
+        from driver_factory import create_driver
+        self.driver = create_driver(self.config, self.name)
+        self._time_page_loads(self.driver)
+        with _open_drivers_lock:
+            _open_drivers[id(self)] = (self.name, self.driver)
+
+    def _time_page_loads(self, driver):
+        """Record every driver.get in the page load histogram"""
+        original_get = driver.get
+
+        def timed_get(url):
+            with metrics.PAGE_LOAD_SECONDS.time(platform=self.name):
+                return original_get(url)
+
+        driver.get = timed_get
+
+    def wait_for(self, condition, timeout: float = 10):
+        """
+        WebDriverWait(self.driver, timeout).until(condition), timed in the element wait histogram
+        A TimeoutException raised here is tagged element_wait, so resilience treats it as permanent.
+        """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+        with metrics.ELEMENT_WAIT_SECONDS.time(platform=self.name):
+            try:
+                return WebDriverWait(self.driver, timeout).until(condition)
+            except TimeoutException as e:
+                e.element_wait = True
+                raise
+
+    @abstractmethod
+    def login(self) -> bool:
+        """Log in with the configured credentials; returns True on success"""
+
+    @abstractmethod
+    def search_jobs(self, keywords: List[str], location: str = "") -> List[Dict]:
+        """Search for jobs matching the first keyword in location"""
+
+    @abstractmethod
+    def apply_to_job(self, job_url: str, navigate: bool = True) -> bool:
+        """Apply to a job; navigate=False uses the page already open in the current tab"""
+
+    def _parse_job_detail_html(self, soup) -> Dict:
+        raise NotImplementedError
+
+    @abstractmethod
+    def build_search_url(self, keyword: str, location: str = "", page: int = 0) -> str:
+        """Results page URL for a keyword, location and zero-based page"""
+
+    def build_listing_url(self, keyword: str, location: str = "", page: int = 0) -> str:
+        """Results page URL fetched over HTTP; platforms with a lighter server-rendered listing override it"""
+        return self.build_search_url(keyword, location, page)
+
+    @abstractmethod
+    def _extract_job_data(self, job_card) -> Optional[Dict]:
+        """Job data from a card element in the browser"""
+
+    def _extract_job_data_from_html(self, job_card) -> Optional[Dict]:
+        """Job data from a parsed (BeautifulSoup) card"""
+        raise NotImplementedError
+
+    def _scroll_results(self):
+        if self.scroll_results:
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            self.sleep(2)
+
+    def _extract_current_page(self, limit: int) -> List[Dict]:
+        """Extract up to limit jobs from the results page shown in the browser"""
+        from selenium.webdriver.common.by import By
+        from driver_factory import page_transfer_stats
+        jobs = []
+        transfer = page_transfer_stats(self.driver)
+        if transfer:
+            self.logger.info(f"Results page transferred {transfer['bytes'] / 1024:.0f} KB "
+                             f"in {transfer['requests']} requests ({transfer['blocked']} blocked)")
+
+        for card in self.driver.find_elements(By.CSS_SELECTOR, self.card_selector):
+            self.cancel_token.check()
+            if len(jobs) >= limit:
+                break
+            try:
+                job_data = self._extract_job_data(card)
+                if job_data:
+                    jobs.append(job_data)
+            except Exception as e:
+                self.logger.warning(f"Error extracting job data: {str(e)}")
+                continue
+        return jobs
+
+    def _parse_listing_html(self, soup) -> List[Dict]:
+        """Extract job data from every card on a fetched results page"""
+        jobs = []
+        for card in soup.select(self.html_card_selector or self.card_selector):
+            job_data = self._extract_job_data_from_html(card)
+            if job_data:
+                jobs.append(job_data)
+        return jobs
+
+    def _search_jobs_prefetch(self, keywords: List[str], location: str = "") -> List[Dict]:
+        """Search by results page URL, loading the next page in a background tab"""
+        from paginator import PrefetchingPaginator
+        jobs = []
+        try:
+            keyword = keywords[0] if keywords else "Java Developer"
+            self.logger.info(f"Searching jobs on {self.display_name} for '{keyword}' with page prefetch")
+
+            max_jobs = self.config.get("job_search", {}).get("max_jobs_per_platform", 50)
+            timeout = self.config.get("settings", {}).get("page_load_timeout", 30)
+            urls = [self.build_search_url(keyword, location, page) for page in range(self.max_pages)]
+
+            for page in PrefetchingPaginator(self.driver, urls, timeout):
+                self.cancel_token.check()
+                self.logger.info(f"Scraping page {page + 1}...")
+                self._scroll_results()
+                page_jobs = self._extract_current_page(max_jobs - len(jobs))
+                if not page_jobs:
+                    break
+                jobs.extend(page_jobs)
+                if len(jobs) >= max_jobs:
+                    break
+
+            self.logger.info(f"Found {len(jobs)} jobs on {self.display_name}")
+            return jobs
+
+        except Exception as e:
+            self.logger.error(f"Error searching jobs on {self.display_name}: {str(e)}")
+            self.last_error = e
+            return jobs
+
+    def _search_jobs_http(self, keywords: List[str], location: str = "") -> List[Dict]:
+        """Search by fetching result pages directly over HTTP with the browser's cookies"""
+        from http_fetcher import fetch_listing
+        jobs = []
+        try:
+            keyword = keywords[0] if keywords else "Java Developer"
+            self.logger.info(f"Fetching {self.display_name} result pages for '{keyword}' over HTTP")
+
+            max_jobs = self.config.get("job_search", {}).get("max_jobs_per_platform", 50)
+            settings = self.config.get("settings", {})
+            urls = [self.build_listing_url(keyword, location, page) for page in range(self.max_pages)]
+            jobs = fetch_listing(self._get_http_session(), urls, self._parse_listing_html, max_jobs,
+                                 settings.get("http_workers", 4), settings.get("page_load_timeout", 30))
+
+            self.logger.info(f"Found {len(jobs)} jobs on {self.display_name}")
+            return jobs
+
+        except Exception as e:
+            self.logger.error(f"Error fetching jobs on {self.display_name}: {str(e)}")
+            self.last_error = e
+            return jobs
+
+    def search_page(self, keyword: str, location: str = "", page: int = 0) -> List[Dict]:
+        """Scrape one results page by URL (used by queue workers); errors propagate to the caller"""
+        settings = self.config.get("settings", {})
+        max_jobs = self.config.get("job_search", {}).get("max_jobs_per_platform", 50)
+        if settings.get("fetch_mode", "browser") == "hybrid":
+            from http_fetcher import fetch_html, parse_html
+            url = self.build_listing_url(keyword, location, page)
+            html = fetch_html(self._get_http_session(), url, settings.get("page_load_timeout", 30))
+            if html is None:
+                raise RuntimeError(f"Could not fetch {url}")
+            return self._parse_listing_html(parse_html(html))[:max_jobs]
+
+        self.driver.get(self.build_search_url(keyword, location, page))
+        self.sleep(3)
+        self._scroll_results()
+        return self._extract_current_page(max_jobs)
+
+    def _get_http_session(self):
+        """
+        Return the HTTP session carrying this bot's logged-in cookies
+        Detail fetches call this from the enricher's pool threads, so only one of them builds it.
+        """
+        with self._http_session_lock:
+            if self.http_session is None:
+                from http_fetcher import session_from_driver
+                pool_size = self.config.get("settings", {}).get("http_pool_size", 10)
+                self.http_session = session_from_driver(self.driver, pool_size)
+            return self.http_session
+
+    def fetch_job_details(self, job_url: str) -> Optional[Dict]:
+        """Fetch a job detail page over HTTP and extract its description fields"""
+        from http_fetcher import fetch_html, parse_html
+        timeout = self.config.get("settings", {}).get("page_load_timeout", 30)
+        html = fetch_html(self._get_http_session(), job_url, timeout)
+        if html is None:
+            return None
+        return self._parse_job_detail_html(parse_html(html))
+
+    def _run_application_form(self, container: str) -> str:
+        """Fill in and submit the application form; returns a form_engine outcome"""
+        from form_engine import AnswerStore, FormEngine
+        if self.form_answers is None:
+            self.form_answers = AnswerStore.for_config(self.config)
+        return FormEngine(self.driver, self.form_answers, self.config,
+                          cancel_token=self.cancel_token).run(container)
+
+    def close(self):
+        """Close the browser"""
+        with _open_drivers_lock:
+            _open_drivers.pop(id(self), None)
+        if self.driver:
+            self.driver.quit()
+
+
+# Drivers opened by initialize_driver and not yet closed, by bot; read when metrics are scraped
+_open_drivers = {}
+_open_drivers_lock = threading.Lock()
+
+
+def _driver_process(driver) -> Optional[int]:
+    """PID of the chromedriver behind a driver (the shared browser's for a browser context)"""
+    from driver_factory import ContextDriver
+    if isinstance(driver, ContextDriver):
+        driver = driver._browser.driver
+    try:
+        return driver.service.process.pid
+    except Exception:
+        return None
+
+
+def _active_drivers() -> List[Tuple[Dict, float]]:
+    with _open_drivers_lock:
+        drivers = list(_open_drivers.values())
+    counts = {}
+    for platform, _ in drivers:
+        counts[platform] = counts.get(platform, 0) + 1
+    return [({"platform": platform}, count) for platform, count in counts.items()]
+
+
+def _driver_memory() -> List[Tuple[Dict, float]]:
+    """RSS of each driver's process tree; a browser shared by several platforms is labelled shared"""
+    with _open_drivers_lock:
+        drivers = list(_open_drivers.values())
+    platforms_by_pid = {}
+    for platform, driver in drivers:
+        pid = _driver_process(driver)
+        if pid is not None:
+            platforms_by_pid.setdefault(pid, set()).add(platform)
+
+    samples = {}
+    for pid, platforms in platforms_by_pid.items():
+        label = platforms.pop() if len(platforms) == 1 else "shared"
+        try:
+            process = psutil.Process(pid)
+            processes = [process] + process.children(recursive=True)
+        except Exception:
+            continue
+        for process in processes:
+            try:
+                samples[label] = samples.get(label, 0) + process.memory_info().rss
+            except Exception:
+                continue
+    return [({"platform": platform}, rss) for platform, rss in samples.items()]
+
+
+metrics.ACTIVE_DRIVERS.set_function(_active_drivers)
+metrics.DRIVER_MEMORY_BYTES.set_function(_driver_memory)
+
+
+class PlatformRegistry:
+    """
+    Maps platform names to bot classes without importing them
+    Sources, later ones overriding earlier ones: the built-in platforms, installed packages
+    exposing the job_application_bot.platforms entry point group, and settings.platform_modules
+    in config.json ({"name": "module:Class"} or {"name": {"class": "module:Class", "domains": [...]}}).
+    """
+
+    def __init__(self, platform_modules: Dict = None):
+        self.logger = logging.getLogger(__name__)
+        self._specs = {name: {"target": target, "domains": domains}
+                       for name, (target, domains) in BUILTIN_PLATFORMS.items()}
+        self._classes = {}
+        self._add_entry_points()
+        for name, spec in (platform_modules or {}).items():
+            if isinstance(spec, str):
+                spec = {"class": spec}
+            self._specs[name] = {"target": spec.get("class", ""), "domains": tuple(spec.get("domains", ()))}
+
+    def _add_entry_points(self):
+        try:
+            entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+        except Exception as e:
+            self.logger.warning(f"Could not read platform entry points: {str(e)}")
+            return
+        for entry_point in entry_points:
+            self._specs[entry_point.name] = {"entry_point": entry_point, "domains": ()}
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._specs
+
+    def names(self) -> List[str]:
+        return list(self._specs)
+
+    def load(self, name: str) -> type:
+        """Import and return the bot class for a platform"""
+        if name in self._classes:
+            return self._classes[name]
+        spec = self._specs.get(name)
+        if spec is None:
+            raise KeyError(f"No bot registered for platform: {name}")
+
+        if "entry_point" in spec:
+            bot_class = spec["entry_point"].load()
+        else:
+            module_name, _, class_name = spec["target"].partition(":")
+            bot_class = getattr(importlib.import_module(module_name), class_name)
+
+        # Catch an incomplete plugin here rather than when a run first calls the missing method
+        missing = sorted(getattr(bot_class, "__abstractmethods__", ()))
+        if missing:
+            raise TypeError(f"{bot_class.__name__} for platform {name} does not implement: {', '.join(missing)}")
+
+        self._classes[name] = bot_class
+        if not spec["domains"]:
+            spec["domains"] = tuple(getattr(bot_class, "domains", ()))
+        return bot_class
+
+    def platform_for_url(self, url: str) -> Optional[str]:
+        """Platform whose domains match url, checking only platforms that are known or loaded"""
+        url_lower = url.lower()
+        for name, spec in self._specs.items():
+            if any(domain in url_lower for domain in spec["domains"]):
+                return name
+        return None
@@ -4,7 +4,7 @@ Calculates match scores based on skills, experience, and requirements
 """
 
 import re
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -21,11 +21,33 @@ class JobMatch:
     missing_skills: List[str]
     experience_match: bool
     reason: str
+    platform: str = ""
+    posted: str = ""
+
+
+SKILL_SYNONYMS = {
+    "java": ["j2ee", "j2se", "jdk", "jvm"],
+    "spring boot": ["springboot", "spring framework"],
+    "rest apis": ["restful", "rest api", "api development"],
+    "microservices": ["microservice", "micro service"],
+    "mysql": ["sql", "database"],
+    "docker": ["containerization", "containers"],
+    "devops": ["ci/cd", "continuous integration", "continuous deployment"]
+}
+
+EDUCATION_KEYWORDS = ["bachelor", "btech", "b.tech", "computer science", "engineering"]
 
 
 class ProfileMatcher:
     """Matches jobs against user profile"""
     
+    EXPERIENCE_PATTERNS = [
+        r'(\d+)\+?\s*years?',
+        r'(\d+)\s*-\s*(\d+)\s*years?',
+        r'minimum\s*(\d+)\s*years?',
+        r'at least\s*(\d+)\s*years?'
+    ]
+    
     def __init__(self, profile_config: Dict):
         self.profile = profile_config
         self.skills = [skill.lower() for skill in profile_config.get("skills", [])]
@@ -38,6 +60,10 @@ class ProfileMatcher:
         Calculate match score for a job posting
         Returns: (score, match_details)
         """
+        return self.score_prepared(PreparedJob(job_title, job_description, job_requirements, experience_required))
+    
+    def score_prepared(self, job: "PreparedJob") -> Tuple[float, Dict]:
+        """Calculate match score for a job whose text has already been normalized"""
         score = 0.0
         max_score = 100.0
         match_details = {
@@ -47,9 +73,6 @@ class ProfileMatcher:
             "keyword_matches": 0
         }
         
-        # Combine all text for analysis
-        full_text = f"{job_title} {job_description} {job_requirements}".lower()
-        
         # 1. Skill Matching (40 points)
         skill_score = 0
         matched_skills = []
@@ -57,27 +80,17 @@ class ProfileMatcher:
         
         # Check for each skill in profile
         for skill in self.skills:
-            if skill in full_text:
+            if job.contains(skill):
                 skill_score += 40 / len(self.skills)
                 matched_skills.append(skill)
             else:
                 missing_skills.append(skill)
         
         # Also check for variations and related terms
-        skill_synonyms = {
-            "java": ["j2ee", "j2se", "jdk", "jvm"],
-            "spring boot": ["springboot", "spring framework"],
-            "rest apis": ["restful", "rest api", "api development"],
-            "microservices": ["microservice", "micro service"],
-            "mysql": ["sql", "database"],
-            "docker": ["containerization", "containers"],
-            "devops": ["ci/cd", "continuous integration", "continuous deployment"]
-        }
-        
-        for skill, synonyms in skill_synonyms.items():
+        for skill, synonyms in SKILL_SYNONYMS.items():
             if skill in self.skills:
                 for synonym in synonyms:
-                    if synonym in full_text and skill not in matched_skills:
+                    if job.contains(synonym) and skill not in matched_skills:
                         skill_score += 40 / len(self.skills)
                         matched_skills.append(skill)
                         break
@@ -87,58 +100,23 @@ class ProfileMatcher:
         match_details["missing_skills"] = missing_skills[:5]  # Top 5 missing
         
         # 2. Keyword Matching (20 points)
-        keyword_matches = sum(1 for keyword in self.keywords if keyword in full_text)
+        keyword_matches = sum(1 for keyword in self.keywords if job.contains(keyword))
         keyword_score = min((keyword_matches / len(self.keywords)) * 20, 20)
         score += keyword_score
         match_details["keyword_matches"] = keyword_matches
         
         # 3. Experience Matching (20 points)
-        experience_match = True
-        exp_patterns = [
-            r'(\d+)\+?\s*years?',
-            r'(\d+)\s*-\s*(\d+)\s*years?',
-            r'minimum\s*(\d+)\s*years?',
-            r'at least\s*(\d+)\s*years?'
-        ]
-        
-        exp_text = f"{experience_required} {job_description}".lower()
-        required_exp = None
-        
-        for pattern in exp_patterns:
-            matches = re.findall(pattern, exp_text)
-            if matches:
-                if isinstance(matches[0], tuple):
-                    required_exp = int(matches[0][0])
-                else:
-                    required_exp = int(matches[0])
-                break
-        
-        if required_exp:
-            if self.experience_years >= required_exp:
-                score += 20
-            elif self.experience_years >= required_exp - 1:
-                score += 15  # Close match
-            elif self.experience_years >= required_exp - 2:
-                score += 10  # Somewhat close
-            else:
-                experience_match = False
-                score += 5  # Partial credit
-        else:
-            score += 15  # No explicit requirement, assume match
+        required_exp = job.required_experience
+        experience_points, experience_match = self._experience_points(required_exp)
+        score += experience_points
         
         match_details["experience_match"] = experience_match
         
         # 4. Role Title Matching (10 points)
-        title_lower = job_title.lower()
-        role_keywords = ["developer", "engineer", "backend", "java", "software"]
-        title_match = any(kw in title_lower for kw in role_keywords)
-        if title_match:
-            score += 10
+        score += job.title_points
         
         # 5. Education Matching (10 points)
-        education_keywords = ["bachelor", "btech", "b.tech", "computer science", "engineering"]
-        edu_match = any(kw in full_text for kw in education_keywords)
-        if edu_match:
+        if job.education_match:
             score += 10
         
         # Normalize score to 0-100
@@ -153,6 +131,58 @@ class ProfileMatcher:
             "reason": reason
         }
     
+    def calculate_upper_bound_score(self, job_title: str, experience_required: str = "") -> float:
+        """
+        Highest score a job can reach whatever its detail page adds
+        Enrichment never changes the title or a non-empty experience field, so the title and a
+        card experience requirement are scored exactly; skills, keywords and education count at
+        full weight. A job whose bound is below min_match_score can skip the detail fetch.
+        """
+        skill_bound = 40 if self.skills else 0
+        keyword_bound = 20 if self.keywords else 0
+        education_bound = 10
+        
+        # The experience field precedes the description in the scanned text, so an
+        # "N years" match inside it decides the requirement regardless of the description
+        experience_bound = 20
+        card_matches = re.findall(self.EXPERIENCE_PATTERNS[0], (experience_required or "").lower())
+        if card_matches:
+            experience_bound, _ = self._experience_points(int(card_matches[0]))
+        
+        bound = skill_bound + keyword_bound + experience_bound + self._title_points(job_title) + education_bound
+        return min(bound, 100.0)
+    
+    @classmethod
+    def _extract_required_experience(cls, exp_text: str) -> Optional[int]:
+        """Find the years of experience a job asks for, if stated"""
+        for pattern in cls.EXPERIENCE_PATTERNS:
+            matches = re.findall(pattern, exp_text)
+            if matches:
+                if isinstance(matches[0], tuple):
+                    return int(matches[0][0])
+                return int(matches[0])
+        return None
+    
+    def _experience_points(self, required_exp: Optional[int]) -> Tuple[float, bool]:
+        """Score the experience requirement; returns (points, experience_match)"""
+        if required_exp:
+            if self.experience_years >= required_exp:
+                return 20, True
+            elif self.experience_years >= required_exp - 1:
+                return 15, True  # Close match
+            elif self.experience_years >= required_exp - 2:
+                return 10, True  # Somewhat close
+            else:
+                return 5, False  # Partial credit
+        return 15, True  # No explicit requirement, assume match
+    
+    @staticmethod
+    def _title_points(job_title: str) -> float:
+        """Score the role title"""
+        title_lower = job_title.lower()
+        role_keywords = ["developer", "engineer", "backend", "java", "software"]
+        return 10 if any(kw in title_lower for kw in role_keywords) else 0
+    
     def _generate_reason(self, score: float, details: Dict, required_exp: int = None) -> str:
         """Generate human-readable reason for match score"""
         reasons = []
@@ -183,3 +213,48 @@ class ProfileMatcher:
     def is_job_eligible(self, match_score: float, min_score: float = 70) -> bool:
         """Check if job meets minimum match criteria"""
         return match_score >= min_score
+
+
+class PreparedJob:
+    """Job text normalized once so it can be scored against any number of profiles"""
+    
+    def __init__(self, job_title: str, job_description: str,
+                 job_requirements: str = "", experience_required: str = ""):
+        self.full_text = f"{job_title} {job_description} {job_requirements}".lower()
+        exp_text = f"{experience_required} {job_description}".lower()
+        # These parts of the score do not depend on the profile
+        self.required_experience = ProfileMatcher._extract_required_experience(exp_text)
+        self.title_points = ProfileMatcher._title_points(job_title)
+        self.education_match = any(kw in self.full_text for kw in EDUCATION_KEYWORDS)
+        self._terms = {}
+    
+    @classmethod
+    def from_job(cls, job: Dict) -> "PreparedJob":
+        return cls(job.get("title", ""), job.get("description", ""),
+                   job.get("requirements", ""), job.get("experience", ""))
+    
+    def contains(self, term: str) -> bool:
+        """Substring test, cached so profiles sharing a skill search the text only once"""
+        found = self._terms.get(term)
+        if found is None:
+            found = self._terms[term] = term in self.full_text
+        return found
+
+
+def score_matrix(jobs: List[Dict], matchers: List[ProfileMatcher]) -> List[List[Optional[Tuple[float, Dict]]]]:
+    """
+    Score every job against every profile in one pass
+    Returns a jobs x profiles matrix of (score, match_details); a cell is None if scoring failed.
+    Each job's text is normalized once and each distinct term is searched once per job.
+    """
+    matrix = []
+    for job in jobs:
+        prepared = PreparedJob.from_job(job)
+        row = []
+        for matcher in matchers:
+            try:
+                row.append(matcher.score_prepared(prepared))
+            except Exception:
+                row.append(None)
+        matrix.append(row)
+    return matrix
@@ -0,0 +1,211 @@
+"""
+Resilience - Error classification, retries with backoff and per-platform circuit breakers
+Stops spending time on a platform that is blocking us, logged out or has changed its pages
+"""
+
+import time
+import random
+import logging
+import threading
+from typing import Callable, Dict, Optional
+
+
+# Error classes
+TRANSIENT = "transient"   # Page-load timeouts and network hiccups: worth retrying
+BLOCKED = "blocked"       # Captcha or security checkpoint: stop until someone looks
+AUTH = "auth"             # Session expired or redirected to login
+PERMANENT = "permanent"   # Missing elements or other failures a retry will not fix
+UNSUCCESSFUL = "unsuccessful"  # A falsy result with no error, e.g. a form left stuck or needing input
+
+TRANSIENT_ERRORS = {
+    "TimeoutException", "StaleElementReferenceException", "ElementClickInterceptedException",
+    "ConnectionError", "ConnectTimeout", "ReadTimeout", "Timeout", "ChunkedEncodingError",
+    "TimeoutError", "ConnectionResetError", "ConnectionAbortedError", "BrokenPipeError"
+}
+TRANSIENT_MESSAGES = ["net::err_", "timed out", "connection reset", "temporarily unavailable", "502", "503", "429"]
+
+BLOCKED_URL_MARKERS = ["captcha", "checkpoint", "/challenge", "security-check", "/sorry/", "unusual-activity"]
+AUTH_URL_MARKERS = ["/login", "/signin", "/uas/login", "authwall", "nlogin", "account/login"]
+
+# Circuit breaker states
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+def truthy_result(result, error) -> bool:
+    """Success predicate for actions that report success with their result, e.g. applying"""
+    return bool(result)
+
+
+def no_error(result, error) -> bool:
+    """Success predicate for searches: an empty result is fine as long as nothing went wrong"""
+    return error is None
+
+
+def classify_error(error=None, url: str = "") -> Optional[str]:
+    """
+    Classify a failure from the exception (or message) a bot recorded and the page it ended on
+    Returns None when there is no evidence of a problem, e.g. a search that found nothing.
+    """
+    url_lower = (url or "").lower()
+    if any(marker in url_lower for marker in BLOCKED_URL_MARKERS):
+        return BLOCKED
+    if any(marker in url_lower for marker in AUTH_URL_MARKERS):
+        return AUTH
+    if error is None:
+        return None
+
+    message = str(error).lower()
+    if "captcha" in message or "checkpoint" in message:
+        return BLOCKED
+    if getattr(error, "element_wait", False):
+        # An element that never appeared usually means the page markup changed
+        return PERMANENT
+    if isinstance(error, BaseException):
+        if type(error).__name__ in TRANSIENT_ERRORS:
+            return TRANSIENT
+        if type(error).__name__ == "WebDriverException" or isinstance(error, (ConnectionError, TimeoutError)):
+            if any(text in message for text in TRANSIENT_MESSAGES):
+                return TRANSIENT
+    return PERMANENT
+
+
+def backoff_delay(attempt: int, base_delay: float, max_delay: float) -> float:
+    """Full-jitter exponential backoff: a random wait up to base_delay * 2^attempt"""
+    return random.uniform(0, min(max_delay, base_delay * (2 ** attempt)))
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the platform's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Opens after failure_threshold consecutive failures, or at once on a captcha or logout
+    While open, calls are refused; after recovery_timeout one probe call is let through
+    (half-open). A successful probe closes the circuit; a failed one reopens it with the
+    timeout doubled, up to max_recovery_timeout.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, recovery_timeout: float = 300,
+                 max_recovery_timeout: float = 3600):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.base_recovery_timeout = recovery_timeout
+        self.recovery_timeout = recovery_timeout
+        self.max_recovery_timeout = max_recovery_timeout
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.last_failure_kind = None
+        self.logger = logging.getLogger(__name__)
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """True if a call may go ahead now"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.time() - self.opened_at >= self.recovery_timeout:
+                self.state = HALF_OPEN
+                self.logger.info(f"{self.name}: circuit half-open, probing")
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                self.logger.info(f"{self.name}: circuit closed")
+            self.state = CLOSED
+            self.failures = 0
+            self.recovery_timeout = self.base_recovery_timeout
+
+    def record_failure(self, kind: str = PERMANENT):
+        with self._lock:
+            self.failures += 1
+            self.last_failure_kind = kind
+            if self.state == HALF_OPEN:
+                self.recovery_timeout = min(self.recovery_timeout * 2, self.max_recovery_timeout)
+                self._open()
+            elif self.state == CLOSED and self.failure_threshold and (
+                    kind in (BLOCKED, AUTH) or self.failures >= self.failure_threshold):
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.time()
+        self.logger.warning(f"{self.name}: circuit open after {self.failures} failures "
+                            f"(last: {self.last_failure_kind}); next probe in {self.recovery_timeout:.0f}s")
+
+
+class PlatformResilience:
+    """Retries and a circuit breaker around every call made to a platform bot"""
+
+    def __init__(self, settings: Dict):
+        self.breakers = {}
+        self.logger = logging.getLogger(__name__)
+        self.configure(settings)
+
+    def configure(self, settings: Dict):
+        """Apply retry and circuit settings; existing breakers keep their state"""
+        self.attempts = max(1, settings.get("retry_attempts", 3))
+        self.base_delay = settings.get("retry_base_delay_seconds", 2)
+        self.max_delay = settings.get("retry_max_delay_seconds", 30)
+        self.failure_threshold = settings.get("circuit_failure_threshold", 5)
+        self.recovery_timeout = settings.get("circuit_recovery_seconds", 300)
+        for breaker in self.breakers.values():
+            breaker.failure_threshold = self.failure_threshold
+            breaker.base_recovery_timeout = self.recovery_timeout
+
+    def breaker(self, platform: str) -> CircuitBreaker:
+        if platform not in self.breakers:
+            self.breakers[platform] = CircuitBreaker(platform, self.failure_threshold, self.recovery_timeout)
+        return self.breakers[platform]
+
+    @staticmethod
+    def _current_url(bot) -> str:
+        try:
+            return bot.driver.current_url if bot.driver is not None else ""
+        except Exception:
+            return ""
+
+    def call(self, platform: str, bot, func: Callable, *args,
+             succeeded: Callable = truthy_result, **kwargs):
+        """
+        Call func(*args, **kwargs) for platform's bot
+        A call that does not raise succeeds when succeeded(result, bot.last_error) is true (by
+        default, when the result is truthy). A failure is classified from the error and the page
+        the bot ended on, or counts as UNSUCCESSFUL when there is neither. Transient failures are
+        retried with backoff; every failure is reported to the platform's circuit breaker.
+        Raises CircuitOpenError without calling func while the circuit is open.
+        """
+        breaker = self.breaker(platform)
+        if not breaker.allow():
+            raise CircuitOpenError(f"{platform} is paused after repeated failures ({breaker.last_failure_kind})")
+
+        for attempt in range(self.attempts):
+            bot.last_error = None
+            raised = False
+            result = None
+            try:
+                result = func(*args, **kwargs)
+                error = bot.last_error
+            except Exception as e:
+                error = e
+                raised = True
+
+            if not raised and succeeded(result, error):
+                breaker.record_success()
+                return result
+            kind = classify_error(error, self._current_url(bot)) or UNSUCCESSFUL
+            if kind == TRANSIENT and attempt < self.attempts - 1:
+                delay = backoff_delay(attempt, self.base_delay, self.max_delay)
+                self.logger.info(f"{platform}: transient error ({str(error)}), retrying in {delay:.1f}s")
+                getattr(bot, "sleep", time.sleep)(delay)
+                continue
+
+            breaker.record_failure(kind)
+            if raised:
+                raise error
+            return result
@@ -4,22 +4,119 @@ Simple runner script for the Job Application Bot
 
 import sys
 import os
+import argparse
 
 # Add current directory to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from job_application_bot import JobApplicationBot
+
+def run_single(args):
+    """Run the whole bot in this process"""
+    from job_application_bot import JobApplicationBot
+    
+    bot = JobApplicationBot(args.config)
+    bot.run()
+
+
+def run_coordinator(args):
+    """Queue search/apply tasks for worker processes and write the final report"""
+    from worker import run_coordinator
+    
+    run_coordinator(args.config, args.queue, workers=args.workers,
+                    drain_timeout=args.drain_timeout, stall_timeout=args.stall_timeout)
+
+
+def run_worker(args):
+    """Process tasks from the shared queue"""
+    from worker import run_worker
+    
+    run_worker(args.config, args.queue, worker_id=args.worker_id,
+               platforms=args.platforms, idle_timeout=args.idle_timeout)
+
+
+def run_multi(args):
+    """Scrape once and match the jobs against several profiles"""
+    from multi_profile import run_multi_profile
+    
+    run_multi_profile(args.configs, corpus_path=args.corpus)
+
+
+def run_rescore(args):
+    """Score saved jobs again with the current profile and settings, without a browser"""
+    from job_application_bot import JobApplicationBot
+    from job_store import load_jobs
+    
+    bot = JobApplicationBot(args.config, init_platforms=False)
+    if args.min_score is not None:
+        bot.config.setdefault("job_search", {})["min_match_score"] = args.min_score
+    
+    bot.all_jobs = load_jobs(args.jobs, run_id=args.run_id)
+    bot.match_jobs()
+    
+    report = bot.generate_report()
+    print(report)
+    bot.save_results(args.results)
+    with open(args.report, 'w', encoding='utf-8') as f:
+        f.write(report)
+
+
+def parse_args(argv=None):
+    """Parse command line arguments"""
+    parser = argparse.ArgumentParser(description="Job Application Bot")
+    parser.add_argument("--config", default="config.json", help="Path to config.json")
+    # Also accepted after the subcommand; SUPPRESS keeps a --config given before it
+    config_option = argparse.ArgumentParser(add_help=False)
+    config_option.add_argument("--config", default=argparse.SUPPRESS, help="Path to config.json")
+    parser.set_defaults(handler=run_single)
+    subparsers = parser.add_subparsers(dest="command")
+    
+    coordinator = subparsers.add_parser("coordinator", parents=[config_option],
+                                        help="Distribute work to queue workers")
+    coordinator.add_argument("--queue", default="job_queue.db", help="Path to the shared SQLite queue")
+    coordinator.add_argument("--workers", type=int, default=0, help="Local worker processes to start")
+    coordinator.add_argument("--drain-timeout", type=float, default=4 * 3600,
+                             help="Give up on a search or apply stage after this many seconds")
+    coordinator.add_argument("--stall-timeout", type=float, default=300,
+                             help="Give up when no worker has held a task or finished one for this many seconds")
+    coordinator.set_defaults(handler=run_coordinator)
+    
+    worker = subparsers.add_parser("worker", parents=[config_option], help="Process tasks from the shared queue")
+    worker.add_argument("--queue", default="job_queue.db", help="Path to the shared SQLite queue")
+    worker.add_argument("--worker-id", default=None, help="Unique worker name (default: host-pid)")
+    worker.add_argument("--platforms", nargs="*", default=None, help="Only serve these platforms")
+    worker.add_argument("--idle-timeout", type=float, default=60, help="Exit after this many idle seconds")
+    worker.set_defaults(handler=run_worker)
+    
+    multi = subparsers.add_parser("multi", help="Share one scrape between several profiles")
+    multi.add_argument("--configs", nargs="+", required=True,
+                       help="One config.json per candidate; the first one is used for scraping")
+    multi.add_argument("--corpus", default=None, help="Score a saved job_corpus.jsonl instead of scraping")
+    multi.set_defaults(handler=run_multi)
+    
+    rescore = subparsers.add_parser("rescore", parents=[config_option],
+                                    help="Match saved jobs again without scraping")
+    rescore.add_argument("--jobs", default="job_corpus.jsonl",
+                         help="Saved jobs: .jsonl corpus, .json results or the worker .db queue")
+    rescore.add_argument("--run-id", default=None, help="Only jobs from this worker run (SQLite only)")
+    rescore.add_argument("--min-score", type=float, default=None, help="Override min_match_score")
+    rescore.add_argument("--results", default="rescore_results.json", help="Where to write the JSON results")
+    rescore.add_argument("--report", default="rescore_report.txt", help="Where to write the text report")
+    rescore.set_defaults(handler=run_rescore)
+    
+    return parser.parse_args(argv)
+
 
 def main():
     """Main entry point"""
+    args = parse_args()
+    
     print("="*60)
     print("JOB APPLICATION BOT")
     print("="*60)
     print("\nStarting bot...\n")
     
     try:
-        bot = JobApplicationBot("config.json")
-        bot.run()
+        args.handler(args)
     except FileNotFoundError as e:
         print(f"\n❌ Error: {e}")
         print("\nPlease create config.json from config.json.example")
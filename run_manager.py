@@ -0,0 +1,324 @@
+"""
+Run Manager - Queues bot runs from the web server and executes them on a bounded worker pool
+Every run has its own ID, cancellation token, status, logs and results
+"""
+
+import logging
+import threading
+import itertools
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+from job_application_bot import JobApplicationBot
+from cancellation import CancellationToken, CancelledError
+from multi_profile import profile_name
+from web_state import BotStatus, EventBroker, LogStore, ResultsStore
+
+
+# Run states
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+FAILED = "failed"
+STOPPED = "stopped"
+FINISHED_STATES = (COMPLETED, FAILED, STOPPED)
+
+INITIAL_STATUS = {
+    "running": False,
+    "paused": False,
+    "current_step": "",
+    "progress": 0,
+    "message": "Ready to start",
+    "results": None,
+    "error": None
+}
+
+
+class Run:
+    """One bot run: its config, cancellation token, status, logs and results"""
+
+    def __init__(self, run_id: str, config_path: str, platforms: List[str], events: EventBroker,
+                 log_handler: logging.Handler = None):
+        self.id = run_id
+        self.config_path = config_path
+        self.platforms = platforms or []
+        self.events = events
+        self.log_handler = log_handler
+        self.thread_name = f"run-{run_id}"
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.cancel_token = CancellationToken()
+        self.logs = LogStore()
+        self.results = ResultsStore()
+        self.bot = None
+        self.future = None
+        self._done = threading.Event()
+        self.status = BotStatus(
+            dict(INITIAL_STATUS, run_id=run_id, state=QUEUED, message="Waiting for a free worker..."),
+            on_change=lambda snapshot: events.publish("status", snapshot)
+        )
+
+    @property
+    def state(self) -> str:
+        return self.status.get("state")
+
+    @property
+    def finished(self) -> bool:
+        return self.state in FINISHED_STATES
+
+    def update(self, **changes):
+        self.status.update(**changes)
+
+    def summary(self) -> Dict:
+        """Status without the results blob, plus what the run was started with"""
+        summary = self.status.snapshot()
+        summary.pop("results", None)
+        summary.update(config=self.config_path, platforms=self.platforms, created_at=self.created_at)
+        return summary
+
+    def publish(self, event: str, data: Dict):
+        """
+        Bot listener: forward job updates to dashboards, tagged with this run
+        Batches go out as counts only; dashboards fetch the jobs themselves from the results store.
+        """
+        data = {key: value for key, value in data.items() if key != "jobs"}
+        self.events.publish(event, dict(data, run_id=self.id))
+
+    def execute(self):
+        """Worker pool entry point; the thread carries the run's name while it works on it"""
+        thread = threading.current_thread()
+        pool_name, thread.name = thread.name, self.thread_name
+        try:
+            self._execute()
+        finally:
+            thread.name = pool_name
+            self._done.set()
+
+    def _execute(self):
+        try:
+            self.status.start(
+                state=RUNNING,
+                current_step="Initializing...",
+                progress=5,
+                message="Starting job application bot..."
+            )
+
+            # Initialize bot and forward its job updates to dashboards
+            self.bot = JobApplicationBot(self.config_path, cancel_token=self.cancel_token,
+                                         platforms=self.platforms)
+            self.bot.add_listener(self.publish)
+            self.bot.add_listener(self.results.handle_event)
+            self.logs.resize(self.bot.config.get("settings", {}).get("web_log_capacity", 1000))
+            if self.log_handler:
+                # Added after the bot has set up logging, which basicConfig skips once root has a handler
+                logging.getLogger().addHandler(self.log_handler)
+
+            # Step 1: Login
+            self.update(
+                current_step="Logging in to platforms...",
+                progress=15,
+                message="Authenticating with job platforms..."
+            )
+            login_results = self.bot.login_all_platforms()
+
+            if not any(login_results.values()):
+                self.update(state=FAILED, error="Failed to login to any platform")
+                return
+
+            # Step 2: Search jobs
+            self.update(
+                current_step="Searching for jobs...",
+                progress=30,
+                message="Searching jobs across all platforms..."
+            )
+            self.bot.search_all_platforms()
+
+            if not self.bot.all_jobs:
+                self.update(state=FAILED, error="No jobs found")
+                return
+
+            # Step 3: Enrich and match jobs
+            self.update(
+                current_step="Fetching job details...",
+                progress=40,
+                message=f"Found {len(self.bot.all_jobs)} jobs. Fetching missing job details..."
+            )
+            self.bot.enrich_jobs()
+
+            self.update(
+                current_step="Matching jobs with profile...",
+                progress=50,
+                message=f"Found {len(self.bot.all_jobs)} jobs. Matching with your profile..."
+            )
+            self.bot.match_jobs()
+
+            if not self.bot.matched_jobs:
+                self.update(state=FAILED, error="No jobs matched your profile")
+                return
+
+            # Step 4: Apply to jobs
+            self.update(
+                current_step="Applying to jobs...",
+                progress=70,
+                message=f"Found {len(self.bot.matched_jobs)} matching jobs. Starting applications..."
+            )
+            self.bot.apply_to_jobs()
+
+            # Step 5: Generate results
+            self.update(
+                current_step="Generating report...",
+                progress=90,
+                message="Finalizing results..."
+            )
+
+            # Save results; runs of other configs get their own file, like multi-profile runs
+            if profile_name(self.config_path) == "config":
+                self.bot.save_results()
+            else:
+                self.bot.save_results(f"job_search_results_{profile_name(self.config_path)}.json")
+
+            # Prepare results summary; the full lists are served by the results store
+            self.results.report = self.bot.generate_report()
+            results = {
+                "total_jobs_found": len(self.bot.all_jobs),
+                "matched_jobs_count": len(self.bot.matched_jobs),
+                "applied_jobs_count": len(self.bot.applied_jobs),
+                "failed_applications_count": len(self.bot.failed_applications),
+                "top_matched_jobs": [
+                    {
+                        "title": job.title,
+                        "company": job.company,
+                        "location": job.location,
+                        "score": round(job.match_score, 1),
+                        "url": job.url
+                    }
+                    for job in self.bot.matched_jobs[:20]
+                ]
+            }
+
+            self.update(
+                state=COMPLETED,
+                results=results,
+                current_step="Complete",
+                progress=100,
+                message=f"Successfully applied to {len(self.bot.applied_jobs)} jobs!"
+            )
+
+        except CancelledError:
+            self.update(state=STOPPED, current_step="Stopped", message="Stopped by user")
+            logging.info("Bot stopped by user")
+        except Exception as e:
+            self.update(
+                state=FAILED,
+                error=str(e),
+                message=f"Error: {str(e)}"
+            )
+            logging.error(f"Bot error: {str(e)}", exc_info=True)
+        finally:
+            # Close the browsers whether the run finished, failed or was stopped
+            if self.bot:
+                self.bot.close_all()
+            self.update(running=False, paused=False)
+
+    def stop(self, timeout: float = 1) -> bool:
+        """Cancel the run (or take it off the queue); returns True once it has finished"""
+        self.cancel_token.cancel()
+        if self.future is not None and self.future.cancel():
+            self.update(state=STOPPED, message="Removed from the queue")
+            self._done.set()
+            return True
+
+        self.update(paused=False, message="Stopping...")
+        if self._done.wait(timeout):
+            return True
+
+        # Still inside a page load or element wait: closing the browsers makes it fail fast
+        if self.bot:
+            for bot in self.bot.bots.values():
+                try:
+                    bot.close()
+                except:
+                    pass
+        return self._done.wait(5)
+
+    def pause(self):
+        self.cancel_token.pause()
+        self.update(paused=True, message="Paused")
+
+    def resume(self):
+        self.cancel_token.resume()
+        self.update(paused=False, message="Resumed")
+
+
+class RunLogHandler(logging.Handler):
+    """Stores each log record with the run whose thread logged it and pushes it to dashboards"""
+
+    def __init__(self, manager: "RunManager"):
+        super().__init__(logging.INFO)
+        self.manager = manager
+
+    def emit(self, record):
+        run = self.manager.run_for_thread(record.threadName)
+        if run is None:
+            return
+        log_entry = {
+            "timestamp": datetime.fromtimestamp(record.created).strftime("%H:%M:%S"),
+            "level": record.levelname,
+            "message": record.getMessage()
+        }
+        log_entry = run.logs.append(log_entry, record.levelno)
+        self.manager.events.publish("log", dict(log_entry, run_id=run.id))
+
+
+class RunManager:
+    """
+    Runs bots on a pool of max_concurrent worker threads; further runs wait in a queue
+    The latest history finished runs are kept so their status, logs and results can still be read.
+    """
+
+    def __init__(self, events: EventBroker, max_concurrent: int = 2, history: int = 20):
+        self.events = events
+        self.history = history
+        self.runs = OrderedDict()
+        self._by_thread = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max(1, max_concurrent), thread_name_prefix="run-worker")
+        self.log_handler = RunLogHandler(self)
+        self.logger = logging.getLogger(__name__)
+
+    def submit(self, config_path: str = "config.json", platforms: List[str] = None) -> Run:
+        """Queue a run; it starts as soon as a worker is free"""
+        with self._lock:
+            run = Run(str(next(self._ids)), config_path, platforms, self.events, self.log_handler)
+            self.runs[run.id] = run
+            self._by_thread[run.thread_name] = run
+            self._prune()
+        run.status.update()  # Announce the queued run
+        run.future = self._pool.submit(run.execute)
+        self.logger.info(f"Queued run {run.id} ({config_path})")
+        return run
+
+    def _prune(self):
+        finished = [run for run in self.runs.values() if run.finished]
+        for run in finished[:max(0, len(finished) - self.history)]:
+            del self.runs[run.id]
+            self._by_thread.pop(run.thread_name, None)
+
+    def get(self, run_id: str) -> Optional[Run]:
+        with self._lock:
+            return self.runs.get(run_id)
+
+    def latest(self) -> Optional[Run]:
+        with self._lock:
+            return next(reversed(self.runs.values()), None)
+
+    def list(self) -> List[Dict]:
+        with self._lock:
+            runs = list(self.runs.values())
+        return [run.summary() for run in runs]
+
+    def run_for_thread(self, thread_name: str) -> Optional[Run]:
+        """The run a thread is working for; pool threads a run starts are named <run thread>_<n>"""
+        with self._lock:
+            return self._by_thread.get(thread_name.partition("_")[0])
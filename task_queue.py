@@ -0,0 +1,249 @@
+"""
+Task Queue - Durable SQLite work queue shared by the coordinator and worker processes
+Workers claim tasks with time-limited leases and keep them alive with heartbeats
+"""
+
+import json
+import time
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    dedupe_key TEXT UNIQUE,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    lease_owner TEXT,
+    lease_expires REAL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_claim ON tasks (status, platform, kind, id);
+CREATE TABLE IF NOT EXISTS jobs (
+    run_id TEXT NOT NULL DEFAULT '',
+    url TEXT NOT NULL,
+    platform TEXT,
+    data TEXT NOT NULL,
+    scraped_at REAL NOT NULL,
+    PRIMARY KEY (run_id, url)
+);
+"""
+
+
+class TaskQueue:
+    """
+    SQLite-backed task queue with leases
+    Uses the rollback journal rather than WAL so the database file can live on a
+    filesystem shared between machines (WAL needs shared memory on a single host).
+    """
+
+    def __init__(self, path: str = "job_queue.db", lease_seconds: int = 300):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        with self._connection() as conn:
+            conn.executescript(SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=DELETE")
+        return conn
+
+    @contextmanager
+    def _connection(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _task(row: sqlite3.Row) -> Dict:
+        task = dict(row)
+        task["payload"] = json.loads(task["payload"])
+        if task.get("result"):
+            task["result"] = json.loads(task["result"])
+        return task
+
+    def enqueue(self, kind: str, platform: str, payload: Dict, dedupe_key: str = None,
+                max_attempts: int = 3) -> Optional[int]:
+        """Add a task; returns its id, or None if a task with dedupe_key already exists"""
+        now = time.time()
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO tasks (kind, platform, payload, dedupe_key, max_attempts, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, platform, json.dumps(payload), dedupe_key, max_attempts, now, now)
+            )
+            return cursor.lastrowid if cursor.rowcount else None
+
+    def claim(self, worker_id: str, platforms: Iterable[str], kinds: Iterable[str] = None) -> Optional[Dict]:
+        """Lease the oldest available task for one of the given platforms"""
+        platforms = list(platforms)
+        if not platforms:
+            return None
+        kinds = list(kinds or ["search", "apply"])
+        now = time.time()
+
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            self._reap_expired(conn, now)
+            row = conn.execute(
+                f"SELECT * FROM tasks WHERE "
+                f"(status = 'pending' OR (status = 'leased' AND lease_expires < ?)) "
+                f"AND platform IN ({','.join('?' * len(platforms))}) "
+                f"AND kind IN ({','.join('?' * len(kinds))}) "
+                f"ORDER BY id LIMIT 1",
+                [now] + platforms + kinds
+            ).fetchone()
+            if row is None:
+                conn.execute("COMMIT")
+                return None
+            conn.execute(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, "
+                "attempts = attempts + 1, updated_at = ? WHERE id = ?",
+                (worker_id, now + self.lease_seconds, now, row["id"])
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            try:
+                conn.execute("ROLLBACK")
+            except sqlite3.Error:
+                pass  # Keep the original error; closing the connection discards the transaction
+            raise
+        finally:
+            conn.close()
+
+        task = self._task(row)
+        task["attempts"] += 1
+        return task
+
+    @staticmethod
+    def _reap_expired(conn: sqlite3.Connection, now: float):
+        """Fail tasks whose lease expired after their last allowed attempt"""
+        conn.execute(
+            "UPDATE tasks SET status = 'failed', error = 'lease expired', lease_owner = NULL, updated_at = ? "
+            "WHERE status = 'leased' AND lease_expires < ? AND attempts >= max_attempts",
+            (now, now)
+        )
+
+    def reap_expired(self):
+        """Fail abandoned tasks that have no attempts left"""
+        with self._connection() as conn:
+            self._reap_expired(conn, time.time())
+
+    def abandon(self, kind: str, error: str) -> int:
+        """Fail every pending or leased task of kind, e.g. when no worker is left to run them"""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'failed', error = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE kind = ? AND status IN ('pending', 'leased')",
+                (error, time.time(), kind)
+            )
+            return cursor.rowcount
+
+    def heartbeat(self, task_id: int, worker_id: str) -> bool:
+        """Extend a lease; returns False if the worker no longer owns the task"""
+        now = time.time()
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET lease_expires = ?, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (now + self.lease_seconds, now, task_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, task_id: int, worker_id: str, result: Dict = None) -> bool:
+        """Mark a leased task as done"""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = 'done', result = ?, lease_owner = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (json.dumps(result or {}), time.time(), task_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, task_id: int, worker_id: str, error: str) -> bool:
+        """Release a failed task for retry, or mark it failed once attempts run out"""
+        with self._connection() as conn:
+            cursor = conn.execute(
+                "UPDATE tasks SET status = CASE WHEN attempts >= max_attempts THEN 'failed' ELSE 'pending' END, "
+                "error = ?, lease_owner = NULL, lease_expires = NULL, updated_at = ? "
+                "WHERE id = ? AND lease_owner = ? AND status = 'leased'",
+                (error, time.time(), task_id, worker_id)
+            )
+            return cursor.rowcount == 1
+
+    def counts(self, kind: str = None) -> Dict[str, int]:
+        """Number of tasks per status"""
+        query = "SELECT status, COUNT(*) AS n FROM tasks"
+        params = []
+        if kind:
+            query += " WHERE kind = ?"
+            params.append(kind)
+        with self._connection() as conn:
+            rows = conn.execute(query + " GROUP BY status", params).fetchall()
+        return {row["status"]: row["n"] for row in rows}
+
+    def live_leases(self, kind: str = None) -> int:
+        """Number of tasks held by a worker whose lease has not expired"""
+        query = "SELECT COUNT(*) AS n FROM tasks WHERE status = 'leased' AND lease_expires >= ?"
+        params = [time.time()]
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        with self._connection() as conn:
+            return conn.execute(query, params).fetchone()["n"]
+
+    def is_drained(self, kind: str = None) -> bool:
+        """True when no tasks of kind are pending or leased"""
+        counts = self.counts(kind)
+        return not counts.get("pending") and not counts.get("leased")
+
+    def tasks(self, kind: str = None, status: str = None) -> List[Dict]:
+        """List tasks, optionally filtered by kind and status"""
+        query = "SELECT * FROM tasks WHERE 1 = 1"
+        params = []
+        if kind:
+            query += " AND kind = ?"
+            params.append(kind)
+        if status:
+            query += " AND status = ?"
+            params.append(status)
+        with self._connection() as conn:
+            return [self._task(row) for row in conn.execute(query + " ORDER BY id", params)]
+
+    def add_jobs(self, jobs: List[Dict], run_id: str = "") -> int:
+        """Store scraped jobs in the shared corpus (deduplicated by URL within a run)"""
+        now = time.time()
+        rows = [
+            (run_id, job["url"], job.get("platform", ""), json.dumps(job, ensure_ascii=False), now)
+            for job in jobs if job.get("url")
+        ]
+        with self._connection() as conn:
+            conn.execute("BEGIN")
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs (run_id, url, platform, data, scraped_at) VALUES (?, ?, ?, ?, ?)", rows
+            )
+            conn.execute("COMMIT")
+        return len(rows)
+
+    def load_jobs(self, run_id: str = None) -> List[Dict]:
+        """Read the scraped corpus, optionally for one run only"""
+        query = "SELECT data FROM jobs"
+        params = []
+        if run_id is not None:
+            query += " WHERE run_id = ?"
+            params.append(run_id)
+        with self._connection() as conn:
+            return [json.loads(row["data"]) for row in conn.execute(query + " ORDER BY scraped_at", params)]
@@ -0,0 +1,34 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+PROFILE = {
+    "name": "Test User",
+    "experience_years": 2,
+    "skills": ["Java", "Spring Boot", "SQL", "Docker"],
+    "job_search": {"keywords": ["Java", "Backend"]}
+}
+
+
+@pytest.fixture
+def config_path(tmp_path, monkeypatch):
+    """Write a minimal config in a scratch directory (the bot logs to the working directory)"""
+    monkeypatch.chdir(tmp_path)
+
+    def write(**job_search):
+        config = {
+            "credentials": {},
+            "profile": PROFILE,
+            "job_search": {"keywords": ["Java"], "locations": ["Remote"], **job_search},
+            "settings": {}
+        }
+        path = tmp_path / "config.json"
+        path.write_text(json.dumps(config))
+        return str(path)
+
+    return write
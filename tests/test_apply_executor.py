@@ -0,0 +1,59 @@
+from apply_executor import TabApplyExecutor
+
+
+class SwitchTo:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        assert handle in self.driver.window_handles
+        self.driver.current_window_handle = handle
+
+
+class TabDriver:
+    """Tracks open tabs and the URL each one was opened for"""
+
+    def __init__(self):
+        self.window_handles = ["main"]
+        self.current_window_handle = "main"
+        self.urls = {}
+        self.switch_to = SwitchTo(self)
+
+    def execute_script(self, script, url):
+        handle = f"tab{len(self.urls)}"
+        self.window_handles.append(handle)
+        self.urls[handle] = url
+
+    def close(self):
+        self.window_handles.remove(self.current_window_handle)
+
+
+class ApplyBot:
+    def __init__(self):
+        self.driver = TabDriver()
+        self.applied = []
+
+    def apply_to_job(self, url, navigate=True):
+        self.applied.append((url, navigate))
+        return True
+
+
+def open_urls(driver):
+    return sorted(driver.urls[handle] for handle in driver.window_handles if handle != "main")
+
+
+def test_tabs_for_jobs_no_longer_upcoming_are_closed():
+    bot = ApplyBot()
+    executor = TabApplyExecutor(bot, pool_size=3)
+
+    assert executor.apply("a", ["b", "c"])
+    assert open_urls(bot.driver) == ["b", "c"]
+
+    # c dropped out of the schedule; its tab makes room for d
+    assert executor.apply("b", ["d", "e"])
+    assert bot.applied == [("a", True), ("b", False)]
+    assert open_urls(bot.driver) == ["d", "e"]
+    assert bot.driver.current_window_handle == "main"
+
+    executor.close()
+    assert bot.driver.window_handles == ["main"]
@@ -0,0 +1,22 @@
+from apply_scheduler import ApplyHistory, ApplyScheduler
+from profile_matcher import JobMatch
+
+
+def job(title, platform, score):
+    return JobMatch(title=title, company="", location="", description="", url=f"https://example.com/{title}",
+                    match_score=score, matched_skills=[], missing_skills=[], experience_match=True,
+                    reason="", platform=platform)
+
+
+def test_success_lifts_the_platforms_queued_jobs(tmp_path):
+    history = ApplyHistory(str(tmp_path / "history.json"))
+    scheduler = ApplyScheduler([job("a1", "A", 90), job("b1", "B", 82), job("a2", "A", 80)], history)
+
+    first = scheduler.next()
+    assert first.title == "a1"
+    assert scheduler.upcoming("B", 1)[0].title == "b1"
+
+    # A's success rate rises from 1/2 to 2/3, which outweighs b1's higher match score
+    scheduler.record(first, True)
+    assert [scheduler.next().title, scheduler.next().title] == ["a2", "b1"]
+    assert scheduler.next() is None
@@ -0,0 +1,56 @@
+import pytest
+
+from cancellation import CancellationToken, CancelledError
+from naukri_bot import NaukriBot
+from profile_matcher import ProfileMatcher
+
+
+class InstantToken(CancellationToken):
+    """Cancellation token whose sleeps only check for cancellation"""
+
+    def sleep(self, seconds):
+        self.check()
+
+
+class Element:
+    def __init__(self, on_click=None):
+        self.on_click = on_click
+
+    def clear(self):
+        pass
+
+    def send_keys(self, *keys):
+        pass
+
+    def is_enabled(self):
+        return True
+
+    def click(self):
+        if self.on_click:
+            self.on_click()
+
+
+class ResultsDriver:
+    """Results pages without cards whose Next button stops the run when clicked"""
+
+    def __init__(self, on_next):
+        self.on_next = on_next
+
+    def get(self, url):
+        pass
+
+    def find_element(self, by, selector):
+        return Element(self.on_next if "Next" in selector else None)
+
+    def find_elements(self, by, selector):
+        return []
+
+
+def test_cancel_during_a_page_sleep_stops_the_search():
+    bot = NaukriBot({"email": "a", "password": "b"}, ProfileMatcher({}), {})
+    bot.cancel_token = InstantToken()
+    bot.driver = ResultsDriver(on_next=bot.cancel_token.cancel)
+
+    # The sleep after clicking Next raises inside a try block; it must not end the loop quietly
+    with pytest.raises(CancelledError):
+        bot.search_jobs(["Java"])
@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+import config_service
+from config_service import ConfigError, ConfigService
+
+
+def test_undecodable_file_keeps_raising_config_error(tmp_path):
+    path = tmp_path / "config.json"
+    path.write_bytes(b'{"profile": {"name": "\xff"}}')
+    service = ConfigService(str(path))
+
+    for _ in range(2):
+        with pytest.raises(ConfigError, match="invalid JSON"):
+            service.get()
+
+
+def test_unreadable_file_is_read_again_on_the_next_call(tmp_path, monkeypatch):
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"job_search": {"keywords": ["Java"]}}))
+    service = ConfigService(str(path))
+
+    def denied(*args, **kwargs):
+        raise PermissionError(13, "Permission denied", str(path))
+
+    monkeypatch.setattr(config_service, "open", denied, raising=False)
+    with pytest.raises(ConfigError, match="cannot read the file"):
+        service.get()
+
+    # Permissions changes do not touch the modification time, so the stamp must not be kept
+    monkeypatch.delattr(config_service, "open")
+    assert service.get()["job_search"]["keywords"] == ["Java"]
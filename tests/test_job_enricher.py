@@ -0,0 +1,39 @@
+from job_application_bot import JobApplicationBot
+
+
+class DetailBot:
+    driver = object()
+
+    def __init__(self):
+        self.fetched = []
+
+    def fetch_job_details(self, url):
+        self.fetched.append(url)
+        return {"description": "Full description " * 20}
+
+
+def test_enrich_jobs_skips_jobs_that_cannot_reach_min_score(config_path):
+    bot = JobApplicationBot(config_path(enrich_details=True, min_match_score=80), init_platforms=False)
+    details = bot.bots["naukri"] = DetailBot()
+    bot.all_jobs = [
+        {"title": "Java Developer", "platform": "Naukri", "url": "https://example.com/1", "description": ""},
+        {"title": "Sales Manager", "platform": "Naukri", "url": "https://example.com/2",
+         "description": "", "experience": "8 years"}
+    ]
+
+    assert bot.enrich_jobs() == 1
+    assert details.fetched == ["https://example.com/1"]
+    assert bot.all_jobs[1]["description"] == ""
+
+
+def test_enrich_jobs_fetches_only_thin_descriptions(config_path):
+    bot = JobApplicationBot(config_path(enrich_details=True), init_platforms=False)
+    details = bot.bots["naukri"] = DetailBot()
+    bot.all_jobs = [
+        {"title": "Java Developer", "platform": "Naukri", "url": "https://example.com/1", "description": ""},
+        {"title": "Java Developer", "platform": "Naukri", "url": "https://example.com/2",
+         "description": "Complete card description " * 10}
+    ]
+
+    assert bot.enrich_jobs() == 1
+    assert details.fetched == ["https://example.com/1"]
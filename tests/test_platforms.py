@@ -0,0 +1,52 @@
+import sys
+import types
+
+import pytest
+
+from platforms import BasePlatformBot, PlatformRegistry
+
+
+class PartialBot(BasePlatformBot):
+    name = "partial"
+
+    def login(self):
+        return True
+
+    def search_jobs(self, keywords, location=""):
+        return []
+
+
+class CompleteBot(PartialBot):
+    name = "complete"
+    domains = ("complete.test",)
+
+    def apply_to_job(self, job_url, navigate=True):
+        return True
+
+    def build_search_url(self, keyword, location="", page=0):
+        return f"https://complete.test/jobs?q={keyword}&page={page}"
+
+    def _extract_job_data(self, job_card):
+        return None
+
+
+@pytest.fixture
+def plugin_module(monkeypatch):
+    module = types.ModuleType("plugin_bots")
+    module.PartialBot = PartialBot
+    module.CompleteBot = CompleteBot
+    monkeypatch.setitem(sys.modules, "plugin_bots", module)
+
+
+def test_incomplete_plugin_fails_when_loaded(plugin_module):
+    registry = PlatformRegistry({"partial": "plugin_bots:PartialBot"})
+
+    with pytest.raises(TypeError, match="apply_to_job, build_search_url"):
+        registry.load("partial")
+
+
+def test_complete_plugin_loads_with_its_domains(plugin_module):
+    registry = PlatformRegistry({"complete": "plugin_bots:CompleteBot"})
+
+    assert registry.load("complete") is CompleteBot
+    assert registry.platform_for_url("https://complete.test/job/1") == "complete"
@@ -0,0 +1,28 @@
+from conftest import PROFILE
+from profile_matcher import ProfileMatcher
+
+
+DESCRIPTIONS = [
+    "",
+    "Java backend role using Spring Boot, SQL and Docker. B.Tech in computer science preferred.",
+    "Requires 1 years of Java and microservices experience. Bachelor degree.",
+    "Looking for 10+ years of sales experience"
+]
+
+
+def test_upper_bound_is_never_below_the_final_score():
+    matcher = ProfileMatcher(PROFILE)
+    for title in ("Java Developer", "Sales Manager"):
+        for experience in ("", "1 years", "8 years", "0-1 yrs"):
+            bound = matcher.calculate_upper_bound_score(title, experience)
+            for description in DESCRIPTIONS:
+                for requirements in ("", "SQL, Docker, engineering degree"):
+                    score, _ = matcher.calculate_match_score(title, description, requirements, experience)
+                    assert score <= bound, (title, experience, description, requirements)
+
+
+def test_upper_bound_uses_title_and_card_experience():
+    matcher = ProfileMatcher(PROFILE)
+    assert matcher.calculate_upper_bound_score("Java Developer", "") == 100
+    # No role keyword in the title and a requirement far beyond the profile's 2 years
+    assert matcher.calculate_upper_bound_score("Sales Manager", "8 years") == 75
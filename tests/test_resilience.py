@@ -0,0 +1,32 @@
+from resilience import CLOSED, OPEN, PlatformResilience, no_error
+
+
+class SearchBot:
+    last_error = None
+
+    def __init__(self):
+        self.driver = None
+
+    def search_jobs(self, keywords, location=""):
+        return []
+
+    def apply_to_job(self, url):
+        return False
+
+
+def test_repeated_empty_searches_leave_the_breaker_closed():
+    resilience = PlatformResilience({"circuit_failure_threshold": 2, "retry_attempts": 1})
+    bot = SearchBot()
+
+    for _ in range(5):
+        assert resilience.call("naukri", bot, bot.search_jobs, ["Java"], "", succeeded=no_error) == []
+    assert resilience.breaker("naukri").state == CLOSED
+
+
+def test_failed_applications_still_open_the_breaker():
+    resilience = PlatformResilience({"circuit_failure_threshold": 2, "retry_attempts": 1})
+    bot = SearchBot()
+
+    for _ in range(2):
+        assert resilience.call("naukri", bot, bot.apply_to_job, "https://example.com/1") is False
+    assert resilience.breaker("naukri").state == OPEN
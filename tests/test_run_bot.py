@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+from job_store import save_jobs
+
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RESCORE = """
+import sys
+import run_bot
+args = run_bot.parse_args(sys.argv[1:])
+args.handler(args)
+loaded = [name for name in ("selenium", "webdriver_manager") if name in sys.modules]
+assert not loaded, loaded
+"""
+
+
+def test_rescore_runs_without_importing_selenium(config_path, tmp_path):
+    config = config_path(min_match_score=0)
+    jobs = tmp_path / "jobs.jsonl"
+    save_jobs([{"title": "Java Developer", "company": "Acme", "platform": "Naukri",
+                "url": "https://example.com/1", "description": "Java and Spring Boot"}], str(jobs))
+
+    # A fresh interpreter, so modules imported by other tests do not count
+    result = subprocess.run(
+        [sys.executable, "-c", RESCORE, "rescore", "--config", config, "--jobs", str(jobs),
+         "--results", str(tmp_path / "results.json"), "--report", str(tmp_path / "report.txt")],
+        cwd=tmp_path, env={**os.environ, "PYTHONPATH": REPO}, capture_output=True, text=True
+    )
+    assert result.returncode == 0, result.stderr
+    assert (tmp_path / "results.json").exists()
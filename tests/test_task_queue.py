@@ -0,0 +1,44 @@
+import sqlite3
+
+import pytest
+
+from task_queue import TaskQueue
+from worker import enqueue_search_tasks
+
+
+class LockedConnection:
+    """Connection whose BEGIN fails, so no transaction is open when claim() rolls back"""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, sql, *args):
+        if sql == "BEGIN IMMEDIATE":
+            raise sqlite3.OperationalError("database is locked")
+        return self.conn.execute(sql, *args)
+
+    def close(self):
+        self.conn.close()
+
+
+def test_claim_reraises_the_original_error_when_rollback_fails(tmp_path, monkeypatch):
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    connect = queue._connect
+    monkeypatch.setattr(queue, "_connect", lambda: LockedConnection(connect()))
+
+    with pytest.raises(sqlite3.OperationalError, match="database is locked"):
+        queue.claim("worker-1", ["naukri"])
+
+
+def test_search_tasks_cover_only_the_first_keyword(tmp_path):
+    queue = TaskQueue(str(tmp_path / "queue.db"))
+    config = {"job_search": {"keywords": ["Java", "Python"], "locations": ["Pune"]}}
+
+    assert enqueue_search_tasks(queue, config, ["naukri"], "run-1") == 10
+    keywords = set()
+    while True:
+        task = queue.claim("worker-1", ["naukri"])
+        if task is None:
+            break
+        keywords.add(task["payload"]["keyword"])
+    assert keywords == {"Java"}
@@ -0,0 +1,16 @@
+from web_state import EventBroker
+
+
+def test_events_published_before_the_stream_starts_are_delivered():
+    broker = EventBroker()
+    subscriber = broker.subscribe()
+    # Published after subscribing but while the initial snapshot was being taken
+    broker.publish("status", {"state": "running"})
+
+    stream = broker.stream(subscriber, initial={"status": {"state": "idle"}})
+    assert next(stream).startswith("event: status\ndata: {\"state\": \"idle\"}")
+    assert next(stream).startswith("id: 1\nevent: status\ndata: {\"state\": \"running\"}")
+
+    stream.close()
+    broker.publish("status", {"state": "done"})
+    assert subscriber.empty()
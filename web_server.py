@@ -4,144 +4,38 @@ Provides web interface to control and monitor the bot
 """
 
 import os
-import json
-import threading
 import logging
-from datetime import datetime
 from flask import Flask, render_template, jsonify, request, Response, stream_with_context
 from flask_cors import CORS
-from job_application_bot import JobApplicationBot
+from run_manager import INITIAL_STATUS, RunManager
+from web_state import BotStatus, EventBroker
+from metrics import REGISTRY
+from config_service import ConfigError, load_config
 
 app = Flask(__name__)
 CORS(app)
 
-# Global bot instance and status
-bot_instance = None
-bot_status = {
-    "running": False,
-    "current_step": "",
-    "progress": 0,
-    "message": "Ready to start",
-    "results": None,
-    "error": None
-}
-
-# Custom logging handler to capture bot logs
-class WebLogHandler(logging.Handler):
-    def __init__(self):
-        super().__init__()
-        self.logs = []
-    
-    def emit(self, record):
-        log_entry = {
-            "timestamp": datetime.now().strftime("%H:%M:%S"),
-            "level": record.levelname,
-            "message": record.getMessage()
-        }
-        self.logs.append(log_entry)
-        # Keep only last 100 logs
-        if len(self.logs) > 100:
-            self.logs.pop(0)
-
-web_log_handler = WebLogHandler()
-web_log_handler.setLevel(logging.INFO)
-
-
-def run_bot_thread():
-    """Run bot in a separate thread"""
-    global bot_instance, bot_status
-    
+
+def _server_settings() -> dict:
+    """settings from config.json, for options the server needs before any run starts"""
     try:
-        bot_status["running"] = True
-        bot_status["error"] = None
-        bot_status["current_step"] = "Initializing..."
-        bot_status["progress"] = 5
-        bot_status["message"] = "Starting job application bot..."
-        
-        # Initialize bot
-        bot_instance = JobApplicationBot("config.json")
-        
-        # Add web log handler
-        logger = logging.getLogger()
-        logger.addHandler(web_log_handler)
-        
-        # Step 1: Login
-        bot_status["current_step"] = "Logging in to platforms..."
-        bot_status["progress"] = 15
-        bot_status["message"] = "Authenticating with job platforms..."
-        login_results = bot_instance.login_all_platforms()
-        
-        if not any(login_results.values()):
-            bot_status["error"] = "Failed to login to any platform"
-            bot_status["running"] = False
-            return
-        
-        # Step 2: Search jobs
-        bot_status["current_step"] = "Searching for jobs..."
-        bot_status["progress"] = 30
-        bot_status["message"] = "Searching jobs across all platforms..."
-        bot_instance.search_all_platforms()
-        
-        if not bot_instance.all_jobs:
-            bot_status["error"] = "No jobs found"
-            bot_status["running"] = False
-            return
-        
-        # Step 3: Match jobs
-        bot_status["current_step"] = "Matching jobs with profile..."
-        bot_status["progress"] = 50
-        bot_status["message"] = f"Found {len(bot_instance.all_jobs)} jobs. Matching with your profile..."
-        bot_instance.match_jobs()
-        
-        if not bot_instance.matched_jobs:
-            bot_status["error"] = "No jobs matched your profile"
-            bot_status["running"] = False
-            return
-        
-        # Step 4: Apply to jobs
-        bot_status["current_step"] = "Applying to jobs..."
-        bot_status["progress"] = 70
-        bot_status["message"] = f"Found {len(bot_instance.matched_jobs)} matching jobs. Starting applications..."
-        apply_results = bot_instance.apply_to_jobs()
-        
-        # Step 5: Generate results
-        bot_status["current_step"] = "Generating report..."
-        bot_status["progress"] = 90
-        bot_status["message"] = "Finalizing results..."
-        
-        # Save results
-        bot_instance.save_results()
-        
-        # Prepare results summary
-        bot_status["results"] = {
-            "total_jobs_found": len(bot_instance.all_jobs),
-            "matched_jobs_count": len(bot_instance.matched_jobs),
-            "applied_jobs_count": len(bot_instance.applied_jobs),
-            "failed_applications_count": len(bot_instance.failed_applications),
-            "top_matched_jobs": [
-                {
-                    "title": job.title,
-                    "company": job.company,
-                    "location": job.location,
-                    "score": round(job.match_score, 1),
-                    "url": job.url
-                }
-                for job in bot_instance.matched_jobs[:20]
-            ],
-            "applied_jobs": bot_instance.applied_jobs[:50],
-            "report": bot_instance.generate_report()
-        }
-        
-        bot_status["current_step"] = "Complete"
-        bot_status["progress"] = 100
-        bot_status["message"] = f"Successfully applied to {len(bot_instance.applied_jobs)} jobs!"
-        
-    except Exception as e:
-        bot_status["error"] = str(e)
-        bot_status["message"] = f"Error: {str(e)}"
-        logging.error(f"Bot error: {str(e)}", exc_info=True)
-    finally:
-        bot_status["running"] = False
+        return load_config("config.json").get("settings", {})
+    except (OSError, ValueError):
+        return {}
+
+
+# Pushes status changes, log lines and job updates to connected dashboards
+events = EventBroker()
+
+# Queued and running bots; each run has its own status, logs and results
+run_manager = RunManager(
+    events,
+    max_concurrent=_server_settings().get("web_max_concurrent_runs", 2),
+    history=_server_settings().get("web_run_history", 20)
+)
+
+# Status reported before the first run
+idle_status = BotStatus(INITIAL_STATUS)
 
 
 @app.route('/')
@@ -150,86 +44,239 @@ def index():
     return render_template('index.html')
 
 
+def _get_run(run_id: str = None):
+    """The run with run_id, or the latest run without one"""
+    return run_manager.get(run_id) if run_id else run_manager.latest()
+
+
+def _config_path(name: str) -> str:
+    """A valid config file in the server's directory; raises ValueError (or ConfigError) for anything else"""
+    name = name or "config.json"
+    if os.path.basename(name) != name or not name.endswith(".json"):
+        raise ValueError(f"Config must be a .json file in the server directory: {name}")
+    if not os.path.exists(name):
+        raise ValueError(f"{name} not found. Please create it from config.json.example")
+    load_config(name)  # Fail before queueing rather than minutes into the run
+    return name
+
+
 @app.route('/api/status', methods=['GET'])
-def get_status():
-    """Get current bot status"""
-    return jsonify(bot_status)
+@app.route('/api/runs/<run_id>', methods=['GET'])
+def get_status(run_id: str = None):
+    """
+    Get the status of a run (the latest one for /api/status)
+    With ?after=<version> the request waits (up to ?timeout= seconds, default 25, max 60) until
+    the status is newer than that version, then returns it.
+    """
+    run = _get_run(run_id)
+    if run is None and run_id:
+        return jsonify({"error": f"No run {run_id}"}), 404
+    status = run.status if run else idle_status
+    
+    after = request.args.get('after', type=int)
+    if after is None:
+        return jsonify(status.snapshot())
+    timeout = min(max(request.args.get('timeout', 25, type=float), 0), 60)
+    return jsonify(status.wait_for_change(after, timeout))
 
 
 @app.route('/api/start', methods=['POST'])
 def start_bot():
-    """Start the job application bot"""
-    global bot_status
-    
-    if bot_status["running"]:
+    """Start the job application bot with config.json"""
+    latest = run_manager.latest()
+    if latest and not latest.finished:
         return jsonify({"error": "Bot is already running"}), 400
+    try:
+        config_path = _config_path("config.json")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    # Check if config.json exists
-    if not os.path.exists("config.json"):
-        return jsonify({
-            "error": "config.json not found. Please create it from config.json.example"
-        }), 400
-    
-    # Reset status
-    bot_status = {
-        "running": False,
-        "current_step": "",
-        "progress": 0,
-        "message": "Starting...",
-        "results": None,
-        "error": None
-    }
-    web_log_handler.logs.clear()
-    
-    # Start bot in separate thread
-    thread = threading.Thread(target=run_bot_thread, daemon=True)
-    thread.start()
+    run = run_manager.submit(config_path)
+    return jsonify({"message": "Bot started successfully", "status": "running", "run_id": run.id})
+
+
+@app.route('/api/runs', methods=['GET'])
+def list_runs():
+    """List queued, running and recent runs, oldest first"""
+    return jsonify({"runs": run_manager.list()})
+
+
+@app.route('/api/runs', methods=['POST'])
+def create_run():
+    """
+    Queue a run; body: {"config": "config.json", "platforms": ["linkedin"]}
+    It starts as soon as one of the web_max_concurrent_runs workers is free.
+    """
+    body = request.get_json(silent=True) or {}
+    platforms = body.get("platforms") or []
+    if isinstance(platforms, str):
+        platforms = [platform.strip() for platform in platforms.split(",") if platform.strip()]
+    try:
+        config_path = _config_path(body.get("config"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
-    return jsonify({"message": "Bot started successfully", "status": "running"})
+    run = run_manager.submit(config_path, platforms)
+    return jsonify(run.summary()), 202
 
 
 @app.route('/api/stop', methods=['POST'])
-def stop_bot():
-    """Stop the bot (if possible)"""
-    global bot_status, bot_instance
-    
-    if not bot_status["running"]:
+@app.route('/api/runs/<run_id>/stop', methods=['POST'])
+def stop_bot(run_id: str = None):
+    """Stop a run (or take it off the queue); it stops at its next check, at least every second"""
+    run = _get_run(run_id)
+    if run is None or run.finished:
         return jsonify({"error": "Bot is not running"}), 400
     
-    # Try to close browsers
-    if bot_instance:
-        try:
-            for bot in bot_instance.bots.values():
-                bot.close()
-        except:
-            pass
+    if not run.stop():
+        return jsonify({"message": "Bot is stopping", "run_id": run.id})
+    return jsonify({"message": "Bot stopped", "run_id": run.id})
+
+
+@app.route('/api/pause', methods=['POST'])
+@app.route('/api/runs/<run_id>/pause', methods=['POST'])
+def pause_bot(run_id: str = None):
+    """Pause a run at its next check (between pages, job cards and applications)"""
+    run = _get_run(run_id)
+    if run is None or not run.status.get("running"):
+        return jsonify({"error": "Bot is not running"}), 400
     
-    bot_status["running"] = False
-    bot_status["message"] = "Stopped by user"
+    run.pause()
+    return jsonify({"message": "Bot paused", "run_id": run.id})
+
+
+@app.route('/api/resume', methods=['POST'])
+@app.route('/api/runs/<run_id>/resume', methods=['POST'])
+def resume_bot(run_id: str = None):
+    """Resume a paused run"""
+    run = _get_run(run_id)
+    if run is None or not run.status.get("paused"):
+        return jsonify({"error": "Bot is not paused"}), 400
     
-    return jsonify({"message": "Bot stopped"})
+    run.resume()
+    return jsonify({"message": "Bot resumed", "run_id": run.id})
+
+
+@app.route('/api/events', methods=['GET'])
+def stream_events():
+    """Server-Sent Events stream of every run's status changes, log lines and job updates"""
+    # Events published while the snapshot is taken are queued, not lost (at worst sent twice)
+    subscriber = events.subscribe()
+    latest = run_manager.latest()
+    initial = {
+        "runs": {"runs": run_manager.list()},
+        "status": latest.status.snapshot() if latest else idle_status.snapshot()
+    }
+    response = Response(
+        stream_with_context(events.stream(subscriber, initial=initial)),
+        mimetype='text/event-stream'
+    )
+    # The stream's own cleanup does not run if the client leaves before the first message
+    response.call_on_close(lambda: events.unsubscribe(subscriber))
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @app.route('/api/logs', methods=['GET'])
-def get_logs():
-    """Get bot logs"""
-    return jsonify({"logs": web_log_handler.logs})
+@app.route('/api/runs/<run_id>/logs', methods=['GET'])
+def get_logs(run_id: str = None):
+    """
+    Get a run's logs (the latest run's for /api/logs)
+    ?since=<seq> returns only newer entries, ?level=WARNING only entries at that level or above,
+    ?limit=<n> at most n entries. Pass the returned last_seq as the next since.
+    """
+    run = _get_run(run_id)
+    if run is None:
+        if run_id:
+            return jsonify({"error": f"No run {run_id}"}), 404
+        return jsonify({"logs": [], "last_seq": 0, "truncated": False})
+    
+    since = request.args.get('since', 0, type=int)
+    limit = request.args.get('limit', type=int)
+    level_name = request.args.get('level', 'NOTSET').upper()
+    min_level = logging.getLevelName(level_name)
+    if not isinstance(min_level, int):
+        return jsonify({"error": f"Unknown log level: {level_name}"}), 400
+    
+    logs, last_seq, truncated = run.logs.since(since, min_level, limit)
+    return jsonify({"logs": logs, "last_seq": last_seq, "truncated": truncated, "run_id": run.id})
 
 
 @app.route('/api/results', methods=['GET'])
-def get_results():
-    """Get bot results"""
-    if bot_status["results"]:
-        return jsonify(bot_status["results"])
-    return jsonify({"error": "No results available"}), 404
+@app.route('/api/runs/<run_id>/results', methods=['GET'])
+def get_results(run_id: str = None):
+    """
+    Get one page of a run's scored jobs (the latest run's for /api/results)
+    Filters: platform, company (substring), status (unmatched/matched/applied/failed), min_score, max_score.
+    sort=score|company|title|platform with order=asc|desc, limit (max 500), and cursor set to the
+    previous page's next_cursor. Unchanged pages are answered with 304 Not Modified.
+    """
+    run = _get_run(run_id)
+    if run is None:
+        return jsonify({"error": "No results available"}), 404
+    
+    args = request.args
+    try:
+        page = run.results.query(
+            sort=args.get('sort', 'score'),
+            descending=args.get('order', 'desc') != 'asc',
+            cursor=args.get('cursor'),
+            limit=min(max(args.get('limit', 50, type=int), 1), 500),
+            platform=args.get('platform'),
+            company=args.get('company'),
+            status=args.get('status'),
+            min_score=args.get('min_score', type=float),
+            max_score=args.get('max_score', type=float)
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    
+    response = jsonify(page)
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@app.route('/api/jobs', methods=['GET'])
+@app.route('/api/runs/<run_id>/jobs', methods=['GET'])
+def get_job_changes(run_id: str = None):
+    """
+    Get a run's jobs added or changed since a version: scraped, scored, matched, applied and failed
+    Start with since=0 and pass back each response's cursor as since; keep asking while more is
+    true. limit caps the batch (max 5000). The dashboard's job table is kept up to date this way.
+    """
+    run = _get_run(run_id)
+    if run is None:
+        return jsonify({"error": "No results available"}), 404
+    
+    since = max(request.args.get('since', 0, type=int), 0)
+    limit = min(max(request.args.get('limit', 1000, type=int), 1), 5000)
+    response = jsonify(dict(run.results.changes(since, limit), run_id=run.id))
+    response.add_etag()
+    return response.make_conditional(request)
+
+
+@app.route('/api/results/report', methods=['GET'])
+@app.route('/api/runs/<run_id>/report', methods=['GET'])
+def get_report(run_id: str = None):
+    """Get the text report of a completed run"""
+    run = _get_run(run_id)
+    if run is None or not run.results.report:
+        return jsonify({"error": "No results available"}), 404
+    return Response(run.results.report, mimetype='text/plain')
+
+
+@app.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Throughput counters, stage latencies and browser gauges for Prometheus"""
+    return Response(REGISTRY.render(), mimetype='text/plain; version=0.0.4')
 
 
 @app.route('/api/config', methods=['GET'])
 def get_config():
     """Get current configuration (without credentials)"""
     try:
-        with open("config.json", 'r', encoding='utf-8') as f:
-            config = json.load(f)
+        config = load_config("config.json")
         
         # Remove sensitive data
         safe_config = config.copy()
@@ -242,6 +289,8 @@ def get_config():
         return jsonify(safe_config)
     except FileNotFoundError:
         return jsonify({"error": "config.json not found"}), 404
+    except ConfigError as e:
+        return jsonify({"error": str(e), "problems": e.problems}), 400
 
 
 if __name__ == '__main__':
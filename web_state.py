@@ -0,0 +1,398 @@
+"""
+Web State - State shared between the bot thread and the web server's request threads
+Events published here are pushed to dashboards over Server-Sent Events
+"""
+
+import json
+import queue
+import base64
+import sqlite3
+import logging
+import threading
+import itertools
+from collections import deque
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class BotStatus:
+    """
+    The bot's status, changed only under a lock and numbered with a version that every change bumps
+    Readers get consistent copies from snapshot(), and wait_for_change() lets a request block until
+    the status moves past a version it has already seen.
+    """
+
+    def __init__(self, initial: Dict, on_change: Optional[Callable[[Dict], None]] = None):
+        self._initial = dict(initial)
+        self._values = dict(initial)
+        self._version = 0
+        self._changed = threading.Condition()
+        self.on_change = on_change
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, key: str, default=None):
+        with self._changed:
+            return self._values.get(key, default)
+
+    def snapshot(self) -> Dict:
+        """A copy of the current values, including their version"""
+        with self._changed:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict:
+        snapshot = dict(self._values)
+        snapshot["version"] = self._version
+        return snapshot
+
+    def _commit(self) -> Dict:
+        self._version += 1
+        snapshot = self._snapshot()
+        if self.on_change:
+            self.on_change(snapshot)
+        self._changed.notify_all()
+        return snapshot
+
+    def update(self, **changes) -> Dict:
+        """Apply changes atomically; returns the new snapshot"""
+        with self._changed:
+            self._values.update(changes)
+            return self._commit()
+
+    def start(self, **values) -> bool:
+        """Reset to the initial values plus values and mark running, unless a run is already going"""
+        with self._changed:
+            if self._values.get("running"):
+                return False
+            self._values = dict(self._initial, **values)
+            self._values["running"] = True
+            self._commit()
+            return True
+
+    def wait_for_change(self, after: int, timeout: float) -> Dict:
+        """Snapshot once the version is past after, or the current one when timeout runs out"""
+        with self._changed:
+            self._changed.wait_for(lambda: self._version > after, timeout)
+            return self._snapshot()
+
+
+class EventBroker:
+    """Fans events out to every connected subscriber; slow subscribers drop their oldest events"""
+
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self._subscribers = set()
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def subscribe(self) -> queue.Queue:
+        subscriber = queue.Queue(maxsize=self.max_queue)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        return subscriber
+
+    def unsubscribe(self, subscriber: queue.Queue):
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event: str, data: Dict):
+        """Queue an event for every subscriber"""
+        message = (next(self._ids), event, data)
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for subscriber in subscribers:
+            while True:
+                try:
+                    subscriber.put_nowait(message)
+                    break
+                except queue.Full:
+                    try:
+                        subscriber.get_nowait()
+                    except queue.Empty:
+                        pass
+
+    @staticmethod
+    def format(event_id: Optional[int], event: str, data: Dict) -> str:
+        """One Server-Sent Events message"""
+        lines = [f"event: {event}", f"data: {json.dumps(data, ensure_ascii=False)}", "", ""]
+        if event_id is not None:
+            lines.insert(0, f"id: {event_id}")
+        return "\n".join(lines)
+
+    def stream(self, subscriber: queue.Queue, initial: Dict[str, Dict] = None,
+               heartbeat: float = 15) -> Iterator[str]:
+        """
+        Yield SSE messages for one client until it disconnects, then unsubscribe it
+        Subscribe before taking the snapshot in initial (event names to data sent first, e.g.
+        the current status), so no event published in between is lost. A comment line is
+        sent every heartbeat seconds so proxies keep the connection open.
+        """
+        try:
+            for event, data in (initial or {}).items():
+                yield self.format(None, event, data)
+            while True:
+                try:
+                    event_id, event, data = subscriber.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield self.format(event_id, event, data)
+        finally:
+            self.unsubscribe(subscriber)
+
+
+class LogStore:
+    """
+    Fixed-capacity, thread-safe buffer of log entries
+    Every entry gets a sequence number that keeps increasing across clear() and resize(), so a
+    client can ask for the entries after the last one it has seen.
+    """
+
+    def __init__(self, capacity: int = 1000):
+        self._entries = deque(maxlen=max(1, capacity))
+        self._lock = threading.Lock()
+        self._last_seq = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._entries.maxlen
+
+    @property
+    def last_seq(self) -> int:
+        return self._last_seq
+
+    def append(self, entry: Dict, levelno: int = logging.INFO) -> Dict:
+        """Number and store entry; the oldest entry is dropped once the buffer is full"""
+        with self._lock:
+            self._last_seq += 1
+            entry["seq"] = self._last_seq
+            self._entries.append((levelno, entry))
+        return entry
+
+    def since(self, seq: int = 0, min_level: int = logging.NOTSET,
+              limit: Optional[int] = None) -> Tuple[List[Dict], int, bool]:
+        """
+        Entries numbered after seq at min_level or above, oldest first (at most limit of them)
+        Also returns the cursor to pass as seq next time, and whether entries after seq had
+        already been dropped from the buffer.
+        """
+        with self._lock:
+            entries = list(self._entries)
+            cursor = self._last_seq
+        if not entries:
+            return [], cursor, False
+        truncated = entries[0][1]["seq"] > seq + 1
+
+        # Sequence numbers are contiguous, so the first wanted entry's position is known
+        start = max(0, seq + 1 - entries[0][1]["seq"])
+        selected = [entry for levelno, entry in entries[start:] if levelno >= min_level]
+        if limit is not None and len(selected) >= limit:
+            selected = selected[:limit]
+            cursor = selected[-1]["seq"] if selected else seq
+        return selected, cursor, truncated
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def resize(self, capacity: int):
+        """Change capacity, keeping the newest entries"""
+        with self._lock:
+            self._entries = deque(self._entries, maxlen=max(1, capacity))
+
+
+RESULT_SORTS = {"score": "score", "company": "company_key", "title": "title_key", "platform": "platform"}
+RESULT_STATUSES = ("unmatched", "matched", "applied", "failed")
+# A scraped job has no score yet; unmatched ones scored below min_match_score
+JOB_STATUSES = ("scraped",) + RESULT_STATUSES
+JOB_FIELDS = ("id", "title", "company", "location", "platform", "score", "url", "status", "reason")
+
+
+class ResultsStore:
+    """
+    A run's jobs and their application status in an indexed in-memory SQLite table
+    Filled from the bot's jobs_scraped, jobs_scored, job_matched, job_applied and application_failed
+    events while it runs. Scored jobs are read a page at a time with keyset (cursor) pagination;
+    every change also gives the row the next version, so changes() can hand a client just the rows
+    changed since it last asked.
+    """
+
+    def __init__(self):
+        self._conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+        self.version = 0
+        self.report = ""
+        self._conn.executescript("""
+            CREATE TABLE results (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE,
+                title TEXT, title_key TEXT,
+                company TEXT, company_key TEXT,
+                location TEXT,
+                platform TEXT,
+                score REAL,
+                status TEXT,
+                reason TEXT,
+                version INTEGER
+            );
+            CREATE INDEX results_version ON results (version);
+            CREATE INDEX results_score ON results (score, id);
+            CREATE INDEX results_platform ON results (platform, score, id);
+            CREATE INDEX results_status ON results (status, score, id);
+            CREATE INDEX results_company ON results (company_key, id);
+            CREATE INDEX results_title ON results (title_key, id);
+        """)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM results")
+            self.report = ""
+            self.version += 1
+
+    def _upsert(self, job: Dict, score: Optional[float], status: str, update: Optional[str] = None):
+        """Insert a job (keyed by URL); an existing row is left alone, or changed by the update SET clause"""
+        self.version += 1
+        on_conflict = f"DO UPDATE SET {update}, version = excluded.version" if update else "DO NOTHING"
+        self._conn.execute(
+            f"""INSERT INTO results (url, title, title_key, company, company_key, location, platform, score, status, version)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (url) {on_conflict}""",
+            (job.get("url") or job.get("title", ""), job.get("title", ""), job.get("title", "").lower(),
+             job.get("company", ""), job.get("company", "").lower(), job.get("location", ""),
+             job.get("platform", ""), score, status, self.version)
+        )
+
+    def add_scraped(self, jobs: List[Dict]):
+        """Insert newly scraped jobs; jobs already in the table (found again by another search) are kept"""
+        with self._lock:
+            for job in jobs:
+                if job.get("url"):
+                    self._upsert(job, None, "scraped")
+
+    def set_scores(self, scores: List[Dict]):
+        """Record {"url", "score", "matched"} for scored jobs; jobs already applied to keep their status"""
+        with self._lock:
+            for score in scores:
+                self.version += 1
+                self._conn.execute(
+                    """UPDATE results SET score = ?, version = ?,
+                           status = CASE WHEN status IN ('scraped', 'unmatched', 'matched') THEN ? ELSE status END
+                       WHERE url = ?""",
+                    (score["score"], self.version, "matched" if score.get("matched") else "unmatched", score["url"])
+                )
+
+    def add_match(self, job: Dict):
+        """Insert or refresh a matched job (keyed by URL)"""
+        with self._lock:
+            self._upsert(job, job.get("score", 0), "matched", update=
+                         """title = excluded.title, title_key = excluded.title_key,
+                            company = excluded.company, company_key = excluded.company_key,
+                            location = excluded.location, platform = excluded.platform, score = excluded.score,
+                            status = CASE WHEN status IN ('scraped', 'unmatched') THEN 'matched' ELSE status END""")
+
+    def set_status(self, url: str, status: str, reason: str = ""):
+        with self._lock:
+            self.version += 1
+            self._conn.execute("UPDATE results SET status = ?, reason = ?, version = ? WHERE url = ?",
+                               (status, reason, self.version, url))
+
+    def handle_event(self, event: str, data: Dict):
+        """Bot listener: keep the table in step with the run"""
+        if event == "jobs_scraped":
+            self.add_scraped(data.get("jobs", []))
+        elif event == "jobs_scored":
+            self.set_scores(data.get("jobs", []))
+        elif event == "job_matched":
+            self.add_match(data)
+        elif event == "job_applied" and data.get("url"):
+            self.set_status(data["url"], "applied")
+        elif event == "application_failed" and data.get("url"):
+            self.set_status(data["url"], "failed", data.get("reason", ""))
+
+    @staticmethod
+    def _encode_cursor(sort_value, row_id: int) -> str:
+        return base64.urlsafe_b64encode(json.dumps([sort_value, row_id]).encode()).decode()
+
+    @staticmethod
+    def _decode_cursor(cursor: str) -> Tuple:
+        try:
+            sort_value, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return sort_value, int(row_id)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Invalid cursor: {str(e)}")
+
+    def query(self, sort: str = "score", descending: bool = True, cursor: Optional[str] = None,
+              limit: int = 50, platform: Optional[str] = None, company: Optional[str] = None,
+              status: Optional[str] = None, min_score: Optional[float] = None,
+              max_score: Optional[float] = None) -> Dict:
+        """
+        One page of results plus the total matching the filters
+        company matches a substring, case-insensitively. Pass next_cursor back as cursor for the
+        following page; it is None on the last page. Raises ValueError on a bad sort, status or cursor.
+        """
+        if sort not in RESULT_SORTS:
+            raise ValueError(f"Unknown sort: {sort} (use one of {', '.join(RESULT_SORTS)})")
+        if status is not None and status not in RESULT_STATUSES:
+            raise ValueError(f"Unknown status: {status} (use one of {', '.join(RESULT_STATUSES)})")
+        column = RESULT_SORTS[sort]
+
+        # Jobs that have not been scored yet are only listed by changes()
+        conditions, params = ["score IS NOT NULL"], []
+        if platform:
+            conditions.append("platform = ?")
+            params.append(platform)
+        if status:
+            conditions.append("status = ?")
+            params.append(status)
+        if company:
+            conditions.append("company_key LIKE ? ESCAPE '\\'")
+            escaped = company.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        if min_score is not None:
+            conditions.append("score >= ?")
+            params.append(min_score)
+        if max_score is not None:
+            conditions.append("score <= ?")
+            params.append(max_score)
+        filters = " AND ".join(conditions)
+
+        page_conditions, page_params = list(conditions), list(params)
+        if cursor:
+            page_conditions.append(f"({column}, id) {'<' if descending else '>'} (?, ?)")
+            page_params.extend(self._decode_cursor(cursor))
+        direction = "DESC" if descending else "ASC"
+        page_query = (f"SELECT * FROM results WHERE {' AND '.join(page_conditions)} "
+                      f"ORDER BY {column} {direction}, id {direction} LIMIT ?")
+
+        with self._lock:
+            rows = self._conn.execute(page_query, page_params + [limit + 1]).fetchall()
+            total = self._conn.execute(f"SELECT COUNT(*) FROM results WHERE {filters}", params).fetchone()[0]
+            version = self.version
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = self._encode_cursor(rows[-1][column], rows[-1]["id"])
+        jobs = [{key: row[key] for key in JOB_FIELDS} for row in rows]
+        return {"jobs": jobs, "total": total, "next_cursor": next_cursor, "version": version}
+
+    def changes(self, since: int = 0, limit: int = 1000) -> Dict:
+        """
+        Jobs added or changed after version since, oldest change first (at most limit of them)
+        Pass cursor back as since for the next batch; more is True while further changes are waiting.
+        Each job carries its id, so a client can merge a batch into the rows it already has.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT * FROM results WHERE version > ? ORDER BY version LIMIT ?", (since, limit + 1)
+            ).fetchall()
+            total = self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+            version = self.version
+
+        more = len(rows) > limit
+        rows = rows[:limit]
+        cursor = rows[-1]["version"] if more else version
+        jobs = [{key: row[key] for key in JOB_FIELDS} for row in rows]
+        return {"jobs": jobs, "cursor": cursor, "more": more, "total": total}
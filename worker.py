@@ -0,0 +1,228 @@
+"""
+Queue Workers - Coordinator and worker processes sharing a durable task queue
+The coordinator enqueues search and apply tasks; each worker owns its own platform browsers
+"""
+
+import os
+import sys
+import time
+import socket
+import logging
+import threading
+import subprocess
+from datetime import datetime
+from typing import Dict, List, Optional
+from job_application_bot import JobApplicationBot
+from task_queue import TaskQueue
+
+
+logger = logging.getLogger(__name__)
+
+
+class _Heartbeat:
+    """Keeps a task's lease alive while it is being processed"""
+
+    def __init__(self, queue: TaskQueue, task_id: int, worker_id: str):
+        self.queue = queue
+        self.task_id = task_id
+        self.worker_id = worker_id
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self):
+        interval = max(1, self.queue.lease_seconds / 3)
+        while not self._stop.wait(interval):
+            if not self.queue.heartbeat(self.task_id, self.worker_id):
+                logger.warning(f"Lost lease on task {self.task_id}")
+                return
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def enqueue_search_tasks(queue: TaskQueue, config: Dict, platforms: List[str], run_id: str) -> int:
+    """
+    Queue one search task per platform, location and results page
+    Like a local run, only the first keyword is searched (the platform bots search one keyword).
+    """
+    job_search = config.get("job_search", {})
+    keyword = (job_search.get("keywords", []) or ["Java Developer"])[0]
+    locations = job_search.get("locations", [])[:3] + [""]
+    max_pages = 5  # Same page limit as the platform bots
+
+    count = 0
+    for platform in platforms:
+        for location in locations:
+            for page in range(max_pages):
+                payload = {"run_id": run_id, "keyword": keyword, "location": location, "page": page}
+                key = f"{run_id}:search:{platform}:{keyword}:{location}:{page}"
+                if queue.enqueue("search", platform, payload, dedupe_key=key):
+                    count += 1
+    return count
+
+
+def _wait_until_drained(queue: TaskQueue, kind: str, poll_interval: float,
+                        timeout: float, stall_timeout: float) -> bool:
+    """
+    Block until every task of kind has finished or failed; returns False if it gave up
+    Gives up after timeout seconds, or once stall_timeout seconds pass with no live lease and
+    no task finishing (e.g. no worker serves the platform, or every worker has died). The
+    remaining tasks are then marked failed so the report accounts for them.
+    """
+    start = last_activity = time.time()
+    finished = None
+    while True:
+        queue.reap_expired()
+        if queue.is_drained(kind):
+            return True
+
+        counts = queue.counts(kind)
+        done = counts.get("done", 0) + counts.get("failed", 0)
+        now = time.time()
+        if done != finished or queue.live_leases(kind):
+            finished, last_activity = done, now
+
+        if now - start > timeout:
+            reason = f"not finished within {timeout:.0f}s"
+        elif now - last_activity > stall_timeout:
+            reason = f"no worker progress for {stall_timeout:.0f}s"
+        else:
+            logger.info(f"Waiting for {kind} tasks: {counts}")
+            time.sleep(poll_interval)
+            continue
+
+        abandoned = queue.abandon(kind, reason)
+        logger.error(f"Gave up on {abandoned} {kind} tasks: {reason}")
+        return False
+
+
+def _spawn_workers(count: int, config_path: str, queue_path: str) -> List[subprocess.Popen]:
+    """Start local worker processes"""
+    runner = os.path.join(os.path.dirname(os.path.abspath(__file__)), "run_bot.py")
+    return [
+        subprocess.Popen([sys.executable, runner, "worker", "--config", config_path, "--queue", queue_path])
+        for _ in range(count)
+    ]
+
+
+def run_coordinator(config_path: str = "config.json", queue_path: str = "job_queue.db",
+                    workers: int = 0, poll_interval: float = 5,
+                    drain_timeout: float = 4 * 3600, stall_timeout: float = 300):
+    """Enqueue searches, score the shared corpus, enqueue applications and write the report"""
+    bot = JobApplicationBot(config_path)
+    queue = TaskQueue(queue_path)
+    run_id = datetime.now().strftime("%Y%m%d%H%M%S")
+
+    queued = enqueue_search_tasks(queue, bot.config, list(bot.bots), run_id)
+    logger.info(f"Queued {queued} search tasks (run {run_id})")
+    processes = _spawn_workers(workers, config_path, queue_path)
+
+    try:
+        _wait_until_drained(queue, "search", poll_interval, drain_timeout, stall_timeout)
+
+        bot.all_jobs = queue.load_jobs(run_id)
+        logger.info(f"Corpus holds {len(bot.all_jobs)} unique jobs")
+        bot.match_jobs()
+
+        if bot.config.get("job_search", {}).get("auto_apply", True):
+            for job_match in bot.matched_jobs:
+                platform = bot._get_platform_from_url(job_match.url)
+                if platform not in bot.bots:
+                    # No worker could ever claim it
+                    logger.warning(f"No bot available for platform: {platform}")
+                    bot.failed_applications.append({
+                        "job": job_match.title,
+                        "url": job_match.url,
+                        "reason": f"No bot registered for platform {platform}"
+                    })
+                    continue
+                payload = {"run_id": run_id, "url": job_match.url, "title": job_match.title,
+                           "company": job_match.company, "score": job_match.match_score}
+                queue.enqueue("apply", platform, payload, dedupe_key=f"{run_id}:apply:{job_match.url}",
+                              max_attempts=1)
+            _wait_until_drained(queue, "apply", poll_interval, drain_timeout, stall_timeout)
+
+        for task in queue.tasks(kind="apply"):
+            payload = task["payload"]
+            if payload.get("run_id") != run_id:
+                continue
+            if task["status"] == "done" and (task.get("result") or {}).get("applied"):
+                bot.applied_jobs.append({
+                    "title": payload["title"],
+                    "company": payload["company"],
+                    "url": payload["url"],
+                    "score": payload["score"],
+                    "platform": task["platform"]
+                })
+            elif task["status"] in ("done", "failed"):
+                bot.failed_applications.append({
+                    "job": payload["title"],
+                    "url": payload["url"],
+                    "reason": task.get("error") or "Application failed"
+                })
+
+        report = bot.generate_report()
+        print(report)
+        bot.save_results()
+        with open("job_bot_report.txt", 'w', encoding='utf-8') as f:
+            f.write(report)
+    finally:
+        for process in processes:
+            process.wait()
+
+
+def run_worker(config_path: str = "config.json", queue_path: str = "job_queue.db",
+               worker_id: Optional[str] = None, platforms: Optional[List[str]] = None,
+               idle_timeout: float = 60, poll_interval: float = 2):
+    """Claim and process tasks until the queue has been idle for idle_timeout seconds"""
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+    bot = JobApplicationBot(config_path)
+    queue = TaskQueue(queue_path)
+
+    if platforms:
+        bot.bots = {platform: bot.bots[platform] for platform in platforms if platform in bot.bots}
+    login_results = bot.login_all_platforms()
+    logged_in = [platform for platform, success in login_results.items() if success]
+    if not logged_in:
+        logger.error(f"Worker {worker_id} could not log in to any platform. Exiting.")
+        bot.close_all()
+        return
+
+    apply_delay = bot.config.get("job_search", {}).get("apply_delay_seconds", 5)
+    logger.info(f"Worker {worker_id} serving {', '.join(logged_in)}")
+    idle_since = time.time()
+
+    try:
+        while True:
+            task = queue.claim(worker_id, logged_in)
+            if task is None:
+                if time.time() - idle_since > idle_timeout:
+                    logger.info(f"Worker {worker_id} idle for {idle_timeout}s. Exiting.")
+                    return
+                time.sleep(poll_interval)
+                continue
+
+            platform_bot = bot.bots[task["platform"]]
+            payload = task["payload"]
+            try:
+                with _Heartbeat(queue, task["id"], worker_id):
+                    if task["kind"] == "search":
+                        jobs = platform_bot.search_page(payload["keyword"], payload["location"], payload["page"])
+                        queue.add_jobs(jobs, payload.get("run_id", ""))
+                        result = {"jobs": len(jobs)}
+                    else:
+                        bot._check_driver(task["platform"])
+                        result = {"applied": platform_bot.apply_to_job(payload["url"])}
+                        time.sleep(apply_delay)
+                queue.complete(task["id"], worker_id, result)
+            except Exception as e:
+                logger.error(f"Task {task['id']} ({task['kind']} on {task['platform']}) failed: {str(e)}")
+                queue.fail(task["id"], worker_id, str(e))
+            idle_since = time.time()
+    finally:
+        bot.close_all()